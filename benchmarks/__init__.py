@@ -0,0 +1 @@
+"""Benchmarks of record, storage and playback hot paths."""
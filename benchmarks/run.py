@@ -0,0 +1,246 @@
+"""Run benchmarks and print results as json.
+
+Usage:
+    PYNPUT_BACKEND=dummy python -m benchmarks.run --sizes 10000 100000 \
+        --workloads mouse keyboard mixed --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.workloads import WORKLOADS, generate, split_streams
+from tools.controller import PlayEvents
+from tools.database import Database
+from tools.events import Event, event_time_ns, to_event
+from tools.keyboard_listener import RecordKeyboardEvents
+from tools.merge import merge_events
+from tools.mouse_listener import RecordMouseEvents
+from tools.ring_buffer import RingBuffer
+
+CALLBACK_SAMPLES = 200_000
+STORAGES = (
+    ('json', None),
+    ('columnar', None),
+    ('columnar', 'zlib'),
+)
+
+
+class NullController:
+    """Controller which does nothing, used instead of pynput controllers."""
+    position = (0, 0)
+
+    def move(self, *args):
+        """Ignore the call."""
+
+    press = release = scroll = move
+
+
+def measure(function, repeat: int) -> float:
+    """Return the best time of function calls in seconds.
+
+    Args:
+        function (callable): measured function.
+        repeat (int): number of calls.
+
+    Returns (float): the shortest time of one call.
+
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(function) -> int:
+    """Return peak memory allocated by function call in bytes."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def result(benchmark: str, workload: str, events: int, seconds: float, **extra) -> dict:
+    """Return one benchmark result."""
+    return {
+        'benchmark': benchmark,
+        'workload': workload,
+        'events': events,
+        'seconds': seconds,
+        'per_event_ns': seconds / events * 1e9 if events else None,
+        **extra,
+    }
+
+
+def bench_callbacks(workload: str, rows: list, repeat: int) -> list:
+    """Measure cost of listener callbacks, formatting and raw push."""
+    rows = rows[:CALLBACK_SAMPLES]
+    mouse = RecordMouseEvents()
+    keyboard = RecordKeyboardEvents()
+    buffer = RingBuffer(len(rows))
+    push = buffer.push
+    now = mouse.clock.now
+    keyboard_ops = (Event.KEY_PRESS.value, Event.KEY_RELEASE.value)
+
+    def formatted():
+        mouse.events.clear()
+        keyboard.events.clear()
+        for opcode, _, a, b in rows:
+            if opcode == Event.MOVE.value:
+                mouse.events.append(mouse.on_move(a, b))
+            elif opcode == Event.KEY_PRESS.value:
+                keyboard.events.append(keyboard.on_press(a))
+            elif opcode == Event.KEY_RELEASE.value:
+                keyboard.events.append(keyboard.on_release(a))
+            elif opcode == Event.CLICK.value:
+                mouse.events.append(mouse.on_click(0, 0, a, b))
+            else:
+                mouse.events.append(mouse.on_scroll(0, 0, a, b))
+
+    def raw():
+        buffer.head = buffer.tail
+        for opcode, _, a, b in rows:
+            push((opcode, now(), a, b if opcode not in keyboard_ops else 0))
+
+    return [
+        result('callback_formatted', workload, len(rows), measure(formatted, repeat)),
+        result('callback_raw_push', workload, len(rows), measure(raw, repeat)),
+    ]
+
+
+def bench_storage(workload: str, rows: list, repeat: int, directory: str) -> list:
+    """Measure save and load throughput, file size and load memory."""
+    results = []
+    events = [to_event(row) for row in rows]
+    for storage, compression in STORAGES:
+        name = storage if compression is None else f'{storage}_{compression}'
+        filename = os.path.join(directory, f'{workload}-{len(rows)}.{name}')
+        data = events if storage == 'json' else rows
+
+        def save():
+            with Database(filename, 'w', storage, compression) as database:
+                database.save(data)
+
+        def load():
+            with Database(filename) as database:
+                loaded = database.load()
+                if storage != 'json':
+                    for _ in loaded:
+                        pass
+
+        def stream():
+            with Database(filename) as database:
+                for _ in database:
+                    pass
+
+        save_seconds = measure(save, repeat)
+        size = os.path.getsize(filename)
+        results.append(result(f'save_{name}', workload, len(rows), save_seconds, bytes=size))
+        results.append(result(
+            f'load_{name}', workload, len(rows), measure(load, repeat),
+            peak_bytes=peak_memory(load),
+        ))
+        results.append(result(
+            f'stream_{name}', workload, len(rows), measure(stream, repeat),
+            peak_bytes=peak_memory(stream),
+        ))
+        os.remove(filename)
+    return results
+
+
+def bench_merge(workload: str, rows: list, repeat: int) -> list:
+    """Measure merge of recorder streams against sorting them again."""
+    mouse_rows, keyboard_rows = split_streams(rows)
+    mouse_events = [to_event(row) for row in mouse_rows]
+    keyboard_events = [to_event(row) for row in keyboard_rows]
+
+    def sort():
+        sorted(mouse_events + keyboard_events, key=event_time_ns)
+
+    def merge():
+        list(merge_events(mouse_events, keyboard_events))
+
+    return [
+        result('merge_sort', workload, len(rows), measure(sort, repeat)),
+        result('merge_heapq', workload, len(rows), measure(merge, repeat)),
+    ]
+
+
+def bench_playback(workload: str, rows: list, repeat: int) -> list:
+    """Measure dispatch overhead of PlayEvents.play with null controllers."""
+    player = PlayEvents(rows)
+    player.mouse_controller = player.keyboard_controller = NullController()
+    player.scheduler.wait = lambda time_ns: None
+
+    def play_lazy():
+        player.plan = None
+        player.play()
+
+    timed = PlayEvents(rows, timing=True)
+    timed.mouse_controller = timed.keyboard_controller = NullController()
+    timed.scheduler.wait_until = lambda deadline_ns: None
+    timed.compile()
+
+    player.compile()
+    return [
+        result('play_lazy_plan', workload, len(rows), measure(play_lazy, repeat)),
+        result('compile_plan', workload, len(rows), measure(player.compile, repeat)),
+        result('play_compiled_plan', workload, len(rows), measure(player.play, repeat)),
+        result('play_timed_plan', workload, len(rows), measure(timed.play, repeat)),
+    ]
+
+
+def run(workloads, sizes, repeat: int) -> dict:
+    """Run all benchmarks.
+
+    Args:
+        workloads (iterable): with workload names.
+        sizes (iterable): with numbers of events.
+        repeat (int): number of runs of every benchmark, the best is kept.
+
+    Returns (dict): with environment and results.
+
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for workload in workloads:
+            for size in sizes:
+                rows = generate(workload, size)
+                results += bench_callbacks(workload, rows, repeat)
+                results += bench_storage(workload, rows, repeat, directory)
+                results += bench_merge(workload, rows, repeat)
+                results += bench_playback(workload, rows, repeat)
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+def main():
+    """Parse arguments, run benchmarks and save results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='json file for results, stdout by default')
+    args = parser.parse_args()
+
+    report = run(args.workloads, args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Synthetic recordings for benchmarks."""
+import random
+
+from tools.events import Event
+
+WORKLOADS = ('mouse', 'keyboard', 'mixed')
+KEYS = tuple(repr(char) for char in 'abcdefghijklmnopqrstuvwxyz') + ('Key.space', 'Key.shift')
+BUTTONS = ('Button.left', 'Button.right')
+
+
+def generate(workload: str, count: int, seed: int = 0) -> list:
+    """Generate time ordered rows of the synthetic recording.
+
+    Args:
+        workload (str): 'mouse' - moves with some clicks and scrolls,
+            'keyboard' - key presses and releases, 'mixed' - both.
+        count (int): number of events.
+        seed (int): seed of the random generator.
+
+    Returns (list): with (opcode, time_ns, a, b) rows.
+
+    """
+    if workload not in WORKLOADS:
+        raise ValueError(f'Workload must be one of {WORKLOADS}.')
+    generator = random.Random(seed)
+    keyboard_share = {'mouse': 0.0, 'keyboard': 1.0, 'mixed': 0.2}[workload]
+    rows = []
+    time_ns = 0
+    x, y = 960, 540
+    while len(rows) < count:
+        time_ns += generator.randint(800_000, 1_200_000)
+        if generator.random() < keyboard_share:
+            key = generator.choice(KEYS)
+            rows.append((Event.KEY_PRESS.value, time_ns, key, 0))
+            time_ns += generator.randint(30_000_000, 90_000_000)
+            rows.append((Event.KEY_RELEASE.value, time_ns, key, 0))
+            continue
+        chance = generator.random()
+        if chance < 0.01:
+            button = generator.choice(BUTTONS)
+            rows.append((Event.CLICK.value, time_ns, button, 1))
+            time_ns += generator.randint(50_000_000, 120_000_000)
+            rows.append((Event.CLICK.value, time_ns, button, 0))
+        elif chance < 0.02:
+            rows.append((Event.SCROLL.value, time_ns, 0, generator.choice((-1, 1))))
+        else:
+            x = min(max(x + generator.randint(-4, 4), 0), 1919)
+            y = min(max(y + generator.randint(-4, 4), 0), 1079)
+            rows.append((Event.MOVE.value, time_ns, x, y))
+    return rows[:count]
+
+
+def split_streams(rows: list) -> tuple:
+    """Split rows into mouse and keyboard streams like recorders produce.
+
+    Args:
+        rows (list): with (opcode, time_ns, a, b) rows.
+
+    Returns (tuple): with mouse and keyboard rows.
+
+    """
+    keyboard = (Event.KEY_PRESS.value, Event.KEY_RELEASE.value)
+    mouse_rows = [row for row in rows if row[0] not in keyboard]
+    keyboard_rows = [row for row in rows if row[0] in keyboard]
+    return mouse_rows, keyboard_rows
@@ -1,50 +1,208 @@
 """App to record and play keyboard and mouse events."""
+import asyncio
 import concurrent.futures
+import contextlib
+import os
 import time
 
+from tools.async_controller import AsyncPlayEvents, play_concurrently
+from tools.clock import RecordingClock
 from tools.controller import PlayEvents
 from tools.database import Database
 from tools.mouse_listener import RecordMouseEvents
 from tools.keyboard_listener import RecordKeyboardEvents
+from tools.library import MacroLibrary
+from tools.merge import merge_events
+from tools.plan_cache import PlanCache
+from tools.rolling import RollingCapture
+from tools.seek import TimeIndex
+from tools.stop import StopSignal
+from tools.writer import RecordingWriter
+
+CAPTURE_AGE_NS = 60_000_000_000
+DUMP_KEYS = ('Key.esc', "'d'")
 
 
 class Clicker:
-    def __init__(self):
+    def __init__(
+        self,
+        filename: str = 'file.json',
+        storage: str = 'json',
+        streaming: bool = False,
+        tolerance: float = 0,
+        library: str = None,
+        plan_cache: str = None,
+        collapse_repeats: bool = False,
+        compression: str = None,
+    ):
+        self.filename = filename
+        self.library = MacroLibrary(library) if library is not None else None
+        self.plan_cache = PlanCache(plan_cache) if plan_cache is not None else None
+        self.storage = storage
+        self.compression = compression
+        self.streaming = streaming
         self.mouse_future = None
         self.keyboard_future = None
-        self.end_future = None
-        self.mouse_listener = RecordMouseEvents()
-        self.keyboard_listener = RecordKeyboardEvents()
-
-    @staticmethod
-    def _key_to_sort_evets(event):
-        for k, v in event.items():
-            return v[1]['time']
-
-    def check_pressed_stop_record_keys(self):
-        while not self.keyboard_future.done():
-            time.sleep(0.5)
-        self.mouse_listener.listener.stop()
-
-    def record_events(self):
-        """Start record events."""
+        self.clock = RecordingClock()
+        self.stop_signal = StopSignal()
+        self.mouse_listener = RecordMouseEvents(
+            clock=self.clock,
+            tolerance=tolerance,
+            stop_signal=self.stop_signal,
+        )
+        self.keyboard_listener = RecordKeyboardEvents(
+            clock=self.clock,
+            stop_signal=self.stop_signal,
+            collapse_repeats=collapse_repeats,
+        )
+
+    def _start_recorders(self, executor):
+        """Start recorders, all of them stop when the keyboard recorder ends."""
+        self.stop_signal.clear()
+        self.clock.start()
+        self.mouse_future = executor.submit(self.mouse_listener.record)
+        self.keyboard_future = executor.submit(self.keyboard_listener.record)
+        self.keyboard_future.add_done_callback(lambda _: self.stop_signal.set())
+
+    def record_events(self, name: str = None, tags=()):
+        """Start record events, save them in the library when name is passed."""
+        if name is not None:
+            library = self._library()
+            if self.streaming:
+                raise ValueError('Streaming records to the file, name can not be passed.')
+        if self.streaming:
+            self.stream_events()
+            return
+
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            self.mouse_future = executor.submit(self.mouse_listener.record)
-            self.keyboard_future = executor.submit(self.keyboard_listener.record)
-            self.end_future = executor.submit(self.check_pressed_stop_record_keys)
-            events = self.mouse_future.result() + self.keyboard_future.result()
-            events = sorted(events, key=lambda event: self._key_to_sort_evets(event))
+            self._start_recorders(executor)
+            events = list(merge_events(
+                self.mouse_future.result(),
+                self.keyboard_future.result(),
+            ))
 
-        with Database('file.json', 'w') as database:
+        if name is not None:
+            library.save(name, events, tags)
+            return
+        with Database(self.filename, 'w', self.storage, self.compression) as database:
             database.save(events)
 
-    @staticmethod
-    def play_events():
-        """Play saved events"""
-        with Database('file.json', 'r') as database:
-            events = database.load()
+    def _library(self) -> MacroLibrary:
+        """Return the macro library, raise error if it is not set."""
+        if self.library is None:
+            raise ValueError('Macro library is not set, pass library to Clicker.')
+        return self.library
+
+    def stream_events(self):
+        """Record events and append them to columnar file while recording."""
+        if self.storage != 'columnar':
+            raise ValueError(f'Streaming supports only columnar storage, not {self.storage!r}.')
+        with RecordingWriter(self.filename, compression=self.compression) as writer:
+            with self._sinks(writer.source(), writer.source()):
+                with concurrent.futures.ThreadPoolExecutor() as executor:
+                    self._start_recorders(executor)
+
+    def capture_events(self, max_age_ns: int = CAPTURE_AGE_NS, max_events: int = None):
+        """Keep only the last events, save them when "esc" and "d" are pressed."""
+        capture = RollingCapture(max_age_ns, max_events)
+        hotkeys = {DUMP_KEYS: lambda: capture.dump(self._capture_filename(), self.storage)}
+        with self._sinks(capture, capture, hotkeys):
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                self._start_recorders(executor)
+
+    @contextlib.contextmanager
+    def _sinks(self, mouse_sink, keyboard_sink, hotkeys: dict = None):
+        """Pass recorded events to other sinks, restore recorders afterwards.
+
+        Args:
+            mouse_sink (callable): called with every recorded mouse event.
+            keyboard_sink (callable): called with every recorded keyboard event.
+            hotkeys (dict): with callbacks added to keyboard recorder hotkeys.
+
+        """
+        mouse, keyboard = self.mouse_listener, self.keyboard_listener
+        sinks, saved_hotkeys = (mouse.sink, keyboard.sink), dict(keyboard.hotkeys)
+        mouse.sink, keyboard.sink = mouse_sink, keyboard_sink
+        keyboard.hotkeys.update(hotkeys or {})
+        try:
+            yield
+        finally:
+            mouse.sink, keyboard.sink = sinks
+            keyboard.hotkeys.clear()
+            keyboard.hotkeys.update(saved_hotkeys)
+
+    def _capture_filename(self) -> str:
+        """Return file name for the captured events with current time."""
+        name, extension = os.path.splitext(self.filename)
+        return f'{name}-{time.strftime("%Y%m%d-%H%M%S")}{extension}'
+
+    def play_events(
+        self,
+        speed: float = 1.0,
+        max_gap_ns: int = None,
+        move_rate_hz: float = None,
+        timing: bool = False,
+        hooks: tuple = (),
+        start_ns: int = None,
+        end_ns: int = None,
+        name: str = None,
+        repeat_keys: bool = False,
+        virtual_cursor: bool = False,
+    ):
+        """Play saved events, print timing accuracy report if timing is set.
+
+        Events are played from the file or the macro from the library when
+        name is passed.
+
+        Profiling hooks, e.g. StatsHook, wrap event handlers while playing.
+        With start_ns or end_ns only that part of recording is played, held
+        keys, buttons and mouse position at start_ns are restored first.
+
+        Returns (TimingReport): with timing accuracy, None if timing is not set.
+
+        """
+        with contextlib.ExitStack() as stack:
+            if name is not None:
+                events = self._library().open(name)
+            else:
+                events = stack.enter_context(Database(self.filename, 'r'))
+            seek = start_ns is not None or end_ns is not None
+            if seek:
+                if isinstance(events, Database):
+                    events = events.load(lazy=True)
+                    if hasattr(events, 'close'):
+                        stack.callback(events.close)
+                events = TimeIndex(events).slice(start_ns, end_ns)
+            player = PlayEvents(
+                events,
+                speed=speed,
+                max_gap_ns=max_gap_ns,
+                move_rate_hz=move_rate_hz,
+                timing=timing,
+                hooks=hooks,
+                repeat_keys=repeat_keys,
+                virtual_cursor=virtual_cursor,
+            )
+            if self.plan_cache is not None and name is None and not seek:
+                player.compile_cached(self.plan_cache, self.filename)
+            player.play()
+        report = player.report()
+        if report is not None:
+            print(report.format())
+        return report
 
-        PlayEvents(events).play()
+    def play_many(self, filenames: list, speed: float = 1.0, max_gap_ns: int = None):
+        """Play saved recordings at the same time on one thread."""
+        with contextlib.ExitStack() as stack:
+            players = [
+                AsyncPlayEvents(
+                    stack.enter_context(Database(filename, 'r')),
+                    speed=speed,
+                    max_gap_ns=max_gap_ns,
+                )
+                for filename in filenames
+            ]
+            asyncio.run(play_concurrently(*players))
 
 
 if __name__ == "__main__":
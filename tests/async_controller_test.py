@@ -0,0 +1,89 @@
+"""Tests collection for async_controller.py module."""
+import asyncio
+
+import pytest
+
+from tools.async_controller import AsyncPlayEvents, play_concurrently
+from tools.events import Event
+
+EVENTS = [
+    (Event.MOVE.value, 0, 1, 1),
+    (Event.MOVE.value, 20_000_000, 2, 2),
+    (Event.MOVE.value, 40_000_000, 3, 3),
+]
+
+
+def test_play_calls_handlers_in_order(mocker):
+    """Test coroutine calls the handler with every event.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(AsyncPlayEvents, 'mouse_move')
+    player = AsyncPlayEvents(EVENTS)
+
+    asyncio.run(player.play_async())
+
+    assert [call.args for call in player.mouse_move.call_args_list] == [
+        (1, 1), (2, 2), (3, 3),
+    ]
+
+
+def test_blocking_play_is_kept(mocker):
+    """Test async player can still be played like PlayEvents.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(AsyncPlayEvents, 'mouse_move')
+    player = AsyncPlayEvents(EVENTS, timing=True)
+
+    player.play()
+
+    assert [call.args for call in player.mouse_move.call_args_list] == [
+        (1, 1), (2, 2), (3, 3),
+    ]
+    assert player.report().count == 3
+
+
+def test_recordings_are_played_concurrently(mocker):
+    """Test events of two recordings are played in order of their deadlines.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(AsyncPlayEvents, 'mouse_move')
+    later = [(opcode, time_ns + 10_000_000, a + 10, b + 10) for opcode, time_ns, a, b in EVENTS]
+    players = [AsyncPlayEvents(EVENTS, timing=True), AsyncPlayEvents(later, timing=True)]
+
+    asyncio.run(play_concurrently(*players))
+
+    assert [call.args for call in AsyncPlayEvents.mouse_move.call_args_list] == [
+        (1, 1), (11, 11), (2, 2), (12, 12), (3, 3), (13, 13),
+    ]
+    assert [player.report().count for player in players] == [3, 3]
+
+
+def test_cancelled_playback_stops(mocker):
+    """Test cancelled task does not play the rest of events.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(AsyncPlayEvents, 'mouse_move')
+    player = AsyncPlayEvents(EVENTS)
+
+    async def cancel_early():
+        task = asyncio.create_task(player.play_async())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_early())
+
+    assert player.mouse_move.call_count == 1
@@ -0,0 +1,41 @@
+"""Tests collection for clock.py module."""
+import time
+
+from tools.clock import RecordingClock
+from tools.events import event_time_ns
+
+
+def test_time_since_start_in_ns(mocker):
+    """Test clock returns integer ns since start.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    perf_counter_ns = mocker.patch.object(time, 'perf_counter_ns', return_value=10)
+    clock = RecordingClock()
+    perf_counter_ns.return_value = 25
+
+    assert clock.now() == 15
+
+    clock.start()
+    perf_counter_ns.return_value = 30
+
+    assert clock.now() == 5
+
+
+def test_clock_is_monotonic():
+    """Test next reading is not lower than the previous one."""
+    clock = RecordingClock()
+    readings = [clock.now() for _ in range(1000)]
+
+    assert readings == sorted(readings)
+
+
+def test_time_of_older_recordings():
+    """Test time in seconds from older recordings is converted to ns."""
+    old_event = {'mouse_scroll': ({'vector_dx': 0, 'vector_dy': 1}, {'time': 1.5})}
+    new_event = {'mouse_scroll': ({'vector_dx': 0, 'vector_dy': 1}, {'time_ns': 7})}
+
+    assert event_time_ns(old_event) == 1500000000
+    assert event_time_ns(new_event) == 7
@@ -0,0 +1,149 @@
+"""Tests collection for columnar.py module."""
+import io
+
+import pytest
+
+from tools import columnar
+from tools.columnar import ColumnarRecording
+from tools.events import Event
+
+
+FAKE_ROWS = [
+    (Event.MOVE.value, 877770000, 1, 200),
+    (Event.CLICK.value, 911120000, 'Button.right', 1),
+    (Event.SCROLL.value, 12000100000, 0, -1),
+    (Event.KEY_PRESS.value, 12090000000, "'q'", 0),
+    (Event.KEY_RELEASE.value, 12100000000, "'q'", 0),
+]
+
+
+def write_rows(rows, block_size=columnar.BLOCK_SIZE):
+    """Write rows to the in-memory file.
+
+    Args:
+        rows (list): with rows to write.
+        block_size (int): max number of events in one block.
+
+    Returns (bytes): with written recording.
+
+    """
+    file = io.BytesIO()
+    columnar.write(file, rows, block_size)
+    return file.getvalue()
+
+
+def test_file_starts_with_signature():
+    """Test written file starts with the columnar signature."""
+    data = write_rows(FAKE_ROWS)
+
+    assert columnar.is_columnar(data)
+    assert not columnar.is_columnar(b'[{"mouse_move"')
+
+
+def test_read_written_rows():
+    """Test rows are the same after write and read."""
+    recording = ColumnarRecording(write_rows(FAKE_ROWS))
+
+    assert list(recording) == FAKE_ROWS
+    assert len(recording) == len(FAKE_ROWS)
+
+
+def test_rows_are_split_into_blocks():
+    """Test every block keeps own strings table."""
+    recording = ColumnarRecording(write_rows(FAKE_ROWS, block_size=2))
+    blocks = list(recording.blocks())
+
+    assert [len(block) for block in blocks] == [2, 2, 1]
+    assert blocks[1][1] == FAKE_ROWS[3]
+    assert blocks[2].time_ns(0) == FAKE_ROWS[4][1]
+    assert list(recording) == FAKE_ROWS
+
+
+def test_empty_recording():
+    """Test recording without events."""
+    recording = ColumnarRecording(write_rows([]))
+
+    assert list(recording) == []
+
+
+def test_reject_unknown_signature():
+    """Test ValueError is raised for file in other format."""
+    with pytest.raises(ValueError):
+        ColumnarRecording(b'[]' + bytes(10))
+
+
+def test_get_event_by_index():
+    """Test events are available by index across blocks."""
+    recording = ColumnarRecording(write_rows(FAKE_ROWS, block_size=2))
+
+    assert [recording[index] for index in range(5)] == FAKE_ROWS
+    assert recording[-2] == FAKE_ROWS[3]
+    with pytest.raises(IndexError):
+        recording[5]
+
+
+def test_compressed_blocks_are_decoded():
+    """Test rows are the same after write and read of compressed blocks."""
+    for compression in ('zlib', 'lzma'):
+        file = io.BytesIO()
+        columnar.write(file, FAKE_ROWS, block_size=2, compression=compression)
+        recording = ColumnarRecording(file.getvalue())
+
+        assert list(recording) == FAKE_ROWS
+        assert recording[3] == FAKE_ROWS[3]
+        assert list(columnar.read_stream(io.BytesIO(file.getvalue()))) == FAKE_ROWS
+
+
+def test_compressed_mouse_path_is_smaller():
+    """Test delta encoding reduces size of correlated moves."""
+    rows = [
+        (Event.MOVE.value, 1_000_000 * index + index % 7, 500 + index % 300, 200 - index % 150)
+        for index in range(20000)
+    ]
+    raw = write_rows(rows)
+    file = io.BytesIO()
+    columnar.write(file, rows, compression='zlib')
+
+    assert list(ColumnarRecording(file.getvalue())) == rows
+    assert len(file.getvalue()) * 10 < len(raw)
+
+
+def test_input_state_is_saved_with_every_block():
+    """Test state before the first event of the block is read without events."""
+    recording = ColumnarRecording(write_rows(FAKE_ROWS, block_size=2))
+
+    states = [recording.block_state(number) for number in range(3)]
+
+    assert [state.position for state in states] == [None, (1, 200), (1, 200)]
+    assert [list(state.buttons) for state in states] == [[], ['Button.right'], ['Button.right']]
+    assert [list(state.keys) for state in states] == [[], [], ["'q'"]]
+
+
+def test_read_file_without_saved_state():
+    """Test file of version 2 is read and has no saved state."""
+    payload = columnar.encode_payload(FAKE_ROWS)
+    data = columnar.FILE_HEADER.pack(columnar.MAGIC, 2, 0) + columnar.OLD_BLOCK_HEADER.pack(
+        len(FAKE_ROWS), len(payload), FAKE_ROWS[0][1], FAKE_ROWS[-1][1],
+    ) + payload
+    recording = ColumnarRecording(data)
+
+    assert list(recording) == FAKE_ROWS
+    assert recording[4] == FAKE_ROWS[4]
+    assert recording.block_state(0) is None
+    assert list(columnar.read_stream(io.BytesIO(data))) == FAKE_ROWS
+
+
+def test_varints_keep_negative_and_large_values():
+    """Test zigzag varints round trip."""
+    values = [0, 1, -1, 63, -64, 2**31 - 1, -2**31, 2**62, -2**62]
+    packed = bytearray()
+
+    columnar._pack_varints(values, packed)
+
+    assert columnar._unpack_varints(bytes(packed), 0, len(values)) == (values, len(packed))
+
+
+def test_unknown_compression():
+    """Test ValueError is raised for unknown compression."""
+    with pytest.raises(ValueError):
+        columnar.file_header('bz2')
@@ -2,11 +2,18 @@
 import time
 from unittest.mock import call
 
+import pytest
 from pynput.mouse import Button
 from pynput.mouse import Controller as MouseController
 from pynput.keyboard import Controller as KeyboardController
+from pynput.keyboard import KeyCode
 
 from tools.controller import PlayEvents
+from tools.events import Event
+from tools.plan_cache import PlanCache
+from tools.profiling import StatsHook
+from tools.scheduler import DeadlineScheduler
+from tools.timeline import Timeline
 from tools.keys_collection import Key
 
 
@@ -64,12 +71,28 @@ def test_create_object():
     assert isinstance(controller.keyboard_controller, KeyboardController)
 
 
-def test_wait_time_between_events():
-    """Test check if the time between events is calculated correctly."""
+def test_wait_for_every_event_deadline(mocker):
+    """Test check if play waits for the time of every event since start.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    for handler in ('mouse_move', 'mouse_click', 'mouse_scroll',
+                    'keyboard_key_press', 'keyboard_key_release'):
+        mocker.patch.object(PlayEvents, handler)
     controller = PlayEvents(FAKE_EVENTS)
-    controller.previous_time = 2.1
 
-    assert controller.time_to_wait(3.1) == 1.1
+    controller.play()
+
+    assert DeadlineScheduler.wait.call_args_list == [
+        call(877770000),
+        call(911120000),
+        call(12000100000),
+        call(12090000000),
+        call(12100000000),
+    ]
 
 
 def test_once_called_to_mouse_move(mocker):
@@ -80,7 +103,7 @@ def test_once_called_to_mouse_move(mocker):
 
     """
     mocker.patch.object(PlayEvents, 'mouse_move')
-    mocker.patch.object(PlayEvents, 'time_to_wait', return_value=0)
+    mocker.patch.object(DeadlineScheduler, 'wait')
     event = [{
             'mouse_move': (
                 {
@@ -98,10 +121,10 @@ def test_once_called_to_mouse_move(mocker):
 
     PlayEvents.mouse_move.assert_called_once()
     PlayEvents.mouse_move.assert_called_with(
-        coordinate_x=args['coordinate_x'],
-        coordinate_y=args['coordinate_y'],
+        args['coordinate_x'],
+        args['coordinate_y'],
     )
-    PlayEvents.time_to_wait.assert_called_once()
+    DeadlineScheduler.wait.assert_called_once()
 
 
 def test_once_called_to_mouse_click(mocker):
@@ -112,7 +135,7 @@ def test_once_called_to_mouse_click(mocker):
 
     """
     mocker.patch.object(PlayEvents, 'mouse_click')
-    mocker.patch.object(PlayEvents, 'time_to_wait', return_value=0)
+    mocker.patch.object(DeadlineScheduler, 'wait')
     event = [{
             'mouse_click': (
                 {'button': 'Button.right',
@@ -128,10 +151,10 @@ def test_once_called_to_mouse_click(mocker):
 
     PlayEvents.mouse_click.assert_called_once()
     PlayEvents.mouse_click.assert_called_with(
-        button=args['button'],
-        pressed=args['pressed'],
+        Button.right,
+        args['pressed'],
     )
-    PlayEvents.time_to_wait.assert_called_once()
+    DeadlineScheduler.wait.assert_called_once()
 
 
 def test_once_called_to_mouse_scroll(mocker):
@@ -142,7 +165,7 @@ def test_once_called_to_mouse_scroll(mocker):
 
     """
     mocker.patch.object(PlayEvents, 'mouse_scroll')
-    mocker.patch.object(PlayEvents, 'time_to_wait', return_value=0)
+    mocker.patch.object(DeadlineScheduler, 'wait')
     event = [
         {
             'mouse_scroll': (
@@ -161,11 +184,8 @@ def test_once_called_to_mouse_scroll(mocker):
     controller.play()
 
     PlayEvents.mouse_scroll.assert_called_once()
-    PlayEvents.mouse_scroll.assert_called_with(
-        vector_dx=0,
-        vector_dy=-1,
-    )
-    PlayEvents.time_to_wait.assert_called_once()
+    PlayEvents.mouse_scroll.assert_called_with(0, -1)
+    DeadlineScheduler.wait.assert_called_once()
 
 
 def test_once_called_to_keyboard_key_press(mocker):
@@ -176,7 +196,7 @@ def test_once_called_to_keyboard_key_press(mocker):
 
     """
     mocker.patch.object(PlayEvents, 'keyboard_key_press')
-    mocker.patch.object(PlayEvents, 'time_to_wait', return_value=0)
+    mocker.patch.object(DeadlineScheduler, 'wait')
     event = [
         {
             'keyboard_key_press': (
@@ -195,8 +215,8 @@ def test_once_called_to_keyboard_key_press(mocker):
 
     PlayEvents.keyboard_key_press.assert_called_once()
     PlayEvents.keyboard_key_press.assert_called_with(
-        key=args['key'])
-    PlayEvents.time_to_wait.assert_called_once()
+        KeyCode.from_char(args['key']))
+    DeadlineScheduler.wait.assert_called_once()
 
 
 def test_once_called_to_keyboard_key_release(mocker):
@@ -207,7 +227,7 @@ def test_once_called_to_keyboard_key_release(mocker):
 
     """
     mocker.patch.object(PlayEvents, 'keyboard_key_release')
-    mocker.patch.object(PlayEvents, 'time_to_wait', return_value=0)
+    mocker.patch.object(DeadlineScheduler, 'wait')
     event = [
         {
             'keyboard_key_release': (
@@ -226,8 +246,8 @@ def test_once_called_to_keyboard_key_release(mocker):
 
     PlayEvents.keyboard_key_release.assert_called_once()
     PlayEvents.keyboard_key_release.assert_called_with(
-        key=args['key'])
-    PlayEvents.time_to_wait.assert_called_once()
+        KeyCode.from_char('q'))
+    DeadlineScheduler.wait.assert_called_once()
 
 
 def test_mouse_move(mocker):
@@ -270,7 +290,7 @@ def test_mouse_button_is_released(mocker):
     controller = PlayEvents(FAKE_EVENTS)
     button = Button.right
 
-    controller.mouse_click('Button.right', False)
+    controller.mouse_click(Button.right, False)
 
     MouseController.release.assert_called_once()
     MouseController.release.assert_called_with(button)
@@ -288,7 +308,7 @@ def test_mouse_button_is_pressed(mocker):
     controller = PlayEvents(FAKE_EVENTS)
     button = Button.right
 
-    controller.mouse_click('Button.right', True)
+    controller.mouse_click(Button.right, True)
 
     MouseController.press.assert_called_once()
     MouseController.press.assert_called_with(button)
@@ -341,3 +361,262 @@ def test_keyboard_key_release(mocker):
 
     KeyboardController.release.assert_called_once()
     KeyboardController.release.assert_called_with('q')
+
+
+def test_play_rows_from_columnar_recording(mocker):
+    """Test rows are dispatched to the handlers with positional arguments.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(PlayEvents, 'mouse_click')
+    mocker.patch.object(PlayEvents, 'keyboard_key_press')
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    rows = [
+        (Event.CLICK.value, 1000, 'Button.left', 1),
+        (Event.KEY_PRESS.value, 2000, "'q'", 0),
+    ]
+    controller = PlayEvents(rows)
+
+    controller.play()
+
+    PlayEvents.mouse_click.assert_called_once_with(Button.left, True)
+    PlayEvents.keyboard_key_press.assert_called_once_with(KeyCode.from_char('q'))
+    DeadlineScheduler.wait.assert_has_calls([call(1000), call(2000)])
+
+
+def test_play_events_from_generator(mocker):
+    """Test events are pulled lazily from any iterable.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(PlayEvents, 'mouse_scroll')
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    controller = PlayEvents(
+        (Event.SCROLL.value, time_ns, 0, time_ns) for time_ns in range(3)
+    )
+
+    controller.play()
+
+    assert PlayEvents.mouse_scroll.call_args_list == [
+        call(0, 0), call(0, 1), call(0, 2),
+    ]
+
+
+def test_compile_resolves_buttons_and_keys(mocker):
+    """Test compiled plan keeps handlers with resolved arguments.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    controller = PlayEvents(FAKE_EVENTS)
+
+    plan = controller.compile()
+
+    assert [(time_ns, args) for time_ns, _, args in plan] == [
+        (877770000, (1, 200)),
+        (911120000, (Button.right, True)),
+        (12000100000, (0, -1)),
+        (12090000000, (KeyCode.from_char('q'),)),
+        (12100000000, (KeyCode.from_char('q'),)),
+    ]
+    assert [handler for _, handler, _ in plan] == [
+        controller.mouse_move,
+        controller.mouse_click,
+        controller.mouse_scroll,
+        controller.keyboard_key_press,
+        controller.keyboard_key_release,
+    ]
+
+
+def test_play_resampled_mouse_moves(mocker):
+    """Test mouse moves are resampled to the passed rate.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(PlayEvents, 'mouse_move')
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    rows = [(Event.MOVE.value, time_ns * 10**6, time_ns, 0) for time_ns in range(9)]
+    controller = PlayEvents(rows, move_rate_hz=250)
+
+    controller.play()
+
+    assert PlayEvents.mouse_move.call_args_list == [
+        call(0, 0), call(4, 0), call(8, 0),
+    ]
+
+
+def test_timing_keeps_every_dispatch(mocker):
+    """Test timed playback keeps intended and actual time of every event.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(DeadlineScheduler, 'wait_until')
+    for handler in ('mouse_move', 'mouse_click', 'mouse_scroll',
+                    'keyboard_key_press', 'keyboard_key_release'):
+        mocker.patch.object(PlayEvents, handler)
+    controller = PlayEvents(FAKE_EVENTS, timing=True)
+
+    controller.play()
+    report = controller.report()
+
+    assert report.count == len(FAKE_EVENTS)
+    assert controller.timing.intended[1] - controller.timing.intended[0] == 33_350_000
+
+
+def test_no_report_without_timing():
+    """Test report is not kept when timing is not set."""
+    assert PlayEvents(FAKE_EVENTS).report() is None
+
+
+def test_handlers_are_not_wrapped_without_hooks():
+    """Test dispatch table keeps plain handlers when profiling is off."""
+    controller = PlayEvents(FAKE_EVENTS)
+
+    assert controller.options['mouse_move'] == controller.mouse_move
+
+
+def test_hooks_wrap_handlers(mocker):
+    """Test hooks see every dispatched event.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    for handler in ('mouse_move', 'mouse_click', 'mouse_scroll',
+                    'keyboard_key_press', 'keyboard_key_release'):
+        mocker.patch.object(PlayEvents, handler)
+    hook = StatsHook()
+    controller = PlayEvents(FAKE_EVENTS, hooks=(hook,))
+
+    controller.play()
+
+    assert {name: stats['calls'] for name, stats in hook.stats.items()} == {
+        'mouse_move': 1,
+        'mouse_click': 1,
+        'mouse_scroll': 1,
+        'keyboard_key_press': 1,
+        'keyboard_key_release': 1,
+    }
+
+
+def test_play_timeline(mocker):
+    """Test composed timeline is played without building the event list.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    mocker.patch.object(PlayEvents, 'mouse_move')
+    timeline = Timeline().add([(Event.MOVE.value, 0, 1, 1)], offset_ns=5)
+    timeline.add([(Event.MOVE.value, 0, 2, 2)])
+
+    PlayEvents(timeline).play()
+
+    assert DeadlineScheduler.wait.call_args_list == [call(0), call(5)]
+    assert PlayEvents.mouse_move.call_args_list == [call(2, 2), call(1, 1)]
+
+
+def test_cached_plan_skips_reading_events(mocker, tmp_path):
+    """Test warm start takes the plan from the cache.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    recording = tmp_path / 'file.json'
+    recording.write_text('[]')
+    cache = PlanCache(tmp_path / 'cache')
+    PlayEvents(FAKE_EVENTS).compile_cached(cache, recording)
+    compile_plan = mocker.patch('tools.controller.compile_plan')
+
+    controller = PlayEvents(FAKE_EVENTS)
+    plan = controller.compile_cached(cache, recording)
+
+    compile_plan.assert_not_called()
+    assert plan[1] == (911120000, controller.mouse_click, (Button.right, True))
+
+
+def test_repeat_keys_regenerates_presses(mocker):
+    """Test collapsed auto-repeat is played only when it is asked.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    press = mocker.patch.object(PlayEvents, 'keyboard_key_press')
+    mocker.patch.object(PlayEvents, 'keyboard_key_release')
+    events = [
+        (Event.KEY_PRESS.value, 0, "'a'", 0),
+        (Event.KEY_RELEASE.value, 600_000_000, "'a'", 500 << 16 | 50),
+    ]
+
+    PlayEvents(events).play()
+    assert press.call_count == 1
+    PlayEvents(events, repeat_keys=True).play()
+    assert press.call_count == 1 + 3
+
+
+class FakeMouse:
+    """Mouse controller counting reads of the cursor position."""
+    def __init__(self):
+        self.reads = 0
+        self.moves = []
+        self.real = (0, 0)
+
+    @property
+    def position(self):
+        self.reads += 1
+        return self.real
+
+    @position.setter
+    def position(self, value):
+        self.moves.append(value)
+        self.real = value
+
+    def press(self, button):
+        """Ignore the press."""
+
+
+def test_virtual_cursor_does_not_read_position():
+    """Test moves set absolute position without reading it."""
+    controller = PlayEvents(FAKE_EVENTS, virtual_cursor=True, sync_every=3)
+    controller.mouse_controller = mouse = FakeMouse()
+
+    for x in range(5):
+        controller.options['mouse_move'](x, 10)
+
+    assert mouse.moves == [(x, 10) for x in range(5)]
+    assert mouse.reads == 1
+
+
+def test_virtual_cursor_is_synced_before_click():
+    """Test real cursor moved away is brought back before the click."""
+    controller = PlayEvents(FAKE_EVENTS, virtual_cursor=True)
+    controller.mouse_controller = mouse = FakeMouse()
+    controller.options['mouse_move'](5, 5)
+    mouse.real = (100, 100)
+
+    controller.mouse_click(Button.left, True)
+
+    assert mouse.moves == [(5, 5), (5, 5)]
+
+
+def test_sync_every_out_of_range():
+    """Test ValueError is raised when cursor would never be synced."""
+    for sync_every in (0, -1):
+        with pytest.raises(ValueError):
+            PlayEvents(FAKE_EVENTS, virtual_cursor=True, sync_every=sync_every)
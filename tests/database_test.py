@@ -1,10 +1,15 @@
 """Tests collection for database.py module."""
 import builtins
 import json
+import mmap
+
+import pytest
 
 from unittest.mock import MagicMock
 
+from tools.columnar import ColumnarRecording
 from tools.database import Database
+from tools.events import iter_rows, to_event
 
 
 def test_create_object():
@@ -89,6 +94,23 @@ def test_passed_args_while_save_data(mocker):
     json.dump.assert_called_with(['test 1', 'test 2'], builtins.open())
 
 
+def test_rows_are_saved_as_events_in_json_file(tmp_path):
+    """Test rows saved in json file are loaded as recorded events.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.json'
+    rows = [(1, 10, 5, 6), (4, 20, "'a'", 0)]
+
+    with Database(filename, 'w') as database:
+        database.save(iter(rows))
+
+    with Database(filename) as database:
+        assert list(iter_rows(database.load())) == rows
+
+
 def test_is_called_load_method_while_load_data(mocker):
     """Test check is called method 'json.load' while load data.
 
@@ -120,3 +142,141 @@ def test_is_correct_file_handler_while_load_method(mocker):
         database.load()
 
     json.load.assert_called_with(builtins.open())
+
+
+def test_load_format_is_detected_by_signature(tmp_path):
+    """Test load returns columnar recording for file in columnar format.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.clkr'
+    events = [
+        {'mouse_move': ({'coordinate_x': 1, 'coordinate_y': 2}, {'time_ns': 500000000})},
+        {'keyboard_key_press': ({'key': "'q'"}, {'time_ns': 1250000000})},
+    ]
+
+    with Database(filename, 'w', 'columnar') as database:
+        database.save(events)
+    with Database(filename) as database:
+        recording = database.load()
+
+    assert isinstance(recording, ColumnarRecording)
+    assert [to_event(row) for row in recording] == events
+
+
+def test_load_json_file(tmp_path):
+    """Test load returns list for file in json format.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.json'
+    events = [{'mouse_scroll': [{'vector_dx': 0, 'vector_dy': -1}, {'time': 0.1}]}]
+
+    with Database(filename, 'w') as database:
+        database.save(events)
+    with Database(filename) as database:
+        assert database.load() == events
+
+
+def test_lazy_load_maps_columnar_file(tmp_path):
+    """Test lazy load returns recording backed by mmap.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.clkr'
+    rows = [(1, time_ns, time_ns, 2 * time_ns) for time_ns in range(10000)]
+
+    with Database(filename, 'w', 'columnar') as database:
+        database.save(rows)
+    with Database(filename) as database:
+        recording = database.load(lazy=True)
+
+    assert isinstance(recording.source, mmap.mmap)
+    assert len(recording) == 10000
+    assert recording[5000] == (1, 5000, 5000, 10000)
+    assert recording[-1] == rows[-1]
+    assert list(recording) == rows
+    recording.close()
+
+
+def test_close_mapped_recording_with_alive_iterator(tmp_path):
+    """Test recording is closed while it is iterated, iterator still works.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.clkr'
+    rows = [(1, time_ns, time_ns, 0) for time_ns in range(5000)]
+    with Database(filename, 'w', 'columnar') as database:
+        database.save(rows)
+    with Database(filename) as database:
+        recording = database.load(lazy=True)
+
+    events = iter(recording)
+    next(events)
+    recording.close()
+
+    assert list(events) == rows[1:]
+    assert recording.source is None
+
+
+def test_stream_json_file_in_small_chunks(tmp_path):
+    """Test events are read one by one from json file.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.json'
+    events = [
+        {'mouse_move': [{'coordinate_x': x, 'coordinate_y': 1}, {'time': x / 10}]}
+        for x in range(50)
+    ]
+    filename.write_text(json.dumps(events, indent=1), encoding='utf-8')
+
+    with Database(filename) as database:
+        stream = database.stream(chunk_size=7)
+        assert next(stream) == events[0]
+        assert list(stream) == events[1:]
+
+
+def test_stream_columnar_file(tmp_path):
+    """Test open database yields rows from columnar file.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.clkr'
+    rows = [(3, time_ns, 0, -1) for time_ns in range(5000)]
+
+    with Database(filename, 'w', 'columnar') as database:
+        database.save(rows)
+    with Database(filename) as database:
+        assert list(database) == rows
+
+
+def test_stream_empty_json_array(tmp_path):
+    """Test empty array and invalid json file.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.json'
+    filename.write_text(' [ ] ', encoding='utf-8')
+
+    with Database(filename) as database:
+        assert list(database) == []
+
+    filename.write_text('[{"mouse_move": ', encoding='utf-8')
+    with Database(filename) as database:
+        with pytest.raises(json.JSONDecodeError):
+            list(database)
@@ -1,10 +1,10 @@
 """Test collection for mouse_listener.py."""
-from datetime import datetime
 from enum import Enum
 
-from freezegun import freeze_time
 from pynput.keyboard import Listener
 
+from tools.clock import RecordingClock
+from tools.events import Event
 from tools.keyboard_listener import RecordKeyboardEvents
 
 
@@ -14,26 +14,30 @@ class Keys(Enum):
     b = 1
 
 
-@freeze_time('2012-12-01 09:08:07')
 def test_create_object():
     """Test object is created correctly."""
-    record_object = RecordKeyboardEvents()
+    clock = RecordingClock()
+    record_object = RecordKeyboardEvents(clock=clock)
 
     assert record_object.events == []
     assert record_object.listener is None
     assert record_object.pressed == {}
-    assert record_object.start_time == datetime(2012, 12, 1, 9, 8, 7)
+    assert record_object.clock is clock
+
+
+def test_calculate_time_between_events(mocker):
+    """Test calculate time between events.
 
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
 
-@freeze_time('2012-12-01 09:08:07')
-def test_calculate_time_between_events():
-    """Test calculate time between events."""
+    """
     record_object = RecordKeyboardEvents()
+    mocker.patch.object(RecordingClock, 'now', return_value=602000000000)
 
-    freeze_time('2012-12-01 09:18:09').start()
     time = record_object.time()
 
-    assert time == 602.0
+    assert time == 602000000000
 
 
 def test_stop_record_buttons_are_pressed_together(mocker):
@@ -41,6 +45,7 @@ def test_stop_record_buttons_are_pressed_together(mocker):
     record_object = RecordKeyboardEvents()
     record_object.listener = Listener()
     stop_listener_mocker = mocker.patch.object(Listener, 'stop')
+    record_object.stop_signal.subscribe(record_object.listener.stop)
 
     record_object.pressed = {
         "'q'": True,
@@ -50,17 +55,21 @@ def test_stop_record_buttons_are_pressed_together(mocker):
 
     stop_listener_mocker.assert_called_once()
 
-@freeze_time('2020-12-31 15:12:11')
-def test_output_if_key_is_pressed():
-    """Test output when key is pressed."""
+def test_output_if_key_is_pressed(mocker):
+    """Test output when key is pressed.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
     record_object = RecordKeyboardEvents()
-    record_object.start_time = datetime(2020, 12, 31, 15, 11, 15)
+    mocker.patch.object(RecordingClock, 'now', return_value=56000000000)
     excepted_result = {
             'keyboard_key_press': (
                 {
                     'key': str(Keys.q.name),
                 },
-                {'time': 56.0},
+                {'time_ns': 56000000000},
             ),
         }
 
@@ -80,16 +89,22 @@ def test_two_buttons_are_pressed():
     assert all([key in record_object.pressed for key in ('q', 'b')])
 
 
-def test_output_if_key_is_released():
-    """Test output when key is released."""
+def test_output_if_key_is_released(mocker):
+    """Test output when key is released.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
     record_object = RecordKeyboardEvents()
+    mocker.patch.object(RecordingClock, 'now', return_value=0)
     record_object.pressed['b'] = True
     excepted_value = {
             'keyboard_key_release': (
                 {
                     'key': Keys.b.name,
                 },
-                {'time': 0.0},
+                {'time_ns': 0},
             ),
         }
 
@@ -110,3 +125,53 @@ def test_one_of_the_two_keys_is_released():
 
     assert len(record_object.pressed) == 1
     assert record_object.pressed == {'t': True}
+
+
+def test_format_raw_events_and_stop_record():
+    """Test raw tuples from the buffer are formatted and stop keys checked."""
+    record_object = RecordKeyboardEvents()
+
+    press = record_object.format((Event.KEY_PRESS.value, 5, "'q'", 0))
+    record_object.format((Event.KEY_PRESS.value, 6, 'Key.esc', 0))
+    release = record_object.format((Event.KEY_RELEASE.value, 7, "'q'", 0))
+
+    assert press == {'keyboard_key_press': ({'key': "'q'"}, {'time_ns': 5})}
+    assert release == {'keyboard_key_release': ({'key': "'q'"}, {'time_ns': 7})}
+    assert record_object.pressed == {'Key.esc': True}
+    assert record_object.stop_signal.is_set()
+
+
+def test_hotkey_callback_is_called_once_per_press(mocker):
+    """Test hotkey callback is not called again for repeated key press.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    callback = mocker.MagicMock()
+    record_object = RecordKeyboardEvents(hotkeys={('Key.esc', "'d'"): callback})
+
+    record_object.on_press('Key.esc')
+    record_object.on_press("'d'")
+    record_object.on_press("'d'")
+
+    callback.assert_called_once_with()
+
+
+def test_collapse_repeated_presses():
+    """Test auto-repeated presses are kept in the release only."""
+    record_object = RecordKeyboardEvents(collapse_repeats=True)
+
+    events = [
+        record_object.format((Event.KEY_PRESS.value, time_ns, "'a'", 0))
+        for time_ns in (0, 500_000_000, 530_000_000, 560_000_000)
+    ]
+    release = record_object.format((Event.KEY_RELEASE.value, 580_000_000, "'a'", 0))
+
+    assert events[1:] == [None, None, None]
+    assert release == {
+        'keyboard_key_release': (
+            {'key': "'a'", 'repeat_delay_ms': 500, 'repeat_interval_ms': 30},
+            {'time_ns': 580_000_000},
+        ),
+    }
@@ -0,0 +1,117 @@
+"""Tests collection for library.py module."""
+import sqlite3
+
+import pytest
+
+from tools.events import Event, to_event
+from tools.library import SCHEMA, MacroLibrary
+from tools.seek import TimeIndex
+
+ROWS = [(Event.MOVE.value, i * 10, i, i) for i in range(9)] + [
+    (Event.KEY_PRESS.value, 100, "'a'", 0),
+    (Event.KEY_RELEASE.value, 110, "'a'", 0),
+]
+
+
+def test_save_keeps_metadata():
+    """Test saved macro has duration, event count and tags."""
+    with MacroLibrary(':memory:', block_size=4) as library:
+        info = library.save('login', [to_event(row) for row in ROWS], tags=['web', 'auth'])
+
+    assert (info['name'], info['duration_ns'], info['event_count']) == ('login', 110, 11)
+    assert info['tags'] == ['auth', 'web']
+
+
+def test_open_reads_events_by_chunks(mocker):
+    """Test recording is read lazily and every chunk is fetched once.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    library = MacroLibrary(':memory:', block_size=4)
+    library.save('path', ROWS, compression=None)
+    recording = library.open('path')
+    fetch = mocker.spy(recording, '_fetch')
+
+    assert list(recording) == ROWS
+    assert fetch.call_count == 4
+
+
+def test_find_by_tag_and_name():
+    """Test macros are searched by tag and name pattern."""
+    library = MacroLibrary(':memory:')
+    library.save('login', ROWS, tags=['web'])
+    library.save('logout', ROWS)
+    library.save('draw', ROWS, tags=['web'])
+    library.tag('logout', 'web')
+
+    assert [info['name'] for info in library.find(tag='web', name='log%')] == ['login', 'logout']
+
+
+def test_save_replaces_and_delete_removes():
+    """Test macro with the same name is replaced and can be removed."""
+    library = MacroLibrary(':memory:')
+    library.save('macro', ROWS, tags=['old'])
+    library.save('macro', ROWS[:2])
+
+    assert library.info('macro')['event_count'] == 2
+    assert library.info('macro')['tags'] == []
+    library.delete('macro')
+    assert library.find() == []
+    assert library.connection.execute('SELECT count(*) FROM chunks').fetchone() == (0,)
+
+
+def test_missing_macro_raises_error():
+    """Test opening unknown macro raises error."""
+    with pytest.raises(ValueError):
+        MacroLibrary(':memory:').open('missing')
+
+
+def test_seek_in_library_recording():
+    """Test library recording is indexed by chunks for seeking."""
+    library = MacroLibrary(':memory:', block_size=4)
+    library.save('path', ROWS)
+    index = TimeIndex(library.open('path'))
+
+    assert index.numbers == [0, 4, 8]
+    assert index.seek(55) == 6
+    assert index.state_at(10).keys == {"'a'": None}
+
+
+def test_state_at_fetches_only_chunk_of_seek_point(mocker):
+    """Test state saved with the chunk is used instead of earlier chunks.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    library = MacroLibrary(':memory:', block_size=4)
+    library.save('path', ROWS)
+    recording = library.open('path')
+    fetch = mocker.spy(recording, '_fetch')
+
+    state = TimeIndex(recording).state_at(10)
+
+    assert fetch.call_count == 1
+    assert state.position == (8, 8)
+    assert state.keys == {"'a'": None}
+
+
+def test_library_without_saved_state_is_upgraded(tmp_path):
+    """Test library created before states were saved can be used.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    path = tmp_path / 'macros.db'
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA.replace('    state BLOB,\n', ''))
+    connection.close()
+
+    with MacroLibrary(path, block_size=4) as library:
+        library.save('path', ROWS)
+        recording = library.open('path')
+
+        assert recording.block_state(2).position == (7, 7)
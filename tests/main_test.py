@@ -0,0 +1,204 @@
+"""Tests collection for main.py module."""
+import functools
+import threading
+
+import pytest
+from pynput.keyboard import KeyCode
+
+from tools import columnar, keyboard_listener, mouse_listener
+from tools.controller import PlayEvents
+from tools.database import Database
+from tools.events import Event
+from tools.scheduler import DeadlineScheduler
+from tools.writer import RecordingWriter
+
+import main
+from main import Clicker
+
+ROWS = [(Event.MOVE.value, time_ns, time_ns, time_ns) for time_ns in range(0, 100, 10)]
+
+
+class FakeListener:
+    """Listener which keeps callbacks, so the test can call them."""
+    callbacks = {}
+
+    def __init__(self, **callbacks):
+        FakeListener.callbacks.update(callbacks)
+        self.stopped = threading.Event()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def join(self):
+        self.stopped.wait()
+
+    def stop(self):
+        self.stopped.set()
+
+
+def test_seek_closes_mapped_recording(mocker, tmp_path):
+    """Test recording mapped to play the part of it is closed after playback.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'file.bin'
+    with Database(filename, 'w', 'columnar') as database:
+        database.save(ROWS)
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    move = mocker.patch.object(PlayEvents, 'mouse_move')
+    close = mocker.spy(columnar.ColumnarRecording, 'close')
+
+    Clicker(filename=filename).play_events(start_ns=45, end_ns=75)
+
+    assert [call.args for call in move.call_args_list] == [(40, 40), (50, 50), (60, 60), (70, 70)]
+    close.assert_called_once()
+
+
+def test_name_without_library_raises_error():
+    """Test recording and playing macro by name needs the library."""
+    clicker = Clicker()
+
+    for method in (clicker.record_events, clicker.play_events):
+        with pytest.raises(ValueError, match='library'):
+            method(name='macro')
+
+
+def test_streaming_with_name_raises_error(mocker):
+    """Test streamed recording is not silently saved to the file instead.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    stream_events = mocker.patch.object(Clicker, 'stream_events')
+    clicker = Clicker(streaming=True, library=':memory:')
+
+    with pytest.raises(ValueError, match='name can not be passed'):
+        clicker.record_events(name='macro')
+    stream_events.assert_not_called()
+
+
+def test_record_and_play_macro_by_name(mocker):
+    """Test recorded events are saved in the library and played from it.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    clicker = Clicker(library=':memory:')
+    mocker.patch.object(clicker, '_start_recorders')
+    clicker.mouse_future = mocker.Mock(**{'result.return_value': ROWS[:2]})
+    clicker.keyboard_future = mocker.Mock(**{'result.return_value': []})
+    mocker.patch.object(DeadlineScheduler, 'wait')
+    move = mocker.patch.object(PlayEvents, 'mouse_move')
+
+    clicker.record_events(name='macro', tags=['test'])
+    clicker.play_events(name='macro')
+
+    assert clicker.library.info('macro')['tags'] == ['test']
+    assert [call.args for call in move.call_args_list] == [(0, 0), (10, 10)]
+
+
+def test_streaming_without_columnar_storage_raises_error(mocker):
+    """Test streaming refuses storage which is not columnar.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    start_recorders = mocker.patch.object(Clicker, '_start_recorders')
+    clicker = Clicker(storage='json', streaming=True)
+
+    with pytest.raises(ValueError, match='columnar storage'):
+        clicker.record_events()
+    start_recorders.assert_not_called()
+
+
+def test_streaming_uses_compression(mocker, tmp_path):
+    """Test streamed file is saved with compression of the clicker.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    mocker.patch.object(Clicker, '_start_recorders')
+    filename = tmp_path / 'events.clkr'
+    clicker = Clicker(filename=filename, storage='columnar', streaming=True, compression='zlib')
+
+    clicker.record_events()
+
+    with open(filename, 'rb') as file:
+        _, _, codec = columnar.FILE_HEADER.unpack(file.read(columnar.FILE_HEADER.size))
+    assert codec == columnar.CODECS['zlib']
+
+
+def test_streamed_simplified_moves_keep_their_times(mocker, tmp_path):
+    """Test moves held by the simplifier are written with recorded times.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    mocker.patch.object(mouse_listener, 'Listener', FakeListener)
+    mocker.patch.object(keyboard_listener, 'Listener', FakeListener)
+    writer = functools.partial(RecordingWriter, flush_interval=0.01)
+    mocker.patch.object(main, 'RecordingWriter', writer)
+    FakeListener.callbacks = {}
+    filename = tmp_path / 'events.clkr'
+    clicker = Clicker(filename=filename, storage='columnar', streaming=True, tolerance=1)
+    clock = [0]
+    mocker.patch.object(clicker.clock, 'now', side_effect=lambda: clock[0])
+    recording = threading.Thread(target=clicker.record_events)
+    recording.start()
+    while len(FakeListener.callbacks) < 5:
+        recording.join(0.001)
+    callbacks = FakeListener.callbacks
+
+    moves, keys = set(), []
+    for step in range(100):
+        clock[0] = step * 10_000_000
+        callbacks['on_move'](step, step // 5 % 2 * 10)
+        moves.add(clock[0])
+        if step % 7 == 0:
+            callbacks['on_press'](KeyCode.from_char('a'))
+            callbacks['on_release'](KeyCode.from_char('a'))
+            keys.append(clock[0])
+        recording.join(0.002)
+    clicker.stop_signal.set()
+    recording.join()
+
+    with Database(filename) as database:
+        rows = list(database.load())
+    times = [row[1] for row in rows]
+    move_times = [row[1] for row in rows if row[0] == Event.MOVE.value]
+    assert times == sorted(times)
+    assert set(move_times) <= moves
+    assert len(set(move_times)) == len(move_times) > 2
+    assert [row[1] for row in rows if row[0] == Event.KEY_PRESS.value] == keys
+
+
+def test_recorders_are_restored_after_capture_and_streaming(mocker, tmp_path):
+    """Test later recording saves events instead of passing them to old sinks.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    mocker.patch.object(Clicker, '_start_recorders')
+    clicker = Clicker(filename=tmp_path / 'events.clkr', storage='columnar')
+    sinks = clicker.mouse_listener.sink, clicker.keyboard_listener.sink
+
+    clicker.capture_events(max_events=10)
+    clicker.stream_events()
+
+    assert (clicker.mouse_listener.sink, clicker.keyboard_listener.sink) == sinks
+    assert clicker.keyboard_listener.hotkeys == {}
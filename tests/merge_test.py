@@ -0,0 +1,43 @@
+"""Tests collection for merge.py module."""
+from tools.events import Event
+from tools.merge import merge_events
+
+
+def test_merge_two_recorders_events():
+    """Test events of both recorders are sorted by time."""
+    mouse_events = [
+        {'mouse_move': ({'coordinate_x': 1, 'coordinate_y': 2}, {'time_ns': 10})},
+        {'mouse_move': ({'coordinate_x': 2, 'coordinate_y': 2}, {'time_ns': 30})},
+    ]
+    keyboard_events = [
+        {'keyboard_key_press': ({'key': "'q'"}, {'time_ns': 20})},
+        {'keyboard_key_release': ({'key': "'q'"}, {'time_ns': 40})},
+    ]
+
+    result = list(merge_events(mouse_events, keyboard_events))
+
+    assert result == [
+        mouse_events[0], keyboard_events[0], mouse_events[1], keyboard_events[1],
+    ]
+
+
+def test_merge_many_lazy_sources():
+    """Test any number of generators is merged lazily."""
+    def source(first_ns):
+        for time_ns in range(first_ns, 30, 3):
+            yield Event.MOVE.value, time_ns, first_ns, 0
+
+    sources = [source(first_ns) for first_ns in range(3)]
+
+    merged = merge_events(*sources)
+
+    assert next(merged) == (Event.MOVE.value, 0, 0, 0)
+    assert [row[1] for row in merged] == list(range(1, 30))
+
+
+def test_merge_keeps_source_order_for_equal_times():
+    """Test events with the same time keep order of sources."""
+    first = [(Event.KEY_PRESS.value, 5, "'a'", 0)]
+    second = [(Event.KEY_PRESS.value, 5, "'b'", 0)]
+
+    assert list(merge_events(first, second)) == first + second
@@ -1,13 +1,13 @@
 """Test collection for mouse_listener.py."""
-from datetime import datetime
+import time
 
-from freezegun import freeze_time
 from pynput.mouse import Listener, Button
 
+from tools.clock import RecordingClock
+from tools.events import Event
 from tools.mouse_listener import RecordMouseEvents
 
 
-@freeze_time('2012-01-01 00:00:00')
 def test_create_object():
     """Test that the object was created correctly."""
     record_object = RecordMouseEvents()
@@ -15,32 +15,38 @@ def test_create_object():
     assert record_object.button_is_pressed is False
     assert record_object.events == []
     assert record_object.listener is None
-    assert record_object.start_time == datetime.now()
+    assert isinstance(record_object.clock, RecordingClock)
 
 
-@freeze_time('2020-12-31 15:12:11')
-def test_calculate_time():
-    """Test calculate time."""
-    record_object = RecordMouseEvents()
-    record_object.start_time = datetime(2020, 12, 30, 14, 11, 10)
+def test_calculate_time(mocker):
+    """Test calculate time.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(time, 'perf_counter_ns', return_value=1000)
+    clock = RecordingClock()
+    record_object = RecordMouseEvents(clock=clock)
+    time.perf_counter_ns.return_value = 90061000001000
 
-    second_diff = record_object.time()
+    ns_diff = record_object.time()
 
-    assert second_diff == 90061.0
-    assert isinstance(second_diff, float)
+    assert ns_diff == 90061000000000
+    assert isinstance(ns_diff, int)
 
 
 def test_result_mouse_move(mocker):
     """Test output mouse move event."""
     record_object = RecordMouseEvents()
-    mocker.patch.object(RecordMouseEvents, 'time', return_value=1.1)
+    mocker.patch.object(RecordMouseEvents, 'time', return_value=1100000000)
     excepted_result = {
         'mouse_move': (
             {
                 'coordinate_x': 2,
                 'coordinate_y': 3,
             },
-            {'time': 1.1},
+            {'time_ns': 1100000000},
         ),
     }
 
@@ -54,12 +60,12 @@ def test_result_mouse_move(mocker):
 def test_result_mouse_click(mocker):
     """Test output mouse click event."""
     record_object = RecordMouseEvents()
-    mocker.patch.object(RecordMouseEvents, 'time', return_value=2.0003)
+    mocker.patch.object(RecordMouseEvents, 'time', return_value=2000300000)
     excepted_result = {
         'mouse_click': (
             {'button': 'Button.middle',
              'pressed': True},
-            {'time': 2.0003},
+            {'time_ns': 2000300000},
         ),
     }
 
@@ -73,14 +79,14 @@ def test_result_mouse_click(mocker):
 def test_result_mouse_scroll(mocker):
     """Test output mouse scroll event."""
     record_object = RecordMouseEvents()
-    mocker.patch.object(RecordMouseEvents, 'time', return_value=0.001)
+    mocker.patch.object(RecordMouseEvents, 'time', return_value=1000000)
     excepted_result = {
         'mouse_scroll': (
             {
                 'vector_dx': 0,
                 'vector_dy': -1,
             },
-            {'time': 0.001},
+            {'time_ns': 1000000},
         ),
     }
 
@@ -90,6 +96,20 @@ def test_result_mouse_scroll(mocker):
     assert result == excepted_result
 
 
+def test_format_raw_events():
+    """Test raw tuples from the buffer are formatted with their time."""
+    record_object = RecordMouseEvents()
+
+    assert record_object.format((Event.MOVE.value, 7, 2, 3)) == {
+        'mouse_move': ({'coordinate_x': 2, 'coordinate_y': 3}, {'time_ns': 7}),
+    }
+    assert record_object.format((Event.CLICK.value, 8, Button.left, False)) == {
+        'mouse_click': ({'button': 'Button.left', 'pressed': False}, {'time_ns': 8}),
+    }
+    assert record_object.format((Event.SCROLL.value, 9, 0, 1)) == {
+        'mouse_scroll': ({'vector_dx': 0, 'vector_dy': 1}, {'time_ns': 9}),
+    }
+
 # Test for record method...
 
 # @freeze_time('2020-12-31 15:12:11')
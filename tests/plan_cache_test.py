@@ -0,0 +1,129 @@
+"""Tests collection for plan_cache.py module."""
+import os
+
+from tools.plan_cache import PlanCache, dump_plan, load_plan
+
+
+def handler():
+    """Stand-in event handler."""
+
+
+OPTIONS = {'mouse_move': handler}
+STEPS = [(0, 'mouse_move', (1, 2)), (10, 'mouse_move', (3, 4))]
+
+
+def test_plan_is_kept_by_event_names():
+    """Test handlers are replaced by names and back."""
+    plan = load_plan(STEPS, OPTIONS)
+
+    assert plan[0] == (0, handler, (1, 2))
+    assert dump_plan(plan, OPTIONS) == STEPS
+
+
+def test_store_and_load(tmp_path):
+    """Test stored plan is loaded with the same key.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    recording = tmp_path / 'file.json'
+    recording.write_text('[]')
+    cache = PlanCache(tmp_path / 'cache')
+    key = cache.key(recording, move_rate_hz=None)
+
+    assert cache.load(key) is None
+    cache.store(key, STEPS)
+    assert cache.load(key) == STEPS
+
+
+def test_changed_recording_gets_new_key(tmp_path):
+    """Test editing recording invalidates its cached plan.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    recording = tmp_path / 'file.json'
+    recording.write_text('[]')
+    cache = PlanCache(tmp_path / 'cache')
+    old_key = cache.key(recording)
+    cache.store(old_key, STEPS)
+
+    recording.write_text('[ ]')
+    new_key = cache.key(recording)
+    cache.store(new_key, STEPS[:1])
+
+    assert new_key != old_key
+    assert cache.load(old_key) is None
+    assert os.listdir(cache.directory) == [f'{new_key}.plan']
+
+
+def test_options_change_key(tmp_path):
+    """Test plans compiled with other options are kept separately.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    recording = tmp_path / 'file.json'
+    recording.write_text('[]')
+    cache = PlanCache(tmp_path / 'cache')
+
+    assert cache.key(recording, move_rate_hz=60) != cache.key(recording, move_rate_hz=None)
+
+
+def test_plans_with_other_options_are_kept(tmp_path):
+    """Test plan of the same recording does not remove plan with other options.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    recording = tmp_path / 'file.json'
+    recording.write_text('[]')
+    cache = PlanCache(tmp_path / 'cache')
+    resampled_key = cache.key(recording, move_rate_hz=120)
+    key = cache.key(recording, move_rate_hz=None)
+
+    cache.store(resampled_key, STEPS[:1])
+    cache.store(key, STEPS)
+
+    assert cache.load(resampled_key) == STEPS[:1]
+    assert cache.load(key) == STEPS
+
+
+def test_plan_which_can_not_be_unpickled_is_missed(tmp_path):
+    """Test plan pickled with classes which are not available is not loaded.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    cache = PlanCache(tmp_path)
+    for number, data in enumerate((b'cmissing_module\nKey\n.', b'cos\nmissing_name\n.')):
+        with open(os.path.join(tmp_path, f'source-key{number}.plan'), 'wb') as file:
+            file.write(data)
+
+        assert cache.load(f'source-key{number}') is None
+
+
+def test_least_recently_used_plans_are_evicted(tmp_path):
+    """Test the oldest plans are removed over the size limit.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    cache = PlanCache(tmp_path, max_bytes=10**6)
+    for number in range(3):
+        cache.store(f'source{number}-key', STEPS)
+        path = os.path.join(tmp_path, f'source{number}-key.plan')
+        os.utime(path, ns=(number, number))
+    size = os.path.getsize(path)
+    cache.load('source0-key')
+
+    cache.max_bytes = 2 * size
+    cache.evict()
+
+    assert sorted(os.listdir(tmp_path)) == ['source0-key.plan', 'source2-key.plan']
@@ -0,0 +1,45 @@
+"""Tests collection for plan.py module."""
+import pytest
+from pynput.keyboard import Key, KeyCode
+from pynput.mouse import Button
+
+from tools.events import Event
+from tools.plan import compile_plan, resolve_button, resolve_key
+
+
+def test_resolve_saved_key_names():
+    """Test saved key names are resolved to pynput keys."""
+    assert resolve_key('Key.esc') == Key.esc
+    assert resolve_key("'q'") == KeyCode.from_char('q')
+    assert resolve_key('"\'"') == KeyCode.from_char("'")
+    assert resolve_key('<65>') == KeyCode.from_vk(65)
+    assert resolve_key("['~']") == KeyCode.from_dead('~')
+
+
+def test_resolved_keys_are_cached():
+    """Test the same key object is returned for the same name."""
+    assert resolve_key("'b'") is resolve_key("'b'")
+    assert resolve_button('Button.left') is Button.left
+
+
+def test_key_name_is_not_evaluated():
+    """Test the key name is not evaluated as python code."""
+    with pytest.raises((ValueError, SyntaxError)):
+        resolve_key("'a' + 'b'")
+
+
+def test_compile_plan_from_rows():
+    """Test rows are compiled to steps with handlers by event name."""
+    options = {
+        'mouse_click': 'click handler',
+        'keyboard_key_release': 'release handler',
+    }
+    rows = [
+        (Event.CLICK.value, 10, 'Button.middle', 0),
+        (Event.KEY_RELEASE.value, 20, 'Key.esc', 0),
+    ]
+
+    assert compile_plan(rows, options) == [
+        (10, 'click handler', (Button.middle, False)),
+        (20, 'release handler', (Key.esc,)),
+    ]
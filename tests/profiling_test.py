@@ -0,0 +1,69 @@
+"""Tests collection for profiling.py module."""
+import logging
+
+import pytest
+
+from tools.profiling import LogHook, ProfileHook, StatsHook, TimingHook, wrap_handlers
+
+
+def test_stats_count_calls_and_latency():
+    """Test stats hook counts calls, total and max latency."""
+    hook = StatsHook()
+
+    hook.record('mouse_move', 100)
+    hook.record('mouse_move', 300)
+
+    assert hook.summary() == {
+        'mouse_move': {'calls': 2, 'total_ns': 400, 'max_ns': 300, 'mean_ns': 200},
+    }
+
+
+def test_timing_hook_without_record_can_not_be_created():
+    """Test hook which does not implement record fails when it is created."""
+    class NoRecordHook(TimingHook):
+        pass
+
+    with pytest.raises(TypeError):
+        NoRecordHook()
+
+
+def test_wrapped_handler_is_measured():
+    """Test wrapped handler is called and its call is recorded."""
+    calls = []
+    hook = StatsHook()
+    options = wrap_handlers({'mouse_click': lambda *args: calls.append(args)}, [hook])
+
+    options['mouse_click']('Button.left', True)
+
+    assert calls == [('Button.left', True)]
+    assert hook.stats['mouse_click']['calls'] == 1
+
+
+def test_log_only_slow_calls(caplog):
+    """Test log hook skips calls faster than the threshold.
+
+    Args:
+        caplog (pytest.LogCaptureFixture): captured log records.
+
+    """
+    hook = LogHook(threshold_ns=1000)
+
+    with caplog.at_level(logging.DEBUG):
+        hook.record('mouse_move', 10)
+        hook.record('keyboard_key_press', 5000)
+
+    assert [record.getMessage() for record in caplog.records] == [
+        'keyboard_key_press took 5000 ns',
+    ]
+
+
+def test_profile_collects_handler_calls():
+    """Test handler calls are visible in the profile."""
+    def handler(x, y):
+        return x + y
+
+    hook = ProfileHook()
+    options = wrap_handlers({'mouse_move': handler}, [hook, StatsHook()])
+
+    assert options['mouse_move'](1, 2) == 3
+    assert any(function[2] == 'handler' for function in hook.stats().stats)
@@ -0,0 +1,59 @@
+"""Tests collection for repeat.py module."""
+from tools.events import Event, to_event, to_row
+from tools.repeat import expand_repeats, pack_repeat, repeat_times, unpack_repeat
+
+PRESS, RELEASE, MOVE = Event.KEY_PRESS.value, Event.KEY_RELEASE.value, Event.MOVE.value
+MS = 1_000_000
+
+
+def test_pack_and_unpack_repeat():
+    """Test repeat timing is kept with ms precision."""
+    assert unpack_repeat(pack_repeat(500 * MS, 33 * MS)) == (500 * MS, 33 * MS)
+    assert pack_repeat(0, 0) != 0
+
+
+def test_repeat_times_stop_before_release():
+    """Test repeats are generated from delay every interval until release."""
+    assert repeat_times(0, 600 * MS, pack_repeat(500 * MS, 30 * MS)) == [
+        500 * MS, 530 * MS, 560 * MS, 590 * MS,
+    ]
+    assert repeat_times(0, 600 * MS, pack_repeat(500 * MS, 0)) == [500 * MS]
+
+
+def test_release_keeps_repeat_in_row_and_event():
+    """Test repeat timing survives conversion between row and event."""
+    row = (RELEASE, 10, "'a'", pack_repeat(500 * MS, 30 * MS))
+
+    event = to_event(row)
+
+    assert event['keyboard_key_release'][0] == {
+        'key': "'a'", 'repeat_delay_ms': 500, 'repeat_interval_ms': 30,
+    }
+    assert to_row(event) == row
+
+
+def test_expand_repeats_merges_by_time():
+    """Test repeats are played between press and release in time order."""
+    rows = [
+        (PRESS, 0, "'a'", 0),
+        (MOVE, 520 * MS, 1, 1),
+        (RELEASE, 570 * MS, "'a'", pack_repeat(500 * MS, 30 * MS)),
+        (MOVE, 600 * MS, 2, 2),
+    ]
+
+    assert list(expand_repeats(rows)) == [
+        (PRESS, 0, "'a'", 0),
+        (PRESS, 500 * MS, "'a'", 0),
+        (MOVE, 520 * MS, 1, 1),
+        (PRESS, 530 * MS, "'a'", 0),
+        (PRESS, 560 * MS, "'a'", 0),
+        (RELEASE, 570 * MS, "'a'", 0),
+        (MOVE, 600 * MS, 2, 2),
+    ]
+
+
+def test_expand_without_repeats_keeps_rows():
+    """Test recording without collapsed repeats is not changed."""
+    rows = [(PRESS, 0, "'a'", 0), (PRESS, 5, "'b'", 0), (RELEASE, 9, "'a'", 0)]
+
+    assert list(expand_repeats(rows)) == rows
@@ -0,0 +1,77 @@
+"""Tests collection for resample.py module."""
+import pytest
+
+from tools.events import Event
+from tools.resample import MoveResampler, resample_moves
+
+
+def moves(rate_hz, duration_ns, speed=1):
+    """Return mouse moves along the horizontal line.
+
+    Args:
+        rate_hz (int): number of moves per second.
+        duration_ns (int): time of the run.
+        speed (int): pixels per ms.
+
+    Returns (list): with mouse move rows.
+
+    """
+    step_ns = 10**9 // rate_hz
+    return [
+        (Event.MOVE.value, time_ns, time_ns * speed // 10**6, 0)
+        for time_ns in range(0, duration_ns + 1, step_ns)
+    ]
+
+
+def test_downsample_keeps_ends_of_run():
+    """Test 1000 Hz moves are played at 250 Hz with the same ends."""
+    recorded = moves(1000, 100_000_000)
+
+    result = list(resample_moves(recorded, 250))
+
+    assert result[0] == recorded[0]
+    assert result[-1] == recorded[-1]
+    assert len(result) == 26
+    assert [row[1] for row in result[:3]] == [0, 4_000_000, 8_000_000]
+    assert all(row[2] == row[1] // 10**6 for row in result)
+
+
+def test_other_events_and_pauses_end_the_run():
+    """Test the mouse does not move during pause and around other events."""
+    click = (Event.CLICK.value, 15_000_000, 'Button.left', 1)
+    recorded = [
+        (Event.MOVE.value, 0, 0, 0),
+        (Event.MOVE.value, 10_000_000, 10, 0),
+        click,
+        (Event.MOVE.value, 20_000_000, 10, 10),
+        (Event.MOVE.value, 900_000_000, 20, 10),
+    ]
+
+    result = list(resample_moves(recorded, 200))
+
+    assert result == [
+        (Event.MOVE.value, 0, 0, 0),
+        (Event.MOVE.value, 5_000_000, 5, 0),
+        (Event.MOVE.value, 10_000_000, 10, 0),
+        click,
+        (Event.MOVE.value, 20_000_000, 10, 10),
+        (Event.MOVE.value, 900_000_000, 20, 10),
+    ]
+
+
+def test_spline_goes_through_recorded_moves():
+    """Test spline interpolation passes recorded points of the curve."""
+    recorded = [
+        (Event.MOVE.value, time_ns * 10_000_000, time_ns * 10, (time_ns * 10) ** 2 // 100)
+        for time_ns in range(6)
+    ]
+
+    result = list(MoveResampler(100, 'spline').resample(recorded))
+
+    assert result == recorded
+
+
+def test_unknown_interpolation():
+    """Test ValueError is raised for unknown interpolation."""
+    with pytest.raises(ValueError):
+        MoveResampler(100, 'cubic')
@@ -0,0 +1,73 @@
+"""Tests collection for ring_buffer.py module."""
+import threading
+
+from tools.ring_buffer import BufferConsumer, RingBuffer
+
+
+def test_capacity_is_rounded_to_power_of_two():
+    """Test capacity of the buffer."""
+    assert RingBuffer(1000).capacity == 1024
+    assert RingBuffer(1024).capacity == 1024
+
+
+def test_items_are_taken_in_push_order_across_the_end():
+    """Test items wrapped around the end of buffer keep order."""
+    buffer = RingBuffer(4)
+
+    for item in range(3):
+        buffer.push(item)
+    assert buffer.pop_all() == [0, 1, 2]
+    for item in range(3, 7):
+        buffer.push(item)
+
+    assert len(buffer) == 4
+    assert buffer.pop_all() == [3, 4, 5, 6]
+    assert buffer.pop_all() == []
+
+
+def test_items_are_dropped_when_buffer_is_full():
+    """Test push does not wait when the buffer is full."""
+    buffer = RingBuffer(2)
+
+    results = [buffer.push(item) for item in range(3)]
+
+    assert results == [True, True, False]
+    assert buffer.dropped == 1
+    assert buffer.pop_all() == [0, 1]
+
+
+def test_consumer_handles_items_from_other_thread():
+    """Test all items pushed by producer thread are handled in order."""
+    buffer = RingBuffer(1 << 16)
+    handled = []
+    consumer = BufferConsumer(buffer, handled.append, interval=0.001)
+
+    consumer.start()
+    producer = threading.Thread(target=lambda: [buffer.push(i) for i in range(50000)])
+    producer.start()
+    producer.join()
+    consumer.stop()
+
+    assert handled == list(range(50000))
+
+
+def test_consumer_reports_time_of_previous_check():
+    """Test progress lags one check behind, so item stamped before it is handled."""
+    buffer = RingBuffer(8)
+    clock = [10]
+    reported = []
+    consumer = BufferConsumer(
+        buffer,
+        lambda item: None,
+        progress=reported.append,
+        now=lambda: clock[0],
+    )
+
+    consumer.drain()
+    clock[0] = 20
+    buffer.push(15)
+    consumer.drain()
+    clock[0] = 30
+    consumer.drain()
+
+    assert reported == [10, 20]
@@ -0,0 +1,76 @@
+"""Tests collection for rolling.py module."""
+import pytest
+
+from tools.database import Database
+from tools.events import Event
+from tools.rolling import RollingCapture
+
+
+def test_old_events_are_removed():
+    """Test only events from the last max_age_ns are kept."""
+    capture = RollingCapture(max_age_ns=100)
+
+    for time_ns in range(0, 1000, 10):
+        capture((Event.MOVE.value, time_ns, time_ns, 0))
+
+    assert len(capture) == 11
+    assert capture.snapshot()[0] == (Event.MOVE.value, 0, 890, 0)
+    assert capture.snapshot()[-1] == (Event.MOVE.value, 100, 990, 0)
+
+
+def test_number_of_events_is_limited():
+    """Test only the last max_events events are kept."""
+    capture = RollingCapture(max_events=3)
+
+    for time_ns in range(10):
+        capture({'keyboard_key_press': ({'key': "'a'"}, {'time_ns': time_ns})})
+
+    assert capture.snapshot() == [
+        (Event.KEY_PRESS.value, time_ns, "'a'", 0) for time_ns in range(3)
+    ]
+
+
+def test_dump_kept_events(tmp_path):
+    """Test kept events are saved and loaded from the file.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    capture = RollingCapture(max_events=2)
+    for time_ns in (5, 15, 25):
+        capture((Event.SCROLL.value, time_ns, 0, -1))
+
+    capture.dump(tmp_path / 'capture.json', 'json')
+
+    with Database(tmp_path / 'capture.json') as database:
+        assert database.load() == [
+            {'mouse_scroll': [{'vector_dx': 0, 'vector_dy': -1}, {'time_ns': 0}]},
+            {'mouse_scroll': [{'vector_dx': 0, 'vector_dy': -1}, {'time_ns': 10}]},
+        ]
+
+
+def test_capture_size_is_required():
+    """Test ValueError is raised without max_age_ns and max_events."""
+    with pytest.raises(ValueError):
+        RollingCapture()
+
+
+def test_out_of_order_events_are_removed_by_time():
+    """Test events from other recorder thread coming late are kept by time."""
+    capture = RollingCapture(max_age_ns=100)
+
+    for time_ns in (100, 150, 20, 200, 90, 140):
+        capture((Event.MOVE.value, time_ns, time_ns, 0))
+
+    assert [row[2] for row in capture.snapshot()] == [100, 140, 150, 200]
+
+
+def test_max_events_keeps_the_newest_by_time():
+    """Test late old event does not push out newer ones."""
+    capture = RollingCapture(max_events=2)
+
+    for time_ns in (10, 30, 5):
+        capture((Event.MOVE.value, time_ns, time_ns, 0))
+
+    assert [row[2] for row in capture.snapshot()] == [10, 30]
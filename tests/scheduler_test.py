@@ -0,0 +1,119 @@
+"""Tests collection for scheduler.py module."""
+import time
+
+import pytest
+
+from tools.scheduler import DeadlineScheduler
+
+
+def test_deadline_is_counted_from_start(mocker):
+    """Test deadline is the time of event added to playback start.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(time, 'perf_counter_ns', return_value=5000)
+    scheduler = DeadlineScheduler()
+
+    scheduler.start()
+
+    assert scheduler.deadline(1500) == 6500
+
+
+def test_sleep_until_spin_part_of_wait(mocker):
+    """Test sleep covers wait time without the spin part.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(time, 'perf_counter_ns', side_effect=[0, 0, 10**9])
+    sleep = mocker.patch.object(time, 'sleep')
+    scheduler = DeadlineScheduler(spin_ns=1000)
+
+    scheduler.start()
+    scheduler.wait(10**9)
+
+    sleep.assert_called_once_with((10**9 - 1000) / 1e9)
+
+
+def test_passed_deadline_is_not_delayed(mocker):
+    """Test late event is played at once.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    sleep = mocker.patch.object(time, 'sleep')
+    scheduler = DeadlineScheduler()
+
+    scheduler.wait_until(time.perf_counter_ns() - 1)
+
+    sleep.assert_not_called()
+
+
+def test_drift_does_not_accumulate(mocker):
+    """Test sleep overshoot of every wait is not added to later deadlines.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    clock = [1000]
+
+    def oversleep(seconds):
+        clock[0] += round(seconds * 1e9) + 300_000
+
+    mocker.patch.object(time, 'perf_counter_ns', side_effect=lambda: clock[0])
+    mocker.patch.object(time, 'sleep', side_effect=oversleep)
+    scheduler = DeadlineScheduler(spin_ns=0)
+
+    scheduler.start()
+    woken = []
+    for time_ns in range(1_000_000, 50_000_000, 1_000_000):
+        scheduler.wait(time_ns)
+        woken.append(clock[0] - scheduler.start_ns - time_ns)
+
+    assert woken == [300_000] * 49
+
+
+def test_speed_factor_scales_deadlines(mocker):
+    """Test faster playback divides time since start.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(time, 'perf_counter_ns', return_value=0)
+    scheduler = DeadlineScheduler(speed=4)
+
+    scheduler.start()
+
+    assert [scheduler.deadline(time_ns) for time_ns in (400, 1000, 1002)] == [
+        100, 250, 250,
+    ]
+
+
+def test_idle_gaps_are_capped(mocker):
+    """Test long gaps between events are cut and short ones are kept.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(time, 'perf_counter_ns', return_value=1000)
+    scheduler = DeadlineScheduler(speed=2, max_gap_ns=100)
+
+    scheduler.start()
+
+    assert [scheduler.deadline(time_ns) for time_ns in (50, 10_000, 10_060)] == [
+        1025, 1075, 1105,
+    ]
+
+
+def test_speed_out_of_range():
+    """Test ValueError is raised for unsupported speed."""
+    for speed in (0.1, 101):
+        with pytest.raises(ValueError):
+            DeadlineScheduler(speed=speed)
@@ -0,0 +1,110 @@
+"""Tests collection for seek.py module."""
+from tools import columnar
+from tools.events import Event, to_event
+from tools.seek import InputState, TimeIndex
+
+MOVE, CLICK, PRESS, RELEASE = (
+    Event.MOVE.value, Event.CLICK.value, Event.KEY_PRESS.value, Event.KEY_RELEASE.value,
+)
+ROWS = [
+    (MOVE, 0, 1, 1),
+    (PRESS, 10, 'Key.shift', 0),
+    (MOVE, 20, 5, 5),
+    (CLICK, 30, 'Button.left', 1),
+    (PRESS, 40, "'a'", 0),
+    (RELEASE, 50, "'a'", 0),
+    (MOVE, 60, 9, 9),
+    (CLICK, 70, 'Button.left', 0),
+    (RELEASE, 80, 'Key.shift', 0),
+]
+
+
+def columnar_recording(rows: list, block_size: int):
+    """Return columnar recording with rows in blocks of given size."""
+    class Buffer(bytearray):
+        def write(self, data):
+            self.extend(data)
+
+    buffer = Buffer()
+    columnar.write(buffer, rows, block_size=block_size)
+    return columnar.ColumnarRecording(bytes(buffer))
+
+
+def test_seek_finds_first_event_not_earlier():
+    """Test seek returns number of the first event at or after time."""
+    index = TimeIndex(ROWS, step=2)
+
+    assert index.seek(-5) == 0
+    assert index.seek(30) == 3
+    assert index.seek(31) == 4
+    assert index.seek(1000) == len(ROWS)
+
+
+def test_seek_in_columnar_blocks():
+    """Test columnar recording is indexed by its blocks."""
+    recording = columnar_recording(ROWS, block_size=4)
+    index = TimeIndex(recording)
+
+    assert index.numbers == [0, 4, 8]
+    assert [index.seek(time_ns) for time_ns in (0, 45, 80)] == [0, 5, 8]
+
+
+def test_state_at_seek_point():
+    """Test held keys, buttons and mouse position are reconstructed."""
+    index = TimeIndex([to_event(row) for row in ROWS], step=3)
+
+    state = index.state_at(index.seek(45))
+
+    assert state.position == (5, 5)
+    assert list(state.keys) == ['Key.shift', "'a'"]
+    assert list(state.buttons) == ['Button.left']
+
+
+def test_state_at_reads_only_block_of_seek_point(mocker):
+    """Test state saved with the block is used instead of earlier events.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    index = TimeIndex(columnar_recording(ROWS, block_size=2))
+    decode = mocker.spy(columnar.ColumnarBlock, 'from_payload')
+
+    state = index.state_at(index.seek(65))
+
+    assert decode.call_count == 1
+    assert state.position == (9, 9)
+    assert list(state.keys) == ['Key.shift']
+    assert list(state.buttons) == ['Button.left']
+
+
+def test_slice_restores_and_releases_state():
+    """Test slice presses held input first and releases it at the end."""
+    index = TimeIndex(ROWS, step=4)
+
+    rows = list(index.slice(35, 65))
+
+    assert rows == [
+        (MOVE, 0, 5, 5),
+        (CLICK, 0, 'Button.left', 1),
+        (PRESS, 0, 'Key.shift', 0),
+        (PRESS, 5, "'a'", 0),
+        (RELEASE, 15, "'a'", 0),
+        (MOVE, 25, 9, 9),
+        (RELEASE, 30, 'Key.shift', 0),
+        (CLICK, 30, 'Button.left', 0),
+    ]
+
+
+def test_release_rows_of_empty_state():
+    """Test nothing is released without held input."""
+    assert InputState().release_rows(0) == []
+
+
+def test_seek_equal_times_across_index_entries():
+    """Test events with the seek time before an index entry are not skipped."""
+    rows = [(MOVE, time_ns, 1, 1) for time_ns in (0, 5, 10, 10, 20)]
+
+    assert TimeIndex(rows, step=3).seek(10) == 2
+    assert TimeIndex(columnar_recording(rows, block_size=3)).seek(10) == 2
+    assert TimeIndex([], step=3).seek(10) == 0
@@ -0,0 +1,143 @@
+"""Tests collection for simplify.py module."""
+import random
+
+import pytest
+
+from tools import simplify
+from tools.database import Database
+from tools.events import Event, iter_rows
+from tools.simplify import PathSimplifier, compact_events, compact_file, simplify_path
+
+
+def move(time_ns, x, y):
+    """Return mouse move row.
+
+    Args:
+        time_ns (int): time of move.
+        x (int): horizontal coordinate.
+        y (int): vertical coordinate.
+
+    Returns (tuple): with mouse move row.
+
+    """
+    return Event.MOVE.value, time_ns, x, y
+
+
+def test_points_on_straight_line_are_removed():
+    """Test only ends of straight path are kept."""
+    points = [(x, 2 * x) for x in range(100)]
+
+    assert simplify_path(points, 0.5) == [0, 99]
+
+
+def test_corner_of_path_is_kept():
+    """Test point far from the line between ends is kept."""
+    points = [(0, 0), (5, 0), (10, 0), (10, 5), (10, 10)]
+
+    assert simplify_path(points, 1) == [0, 2, 4]
+    assert simplify_path(points, 100) == [0, 4]
+
+
+def test_simplifier_keeps_other_events_and_order():
+    """Test events other than moves are passed and end the run."""
+    events = []
+    simplifier = PathSimplifier(events.append, tolerance=1)
+    click = (Event.CLICK.value, 55, 'Button.left', 1)
+
+    for time_ns in range(5):
+        simplifier(move(time_ns, time_ns, 0))
+    simplifier(click)
+    for time_ns in range(60, 65):
+        simplifier(move(time_ns, 4, time_ns))
+    simplifier.flush()
+
+    assert events == [
+        move(0, 0, 0), move(4, 4, 0), click, move(60, 4, 60), move(64, 4, 64),
+    ]
+
+
+def test_pause_ends_the_run():
+    """Test the time of moves around a pause is kept."""
+    events = []
+    simplifier = PathSimplifier(events.append, tolerance=1, max_gap_ns=10)
+
+    for time_ns in (0, 1, 2, 50, 51, 52):
+        simplifier(move(time_ns, time_ns, 0))
+    simplifier.flush()
+
+    assert [event[1] for event in events] == [0, 2, 50, 52]
+
+
+def test_progress_is_not_later_than_held_moves(mocker):
+    """Test sink is not told about time after the first held move.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    sink = mocker.Mock()
+    simplifier = PathSimplifier(sink, tolerance=1)
+
+    simplifier.progress(5)
+    simplifier(move(10, 10, 0))
+    simplifier.progress(20)
+
+    assert [call.args for call in sink.progress.call_args_list] == [(5,), (10,)]
+
+
+def test_long_run_is_split():
+    """Test run longer than max_points is simplified in parts."""
+    events = []
+    simplifier = PathSimplifier(events.append, tolerance=1, max_points=10)
+
+    for time_ns in range(25):
+        simplifier(move(time_ns, time_ns, 0))
+    simplifier.flush()
+
+    assert [event[1] for event in events] == [0, 9, 18, 24]
+
+
+def test_compact_dict_events_without_numpy(mocker):
+    """Test recorded dict events are compacted by pure python algorithm.
+
+    Args:
+        mocker (pytest_mock): mock to catch called methods.
+
+    """
+    mocker.patch.object(simplify, 'numpy', None)
+    events = [
+        {'mouse_move': ({'coordinate_x': x, 'coordinate_y': 0}, {'time_ns': x})}
+        for x in range(10)
+    ]
+
+    assert compact_events(events, 1) == [events[0], events[-1]]
+
+
+def test_compact_columnar_file_to_json(tmp_path):
+    """Test columnar recording compacted to json file can be loaded back.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    source, target = tmp_path / 'events.clkr', tmp_path / 'events.json'
+    with Database(source, 'w', 'columnar') as database:
+        database.save([move(x, x, 0) for x in range(10)])
+
+    compact_file(source, target, 1, storage='json')
+
+    with Database(target) as database:
+        assert list(iter_rows(database.load())) == [move(0, 0, 0), move(9, 9, 0)]
+
+
+def test_numpy_and_python_keep_the_same_points():
+    """Test vectorised algorithm gives the same result as pure python one."""
+    pytest.importorskip('numpy')
+    generator = random.Random(0)
+    points = [(0, 0)]
+    for _ in range(2000):
+        x, y = points[-1]
+        points.append((x + generator.randint(-3, 5), y + generator.randint(-5, 3)))
+
+    for tolerance in (0.5, 2, 10):
+        assert simplify.simplify_path_numpy(points, tolerance) == simplify_path(points, tolerance)
@@ -0,0 +1,43 @@
+"""Tests collection for stop.py module."""
+from unittest.mock import MagicMock
+
+from tools.stop import StopSignal
+
+
+def test_subscribers_are_called_once_when_signal_is_set():
+    """Test every subscribed callback is called once."""
+    signal = StopSignal()
+    first, second = MagicMock(), MagicMock()
+    signal.subscribe(first)
+    signal.subscribe(second)
+
+    signal.set()
+    signal.set()
+
+    assert signal.is_set()
+    first.assert_called_once_with()
+    second.assert_called_once_with()
+
+
+def test_late_subscriber_is_called_at_once():
+    """Test callback subscribed after the signal is set is called at once."""
+    signal = StopSignal()
+    callback = MagicMock()
+
+    signal.set()
+    signal.subscribe(callback)
+
+    callback.assert_called_once_with()
+
+
+def test_clear_signal():
+    """Test cleared signal does not call old callbacks."""
+    signal = StopSignal()
+    callback = MagicMock()
+    signal.subscribe(callback)
+
+    signal.clear()
+    signal.set()
+
+    assert signal.is_set()
+    callback.assert_not_called()
@@ -0,0 +1,53 @@
+"""Tests collection for timeline.py module."""
+import pytest
+
+from tools.database import Database
+from tools.events import Event, to_event
+from tools.timeline import Timeline, Track
+
+MOVES = [(Event.MOVE.value, 0, 1, 1), (Event.MOVE.value, 100, 2, 2)]
+KEYS = [(Event.KEY_PRESS.value, 0, "'a'", 0), (Event.KEY_RELEASE.value, 60, "'a'", 0)]
+
+
+def test_track_applies_offset_and_speed():
+    """Test recording time is scaled by speed and moved by offset."""
+    track = Track(MOVES, offset_ns=1000, speed=2)
+
+    assert [row[1] for row in track.rows()] == [1000, 1050]
+
+
+def test_track_rejects_not_positive_speed():
+    """Test zero speed raises error."""
+    with pytest.raises(ValueError):
+        Track(MOVES, speed=0)
+
+
+def test_timeline_merges_tracks_by_time():
+    """Test events of all tracks are sorted, ties keep order of tracks."""
+    timeline = Timeline().add(MOVES).add(KEYS, offset_ns=50)
+
+    assert [row[:2] for row in timeline] == [
+        (Event.MOVE.value, 0),
+        (Event.KEY_PRESS.value, 50),
+        (Event.MOVE.value, 100),
+        (Event.KEY_RELEASE.value, 110),
+    ]
+
+
+def test_timeline_reads_files(tmp_path):
+    """Test recordings are read from json and columnar files.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    with Database(tmp_path / 'moves.bin', 'w', 'columnar') as database:
+        database.save(MOVES)
+    with Database(tmp_path / 'keys.json', 'w') as database:
+        database.save([to_event(row) for row in KEYS])
+
+    with Timeline() as timeline:
+        timeline.open(tmp_path / 'moves.bin').open(tmp_path / 'keys.json', offset_ns=10)
+        rows = list(timeline)
+
+    assert [row[1] for row in rows] == [0, 10, 70, 100]
@@ -0,0 +1,54 @@
+"""Tests collection for timing.py module."""
+import pytest
+
+from tools.timing import TimingRecorder, TimingReport, percentile
+
+
+def test_percentile_is_nearest_rank():
+    """Test percentile returns value at the nearest rank."""
+    values = list(range(1, 101))
+
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0
+
+
+def test_recorder_grows_above_capacity():
+    """Test more events than preallocated are kept."""
+    recorder = TimingRecorder(capacity=2)
+
+    for i in range(5):
+        recorder.record(i * 100, i * 100 + i)
+
+    assert len(recorder) == 5
+    assert recorder.lateness() == [0, 1, 2, 3, 4]
+
+
+def test_start_forgets_previous_playback():
+    """Test start clears recorded times."""
+    recorder = TimingRecorder()
+    recorder.record(0, 10)
+
+    recorder.start()
+
+    assert recorder.lateness() == []
+
+
+def test_report_statistics():
+    """Test report counts percentiles, drift and histogram."""
+    report = TimingReport([5_000, 20_000, 20_000, 2_000_000], bounds_ns=(10_000, 1_000_000))
+
+    assert report.count == 4
+    assert report.p50_ns == 20_000
+    assert report.max_ns == 2_000_000
+    assert report.drift_ns == 1_995_000
+    assert report.histogram == [(10_000, 1), (1_000_000, 2), (None, 1)]
+
+
+def test_check_raises_when_threshold_is_exceeded():
+    """Test check fails run with too big drift."""
+    report = TimingReport([0, 1_000, 5_000_000])
+
+    assert report.violations(max_p99_ns=10_000_000) == []
+    with pytest.raises(ValueError, match='Drift'):
+        report.check(max_drift_ns=1_000_000)
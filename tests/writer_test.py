@@ -0,0 +1,80 @@
+"""Tests collection for writer.py module."""
+from tools.database import Database
+from tools.events import Event
+from tools.writer import RecordingWriter
+
+
+def test_written_events_are_loaded_in_time_order(tmp_path):
+    """Test events put into the writer are saved sorted by time.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.clkr'
+
+    with RecordingWriter(filename, batch_size=2) as writer:
+        writer.write((Event.MOVE.value, 20, 1, 2))
+        writer.write((Event.MOVE.value, 10, 3, 4))
+        writer.write({'keyboard_key_press': ({'key': "'q'"}, {'time': 1e-07})})
+
+    with Database(filename) as database:
+        recording = database.load()
+        rows = list(recording)
+
+    assert rows == [
+        (Event.MOVE.value, 10, 3, 4),
+        (Event.MOVE.value, 20, 1, 2),
+        (Event.KEY_PRESS.value, 100, "'q'", 0),
+    ]
+    assert recording.block_state(1).position == (1, 2)
+    assert writer.written == 3
+
+
+def test_events_are_flushed_before_close(tmp_path):
+    """Test batch is flushed to disk when flush interval passes.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.clkr'
+
+    with RecordingWriter(filename, flush_interval=0.01) as writer:
+        writer.write((Event.SCROLL.value, 5, 0, -1))
+        while writer.written == 0:
+            writer.thread.join(0.01)
+        with Database(filename) as database:
+            assert list(database.load()) == [(Event.SCROLL.value, 5, 0, -1)]
+
+
+def test_events_are_held_until_every_source_passes_them(tmp_path):
+    """Test event delivered late by one source is written before newer ones.
+
+    Args:
+        tmp_path (pathlib.Path): temporary directory.
+
+    """
+    filename = tmp_path / 'events.clkr'
+
+    with RecordingWriter(filename, flush_interval=0.01) as writer:
+        mouse, keyboard = writer.source(), writer.source()
+        keyboard((Event.KEY_PRESS.value, 20, "'a'", 0))
+        keyboard.progress(30)
+        mouse.progress(10)
+        writer.thread.join(0.05)
+        assert writer.written == 0
+        mouse((Event.MOVE.value, 15, 1, 2))
+        mouse.progress(40)
+        while writer.written < 2:
+            writer.thread.join(0.01)
+        keyboard((Event.KEY_PRESS.value, 35, "'b'", 0))
+
+    with Database(filename) as database:
+        rows = list(database.load())
+
+    assert rows == [
+        (Event.MOVE.value, 15, 1, 2),
+        (Event.KEY_PRESS.value, 20, "'a'", 0),
+        (Event.KEY_PRESS.value, 35, "'b'", 0),
+    ]
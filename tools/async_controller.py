@@ -0,0 +1,48 @@
+"""Module for play recorded events on asyncio event loop."""
+import asyncio
+import time
+
+from tools.controller import PlayEvents
+from tools.plan import iter_plan
+
+
+class AsyncPlayEvents(PlayEvents):
+    """Class to play recorded events as asyncio coroutine.
+
+    Waiting for events is done by asyncio.sleep until deadlines counted by
+    the scheduler, so many recordings can be played on one thread. Playback
+    is stopped by cancelling its task. Handlers and blocking play() are the
+    same as in PlayEvents.
+
+    Methods:
+        play_async(): Coroutine playing events at their deadlines.
+    """
+    async def play_async(self):
+        """Coroutine playing events at their deadlines.
+
+        Busy loop is not used, precision of waiting is limited by the event
+        loop, late events still give other coroutines a chance to run.
+
+        """
+        plan = self.plan if self.plan is not None else iter_plan(self._events(), self.options)
+        now = time.perf_counter_ns
+        self.scheduler.start()
+        for deadline_ns in self._dispatch(plan):
+            await asyncio.sleep(max(deadline_ns - now(), 0) / 1e9)
+
+
+async def play_concurrently(*players: AsyncPlayEvents):
+    """Play all recordings at the same time on the running event loop.
+
+    When one playback fails or is cancelled, the others are cancelled too.
+
+    Args:
+        *players (AsyncPlayEvents): recordings to play.
+
+    """
+    tasks = [asyncio.ensure_future(player.play_async()) for player in players]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
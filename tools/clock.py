@@ -0,0 +1,29 @@
+"""Module with the clock shared by recorders."""
+import time
+
+
+class RecordingClock:
+    """Class to measure time since start record in integer nanoseconds.
+
+    The clock is monotonic, so system time changes do not affect recording,
+    and shared by recorders, so their events have the same zero point.
+
+    Methods:
+        start(): Set start record time to now.
+        now(): Return time since start record.
+    """
+    def __init__(self):
+        """RecordingClock class constructor."""
+        self.start_ns = time.perf_counter_ns()
+
+    def start(self):
+        """Set start record time to now."""
+        self.start_ns = time.perf_counter_ns()
+
+    def now(self) -> int:
+        """Return time since start record.
+
+        Returns (int): time since start record in ns.
+
+        """
+        return time.perf_counter_ns() - self.start_ns
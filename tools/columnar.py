@@ -0,0 +1,626 @@
+"""Module to save and load events packed into typed columns.
+
+File layout (little-endian):
+    header: magic b'CLKR', version (uint16), flags (uint16) with the codec
+        of blocks: 0 - raw, 1 - zlib, 2 - lzma.
+    blocks: header with events count, payload size, first and last time
+        and state size, then payload with columns: time in ns (int64),
+        a (int32), b (int32), opcode (uint8) and the table with button and
+        key names, then input state before the first event of the block:
+        mouse position and the table with held buttons and keys.
+
+Columns "a" and "b" keep x/y, dx/dy or index of the button or key name
+in the block strings table and pressed flag.
+
+Payload of compressed blocks keeps opcodes, then time, a and b columns as
+zigzag varints of differences to the previous value (for a and b to the
+previous event of the same type) and the strings table. Every block is
+compressed separately, so it can be decoded without other blocks. Input
+state is not compressed, files of version 2 and older have no state.
+"""
+import array
+import bisect
+import lzma
+import struct
+import sys
+import zlib
+
+from tools.events import STRING_OPCODES
+from tools.state import InputState
+
+MAGIC = b'CLKR'
+VERSION = 3
+FILE_HEADER = struct.Struct('<4sHH')
+BLOCK_HEADER = struct.Struct('<IIqqI4x')
+OLD_BLOCK_HEADER = struct.Struct('<IIqq')
+STATE_HEADER = struct.Struct('<BiiI')
+STRING_COUNT = struct.Struct('<I')
+STRING_SIZE = struct.Struct('<H')
+BLOCK_SIZE = 4096
+CODECS = {None: 0, 'zlib': 1, 'lzma': 2}
+COMPRESS = {
+    1: lambda data: zlib.compress(data, 9),
+    2: lzma.compress,
+}
+DECOMPRESS = {
+    1: zlib.decompress,
+    2: lzma.decompress,
+}
+
+
+def _align(size: int) -> int:
+    """Round size up to the multiple of 8 bytes."""
+    return (size + 7) & ~7
+
+
+def _column(buffer: memoryview, typecode: str):
+    """Return typed view of the column without copying data.
+
+    Args:
+        buffer (memoryview): with raw column bytes.
+        typecode (str): array typecode of the column.
+
+    Returns: memoryview on little-endian platforms, array otherwise.
+
+    """
+    if sys.byteorder == 'little':
+        return buffer.cast(typecode)
+    column = array.array(typecode, buffer.tobytes())
+    column.byteswap()
+    return column
+
+
+def _pack_varints(values, output: bytearray):
+    """Append values to output as zigzag varints.
+
+    Args:
+        values (iterable): with integers.
+        output (bytearray): encoded bytes.
+
+    """
+    append = output.append
+    for value in values:
+        value = value << 1 if value >= 0 else (-value << 1) - 1
+        while value > 0x7f:
+            append(value & 0x7f | 0x80)
+            value >>= 7
+        append(value)
+
+
+def _unpack_varints(buffer: bytes, offset: int, count: int) -> tuple:
+    """Read zigzag varints from buffer.
+
+    Args:
+        buffer (bytes): encoded bytes.
+        offset (int): position of the first varint.
+        count (int): number of varints to read.
+
+    Returns (tuple): with list of integers and position after them.
+
+    """
+    values = []
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            byte = buffer[offset]
+            offset += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values.append(value >> 1 if not value & 1 else -((value + 1) >> 1))
+    return values, offset
+
+
+def _deltas(values, opcodes=None) -> list:
+    """Return differences to the previous value, of the same opcode if passed."""
+    previous = {}
+    result = []
+    for index, value in enumerate(values):
+        key = opcodes[index] if opcodes is not None else None
+        result.append(value - previous.get(key, 0))
+        previous[key] = value
+    return result
+
+
+def _undo_deltas(deltas: list, opcodes=None) -> list:
+    """Return values from differences to the previous value."""
+    previous = {}
+    result = []
+    for index, delta in enumerate(deltas):
+        key = opcodes[index] if opcodes is not None else None
+        value = previous.get(key, 0) + delta
+        result.append(value)
+        previous[key] = value
+    return result
+
+
+def _pack_strings(strings) -> bytes:
+    """Pack names of buttons and keys into the strings table."""
+    table = [STRING_COUNT.pack(len(strings))]
+    for name in strings:
+        encoded = name.encode('utf-8')
+        table.append(STRING_SIZE.pack(len(encoded)))
+        table.append(encoded)
+    return b''.join(table)
+
+
+def _unpack_strings(buffer, offset: int) -> list:
+    """Read names of buttons and keys from the strings table."""
+    (strings_count,) = STRING_COUNT.unpack_from(buffer, offset)
+    offset += STRING_COUNT.size
+    strings = []
+    for _ in range(strings_count):
+        (size,) = STRING_SIZE.unpack_from(buffer, offset)
+        offset += STRING_SIZE.size
+        strings.append(bytes(buffer[offset:offset + size]).decode('utf-8'))
+        offset += size
+    return strings
+
+
+def encode_payload(rows: list, codec: int = 0) -> bytes:
+    """Pack rows into block payload.
+
+    Args:
+        rows (list): with (opcode, time_ns, a, b) rows.
+        codec (int): codec of the block payload, one of CODECS values.
+
+    Returns (bytes): with columns and strings table.
+
+    """
+    times = array.array('q')
+    column_a = array.array('i')
+    column_b = array.array('i')
+    opcodes = array.array('B')
+    strings = {}
+    for opcode, time_ns, a, b in rows:
+        if opcode in STRING_OPCODES:
+            a = strings.setdefault(a, len(strings))
+        opcodes.append(opcode)
+        times.append(time_ns)
+        column_a.append(int(a))
+        column_b.append(int(b))
+    table = _pack_strings(strings)
+
+    if codec:
+        payload = bytearray(opcodes.tobytes())
+        _pack_varints(_deltas(times), payload)
+        _pack_varints(_deltas(column_a, opcodes), payload)
+        _pack_varints(_deltas(column_b, opcodes), payload)
+        payload = COMPRESS[codec](bytes(payload + table))
+    else:
+        if sys.byteorder != 'little':
+            for column in (times, column_a, column_b):
+                column.byteswap()
+        columns = b''.join((
+            times.tobytes(),
+            column_a.tobytes(),
+            column_b.tobytes(),
+            opcodes.tobytes(),
+        ))
+        columns += bytes(_align(len(columns)) - len(columns))
+        payload = columns + table + bytes(_align(len(table)) - len(table))
+    return payload
+
+
+def pack_state(state: InputState) -> bytes:
+    """Pack input state into bytes.
+
+    Args:
+        state (InputState): with held keys and buttons and mouse position.
+
+    Returns (bytes): with mouse position and table of buttons and keys.
+
+    """
+    x, y = state.position if state.position is not None else (0, 0)
+    header = STATE_HEADER.pack(state.position is not None, x, y, len(state.buttons))
+    return header + _pack_strings([*state.buttons, *state.keys])
+
+
+def unpack_state(buffer, offset: int = 0) -> InputState:
+    """Read input state packed by pack_state.
+
+    Args:
+        buffer: bytes-like object with packed state.
+        offset (int): position of the state.
+
+    Returns (InputState): with held keys and buttons and mouse position.
+
+    """
+    has_position, x, y, buttons = STATE_HEADER.unpack_from(buffer, offset)
+    names = _unpack_strings(buffer, offset + STATE_HEADER.size)
+    state = InputState()
+    if has_position:
+        state.position = x, y
+    state.buttons = dict.fromkeys(names[:buttons])
+    state.keys = dict.fromkeys(names[buttons:])
+    return state
+
+
+def encode_block(rows: list, codec: int = 0, state: InputState = None) -> bytes:
+    """Pack rows into a single block.
+
+    Args:
+        rows (list): with (opcode, time_ns, a, b) rows.
+        codec (int): codec of the block payload, one of CODECS values.
+        state (InputState): input state before the first row, it is saved
+            with the block and updated with rows, None to save no state.
+
+    Returns (bytes): with block header, payload and input state.
+
+    """
+    payload = encode_payload(rows, codec)
+    checkpoint = b''
+    if state is not None:
+        checkpoint = pack_state(state)
+        checkpoint += bytes(_align(len(checkpoint)) - len(checkpoint))
+        for row in rows:
+            state.apply(row)
+    header = BLOCK_HEADER.pack(
+        len(rows),
+        len(payload),
+        rows[0][1] if rows else 0,
+        rows[-1][1] if rows else 0,
+        len(checkpoint),
+    )
+    return header + payload + checkpoint
+
+
+class ColumnarBlock:
+    """Class with a block of events kept in typed columns.
+
+    Methods:
+        from_payload(buffer, count, codec): Create block from its payload.
+        time_ns(index): Return time of event with given index.
+    """
+    def __init__(self, times, column_a, column_b, opcodes, strings: list):
+        """ColumnarBlock class constructor.
+
+        Args:
+            times: sequence with time of events in ns.
+            column_a: sequence with x, dx or index of button or key name.
+            column_b: sequence with y, dy or pressed flag.
+            opcodes: sequence with event opcodes.
+            strings (list): with names of buttons and keys.
+
+        """
+        self.count = len(opcodes)
+        self.times = times
+        self.column_a = column_a
+        self.column_b = column_b
+        self.opcodes = opcodes
+        self.strings = strings
+
+    @classmethod
+    def from_payload(cls, buffer: memoryview, count: int, codec: int = 0) -> 'ColumnarBlock':
+        """Create block from its payload.
+
+        Raw payload is not copied, columns are views of the buffer.
+
+        Args:
+            buffer (memoryview): with block payload.
+            count (int): number of events in block.
+            codec (int): codec of the block payload.
+
+        Returns (ColumnarBlock): block with events.
+
+        """
+        if codec:
+            data = DECOMPRESS[codec](buffer)
+            opcodes = data[:count]
+            times, offset = _unpack_varints(data, count, count)
+            column_a, offset = _unpack_varints(data, offset, count)
+            column_b, offset = _unpack_varints(data, offset, count)
+            return cls(
+                _undo_deltas(times),
+                _undo_deltas(column_a, opcodes),
+                _undo_deltas(column_b, opcodes),
+                opcodes,
+                _unpack_strings(data, offset),
+            )
+        return cls(
+            _column(buffer[:8 * count], 'q'),
+            _column(buffer[8 * count:12 * count], 'i'),
+            _column(buffer[12 * count:16 * count], 'i'),
+            buffer[16 * count:17 * count],
+            _unpack_strings(buffer, _align(17 * count)),
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> tuple:
+        opcode = self.opcodes[index]
+        a = self.column_a[index]
+        if opcode in STRING_OPCODES:
+            a = self.strings[a]
+        return opcode, self.times[index], a, self.column_b[index]
+
+    def __iter__(self):
+        strings = self.strings
+        for opcode, time_ns, a, b in zip(
+            self.opcodes, self.times, self.column_a, self.column_b,
+        ):
+            if opcode in STRING_OPCODES:
+                a = strings[a]
+            yield opcode, time_ns, a, b
+
+    def time_ns(self, index: int) -> int:
+        """Return time of event with given index.
+
+        Args:
+            index (int): event index in block.
+
+        Returns (int): time since start record in ns.
+
+        """
+        return self.times[index]
+
+
+def block_header(version: int) -> struct.Struct:
+    """Return struct of block header used by the file version.
+
+    Args:
+        version (int): columnar file version.
+
+    Returns (struct.Struct): block header struct.
+
+    """
+    return BLOCK_HEADER if version >= 3 else OLD_BLOCK_HEADER
+
+
+def unpack_block_header(header: struct.Struct, buffer, offset: int = 0) -> tuple:
+    """Read block header of any file version.
+
+    Args:
+        header (struct.Struct): block header struct of the file version.
+        buffer: bytes-like object with the header.
+        offset (int): position of the header.
+
+    Returns (tuple): with events count, payload size, first and last time
+        and state size, 0 for blocks without state.
+
+    """
+    fields = header.unpack_from(buffer, offset)
+    return fields if len(fields) == 5 else (*fields, 0)
+
+
+def read_block(
+    buffer: memoryview,
+    offset: int,
+    codec: int = 0,
+    header: struct.Struct = BLOCK_HEADER,
+) -> tuple:
+    """Read block starting at given offset.
+
+    Args:
+        buffer (memoryview): with the whole recording.
+        offset (int): block header offset.
+        codec (int): codec of the block payload.
+        header (struct.Struct): block header struct of the file version.
+
+    Returns (tuple): with block and offset of the next block.
+
+    """
+    count, size, _, _, state_size = unpack_block_header(header, buffer, offset)
+    start = offset + header.size
+    block = ColumnarBlock.from_payload(buffer[start:start + size], count, codec)
+    return block, start + size + state_size
+
+
+def file_header(compression: str = None) -> bytes:
+    """Return file header.
+
+    Args:
+        compression (str): None, 'zlib' or 'lzma'.
+
+    Returns (bytes): with magic, version and codec.
+
+    """
+    if compression not in CODECS:
+        raise ValueError(f'Compression must be one of {tuple(CODECS)}.')
+    return FILE_HEADER.pack(MAGIC, VERSION, CODECS[compression])
+
+
+def _check_header(magic: bytes, version: int):
+    """Raise ValueError if file is not supported columnar recording."""
+    if magic != MAGIC:
+        raise ValueError('Not a columnar recording.')
+    if version > VERSION:
+        raise ValueError(f'Unsupported columnar recording version: {version}.')
+
+
+class ColumnarRecording:
+    """Class with recorded events kept in typed columns.
+
+    Iterating over recording yields (opcode, time_ns, a, b) rows without
+    building dict per event. Rows are read lazily from the buffer, so the
+    recording can be backed by mmap and played without loading the file.
+
+    Methods:
+        from_buffer(buffer): Create recording from bytes in columnar format.
+        blocks(): Yield blocks of events.
+        block_index(): Return number and time of the first event of every block.
+        block_state(number): Return input state before the block.
+        close(): Release the buffer.
+    """
+    def __init__(self, buffer):
+        """ColumnarRecording class constructor.
+
+        Args:
+            buffer: bytes-like object or mmap with recording in columnar format.
+
+        """
+        self.source = buffer
+        self.buffer = memoryview(buffer)
+        self._offsets = None
+        self._starts = None
+        self._first_ns = None
+        self._states = None
+        self._block = None
+        magic, version, self.codec = FILE_HEADER.unpack_from(self.buffer)
+        _check_header(magic, version)
+        self.version = version
+        self.header = block_header(version)
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'ColumnarRecording':
+        """Create recording from bytes in columnar format.
+
+        Args:
+            buffer: bytes-like object with recording.
+
+        Returns (ColumnarRecording): recording over passed buffer.
+
+        """
+        return cls(buffer)
+
+    def blocks(self):
+        """Yield blocks of events, started iteration goes on after close()."""
+        buffer = self.buffer[:]
+        offset = FILE_HEADER.size
+        while offset < len(buffer):
+            block, offset = read_block(buffer, offset, self.codec, self.header)
+            yield block
+
+    def _build_index(self):
+        """Read block headers to find offsets, first event numbers and times."""
+        if self._offsets is not None:
+            return
+        self._offsets = []
+        self._starts = [0]
+        self._first_ns = []
+        self._states = []
+        offset = FILE_HEADER.size
+        while offset < len(self.buffer):
+            count, size, first_ns, _, state_size = unpack_block_header(
+                self.header, self.buffer, offset,
+            )
+            self._offsets.append(offset)
+            self._starts.append(self._starts[-1] + count)
+            self._first_ns.append(first_ns)
+            offset += self.header.size + size
+            self._states.append(offset if state_size else None)
+            offset += state_size
+
+    def block_index(self) -> list:
+        """Return number and time of the first event of every block.
+
+        Only block headers are read, blocks are not decoded.
+
+        Returns (list): with (event number, time_ns) pairs sorted by time.
+
+        """
+        self._build_index()
+        return list(zip(self._starts, self._first_ns))
+
+    def block_state(self, number: int) -> InputState:
+        """Return input state before the first event of the block.
+
+        Only the state saved with the block is read, events are not decoded.
+
+        Args:
+            number (int): block number.
+
+        Returns (InputState): with held keys and buttons and mouse position,
+            None if the file has no saved state.
+
+        """
+        self._build_index()
+        offset = self._states[number]
+        return unpack_state(self.buffer, offset) if offset is not None else None
+
+    def _read_block(self, number: int) -> ColumnarBlock:
+        """Return block with given number, last used block is cached."""
+        if self._block is None or self._block[0] != number:
+            block, _ = read_block(self.buffer, self._offsets[number], self.codec, self.header)
+            self._block = number, block
+        return self._block[1]
+
+    def __iter__(self):
+        for block in self.blocks():
+            yield from block
+
+    def __len__(self) -> int:
+        self._build_index()
+        return self._starts[-1]
+
+    def __getitem__(self, index: int) -> tuple:
+        self._build_index()
+        if index < 0:
+            index += self._starts[-1]
+        if not 0 <= index < self._starts[-1]:
+            raise IndexError('Recording index out of range.')
+        number = bisect.bisect_right(self._starts, index) - 1
+        return self._read_block(number)[index - self._starts[number]]
+
+    def close(self):
+        """Release the buffer and close the mmap.
+
+        Started iterators over the recording keep views of its buffer and
+        go on reading. If some of them are still alive, the mmap is not
+        closed here, it is closed when the last of them is released.
+
+        """
+        self._block = None
+        self.buffer.release()
+        source, self.source = self.source, None
+        if hasattr(source, 'close'):
+            try:
+                source.close()
+            except BufferError:
+                pass
+
+
+def read_stream(file):
+    """Yield rows reading binary file block by block.
+
+    Only one block is kept in memory, so the file size does not matter.
+
+    Args:
+        file: binary file object positioned at the file header.
+
+    """
+    magic, version, codec = FILE_HEADER.unpack(file.read(FILE_HEADER.size))
+    _check_header(magic, version)
+    header = block_header(version)
+    while data := file.read(header.size):
+        count, size, _, _, state_size = unpack_block_header(header, data)
+        payload = file.read(size)
+        file.read(state_size)
+        yield from ColumnarBlock.from_payload(memoryview(payload), count, codec)
+
+
+def is_columnar(signature: bytes) -> bool:
+    """Check passed file signature belongs to the columnar format.
+
+    Args:
+        signature (bytes): with first bytes of the file.
+
+    Returns (bool): True if file is in columnar format.
+
+    """
+    return signature[:len(MAGIC)] == MAGIC
+
+
+def write(file, rows, block_size: int = BLOCK_SIZE, compression: str = None):
+    """Write rows in columnar format to the binary file.
+
+    Args:
+        file: binary file object.
+        rows: iterable with (opcode, time_ns, a, b) rows.
+        block_size (int): max number of events in one block.
+        compression (str): None, 'zlib' or 'lzma' compression of blocks.
+
+    """
+    file.write(file_header(compression))
+    codec = CODECS[compression]
+    state = InputState()
+    block = []
+    for row in rows:
+        block.append(row)
+        if len(block) == block_size:
+            file.write(encode_block(block, codec, state))
+            block = []
+    if block:
+        file.write(encode_block(block, codec, state))
@@ -1,62 +1,210 @@
 """Module for play recorded events."""
 import time
+from collections.abc import Sized
 
 from pynput.keyboard import Controller as KeyboardController
-from pynput.keyboard import Key
+from pynput.keyboard import Key, KeyCode
 from pynput.mouse import Button
 from pynput.mouse import Controller as MouseController
 
+from tools.events import iter_rows
+from tools.plan import compile_plan, iter_plan
+from tools.plan_cache import PlanCache, dump_plan, load_plan
+from tools.profiling import wrap_handlers
+from tools.repeat import expand_repeats
+from tools.resample import resample_moves
+from tools.scheduler import SPIN_NS, DeadlineScheduler
+from tools.timing import TIMING_CAPACITY, TimingRecorder, TimingReport
+
+SYNC_EVERY = 256
+
 
 class PlayEvents:
     """Class to play recorded events.
 
     Methods:
+        compile(): Compile events into playback plan.
+        compile_cached(cache, filename): Load plan from the cache or compile it.
         play(): Called to a method that responds to a specific event.
+        report(): Return timing accuracy of the last playback.
         mouse_move(coordinates): Move the mouse to the given coordinates.
+        move_cursor(coordinates): Move the mouse without reading its position.
+        sync_cursor(): Move the real cursor back to the virtual one.
         mouse_click(button): Click the passed button on the mouse.
         mouse_scroll(scroll_vector): Move mouse scroll to the passed vector.
         keyboard_key_press(key): Imitates press passed key on keyboard.
         keyboard_key_release(key): Imitates release passed key on keyboard.
 
     """
-    def __init__(self, events: list):
+    def __init__(
+        self,
+        events,
+        spin_ns: int = SPIN_NS,
+        speed: float = 1.0,
+        max_gap_ns: int = None,
+        move_rate_hz: float = None,
+        interpolation: str = 'linear',
+        timing: bool = False,
+        hooks: tuple = (),
+        repeat_keys: bool = False,
+        virtual_cursor: bool = False,
+        sync_every: int = SYNC_EVERY,
+    ):
         """PlayEvents class constructor.
 
         Args:
-            events (list): with dict saved events.
+            events (iterable): with dict saved events or (opcode, time_ns, a, b)
+                rows, e.g. list, ColumnarRecording or open Database. Events
+                are pulled one by one while playing.
+            spin_ns (int): the last part of waiting for event in ns done by
+                busy loop instead of sleep.
+            speed (float): playback speed factor from 0.25 to 100.
+            max_gap_ns (int): max idle time between events in ns, None to
+                keep recorded gaps.
+            move_rate_hz (float): rate of played mouse moves, None to play
+                recorded moves.
+            interpolation (str): 'linear' or 'spline' interpolation of
+                resampled mouse moves.
+            timing (bool): keep intended and actual dispatch time of every
+                event, see report().
+            hooks (tuple): profiling hooks wrapping event handlers, e.g.
+                StatsHook, LogHook or ProfileHook, handlers are not wrapped
+                without them.
+            repeat_keys (bool): regenerate auto-repeated presses of keys
+                collapsed while recording.
+            virtual_cursor (bool): keep cursor position in memory and set it
+                absolutely, real position is read only to re-sync.
+            sync_every (int): number of mouse moves after which the virtual
+                cursor is checked against the real one, it is checked before
+                every click too.
 
         """
+        if sync_every < 1:
+            raise ValueError('Sync every must be at least 1 mouse move.')
         self.events = events
+        self.plan = None
+        self.move_rate_hz = move_rate_hz
+        self.interpolation = interpolation
+        self.repeat_keys = repeat_keys
+        self.virtual_cursor = virtual_cursor
+        self.sync_every = sync_every
+        self.cursor = None
+        self.moves_to_sync = sync_every
         self.mouse_controller = MouseController()
         self.keyboard_controller = KeyboardController()
-        self.previous_time = 0
+        self.scheduler = DeadlineScheduler(spin_ns, speed, max_gap_ns)
+        self.timing = None
+        if timing:
+            self.timing = TimingRecorder(
+                len(events) if isinstance(events, Sized) else TIMING_CAPACITY
+            )
         self.options = {
-            'wait': self.time_to_wait,
-            'mouse_move': self.mouse_move,
+            'mouse_move': self.move_cursor if virtual_cursor else self.mouse_move,
             'mouse_click': self.mouse_click,
             'mouse_scroll': self.mouse_scroll,
             'keyboard_key_press': self.keyboard_key_press,
             'keyboard_key_release': self.keyboard_key_release,
         }
+        if hooks:
+            self.options = wrap_handlers(self.options, hooks)
+
+    def compile(self) -> list:
+        """Compile events into playback plan.
+
+        Buttons and keys are resolved once, so play() only calls handlers.
+        Without compile() the plan is built lazily while playing.
+
+        Returns (list): with (time_ns, handler, args) steps.
+
+        """
+        self.plan = compile_plan(self._events(), self.options)
+        return self.plan
+
+    def compile_cached(self, cache: PlanCache, filename: str) -> list:
+        """Load plan from the cache or compile it and keep it in the cache.
 
-    def time_to_wait(self, time_since_start: float):
-        """Calculate wait time between events.
+        Events are not read when the plan of the recording is cached.
 
         Args:
-            time_since_start (float): time since start record.
+            cache (PlanCache): cache of compiled plans.
+            filename (str): file with played events.
+
+        Returns (list): with (time_ns, handler, args) steps.
 
         """
-        time_to_wait = time_since_start - self.previous_time
-        self.previous_time = time_since_start
-        return time_to_wait + 0.1
+        key = cache.key(
+            filename,
+            move_rate_hz=self.move_rate_hz,
+            interpolation=self.interpolation,
+            repeat_keys=self.repeat_keys,
+        )
+        steps = cache.load(key)
+        if steps is not None:
+            self.plan = load_plan(steps, self.options)
+        else:
+            cache.store(key, dump_plan(self.compile(), self.options))
+        return self.plan
 
     def play(self):
         """Called to a method that responds to a specific event."""
-        previous_time = 0
-        for event in self.events:
-            for event_name, options in event.items():
-                time.sleep(self.time_to_wait(options[1]['time']))
-                self.options[event_name](**options[0])
+        plan = self.plan if self.plan is not None else iter_plan(self._events(), self.options)
+        self.scheduler.start()
+        if self.timing is not None:
+            self._play_timed(plan)
+            return
+        wait = self.scheduler.wait
+        for time_ns, handler, args in plan:
+            wait(time_ns)
+            handler(*args)
+
+    def _play_timed(self, plan):
+        """Play plan and keep intended and actual time of every dispatch."""
+        wait_until = self.scheduler.wait_until
+        for deadline_ns in self._dispatch(plan):
+            wait_until(deadline_ns)
+
+    def _dispatch(self, plan):
+        """Yield deadline of every step, call its handler when resumed.
+
+        The caller waits until the deadline before it asks for the next one,
+        so the same loop is used by blocking and asyncio playback. Intended
+        and actual time of every dispatch are kept if timing is set.
+
+        Args:
+            plan (iterable): with (time_ns, handler, args) steps.
+
+        Yields (int): deadline of the next step in perf_counter_ns time.
+
+        """
+        deadline = self.scheduler.deadline
+        record = self.timing.record if self.timing is not None else None
+        now = time.perf_counter_ns
+        if self.timing is not None:
+            self.timing.start()
+        for time_ns, handler, args in plan:
+            deadline_ns = deadline(time_ns)
+            yield deadline_ns
+            if record is not None:
+                record(deadline_ns, now())
+            handler(*args)
+
+    def report(self) -> TimingReport:
+        """Return timing accuracy of the last playback.
+
+        Returns (TimingReport): with lateness percentiles, drift and
+            histogram, None if timing is not kept.
+
+        """
+        return self.timing.report() if self.timing is not None else None
+
+    def _events(self):
+        """Return events to play, with resampled moves and key repeats if it is set."""
+        events = self.events
+        if self.repeat_keys:
+            events = expand_repeats(iter_rows(events))
+        if self.move_rate_hz is not None:
+            events = resample_moves(iter_rows(events), self.move_rate_hz, self.interpolation)
+        return events
 
     def mouse_move(self, coordinate_x: int, coordinate_y: int):
         """Move the mouse to the given coordinates.
@@ -72,18 +220,40 @@ class PlayEvents:
 
         self.mouse_controller.move(to_move_x, to_move_y)
 
-    def mouse_click(self, button: str, pressed: bool):
+    def move_cursor(self, coordinate_x: int, coordinate_y: int):
+        """Move the mouse to the given coordinates without reading its position.
+
+        Args:
+            coordinate_x (int): horizontal coordinate to move the mouse.
+            coordinate_y (int): vertical coordinate to move the mouse.
+
+        """
+        self.cursor = coordinate_x, coordinate_y
+        self.mouse_controller.position = self.cursor
+        self.moves_to_sync -= 1
+        if not self.moves_to_sync:
+            self.sync_cursor()
+
+    def sync_cursor(self):
+        """Move the real cursor back to the virtual one if it was moved."""
+        self.moves_to_sync = self.sync_every
+        if self.cursor is not None and self.mouse_controller.position != self.cursor:
+            self.mouse_controller.position = self.cursor
+
+    def mouse_click(self, button: Button, pressed: bool):
         """Click the passed button on the mouse.
 
         Args:
-            button (str): with name button to click.
+            button (Button): button to click.
             pressed (bool): button is pressed.
 
         """
+        if self.virtual_cursor:
+            self.sync_cursor()
         if pressed:
-            self.mouse_controller.press(eval(button))
+            self.mouse_controller.press(button)
         else:
-            self.mouse_controller.release(eval(button))
+            self.mouse_controller.release(button)
 
     def mouse_scroll(self, vector_dx: int, vector_dy: int):
         """Move mouse scroll to the passed vector.
@@ -96,20 +266,20 @@ class PlayEvents:
 
         self.mouse_controller.scroll(vector_dx, vector_dy)
 
-    def keyboard_key_press(self, key: str):
+    def keyboard_key_press(self, key: Key | KeyCode):
         """Imitates press passed key on keyboard.
 
         Args:
-            key (str): key to press.
+            key (Key | KeyCode): key to press.
 
         """
-        self.keyboard_controller.press(eval(key))
+        self.keyboard_controller.press(key)
 
-    def keyboard_key_release(self, key: str):
+    def keyboard_key_release(self, key: Key | KeyCode):
         """Imitates release passed key on keyboard.
 
         Args:
-            key (str): key to release.
+            key (Key | KeyCode): key to release.
 
         """
-        self.keyboard_controller.release(eval(key))
+        self.keyboard_controller.release(key)
@@ -1,29 +1,50 @@
-"""Module to save and load data from json file."""
+"""Module to save and load data from json or columnar file."""
 import json
+import mmap
+
+from tools import columnar
+from tools.events import iter_events, iter_rows
 
 
 class Database:
-    """Class to save and load data from json file.
+    """Class to save and load data from json or columnar file.
+
+    Iterating over the open database yields events one by one.
 
     Methods:
-         save(data): Save passed data to json file.
-         load(): Load data from json file.
+         save(data): Save passed data to file.
+         load(): Load data from file, format is detected by file signature.
+         stream(): Yield events reading file in chunks.
     """
-    def __init__(self, filename: str, mode: str = 'r'):
+    def __init__(
+        self,
+        filename: str,
+        mode: str = 'r',
+        storage: str = 'json',
+        compression: str = None,
+    ):
         """Database class constructor.
 
         Args:
             filename (str): file name to save recorded events.
             mode (str): file open mode.
+            storage (str): format used to save events, 'json' or 'columnar'.
+            compression (str): None, 'zlib' or 'lzma' compression of delta
+                encoded blocks in columnar file.
 
         """
         self.file = None
         self.filename = filename
         self.mode = mode
+        self.storage = storage
+        self.compression = compression
 
     def __enter__(self):
         """Implemented to use as context manager."""
-        self.file = open(self.filename, self.mode, encoding='utf-8')
+        if self.storage == 'columnar' and 'r' not in self.mode:
+            self.file = open(self.filename, self.mode + 'b')
+        else:
+            self.file = open(self.filename, self.mode, encoding='utf-8')
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -31,18 +52,111 @@ class Database:
         self.file.close()
 
     def save(self, data: list):
-        """Save passed data to json file.
+        """Save passed data to file.
+
+        Rows are saved as dict events in json file and events as rows in
+        columnar file, so both formats can be loaded back.
 
         Args:
-            data (list): with data to save.
+            data (list): with dict events or (opcode, time_ns, a, b) rows.
 
         """
-        json.dump(data, self.file)
+        if self.storage == 'columnar':
+            columnar.write(
+                self.file,
+                iter_rows(data),
+                compression=self.compression,
+            )
+        else:
+            json.dump(list(iter_events(data)), self.file)
 
-    def load(self):
-        """Load data from json file.
+    def load(self, lazy: bool = False):
+        """Load data from file.
+
+        Args:
+            lazy (bool): map columnar file into memory instead of reading it,
+                events are read only when they are used. Json file is always
+                loaded at once.
 
-        Returns: data from json file.
+        Returns: list with events from json file or ColumnarRecording.
 
         """
+        if columnar.is_columnar(self._signature()):
+            if lazy:
+                buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = self.file.buffer.read()
+            return columnar.ColumnarRecording(buffer)
         return json.load(self.file)
+
+    def __iter__(self):
+        """Implemented to pass the open database to PlayEvents."""
+        return self.stream()
+
+    def stream(self, chunk_size: int = 65536):
+        """Yield events reading file in chunks.
+
+        Args:
+            chunk_size (int): number of characters read at once from json file.
+
+        """
+        if columnar.is_columnar(self._signature()):
+            yield from columnar.read_stream(self.file.buffer)
+        else:
+            yield from _iter_json_array(self.file, chunk_size)
+
+    def _signature(self) -> bytes:
+        """Return first bytes of the file without moving file position."""
+        buffer = getattr(self.file, 'buffer', None)
+        if buffer is None or not hasattr(buffer, 'peek'):
+            return b''
+        return buffer.peek(len(columnar.MAGIC))
+
+
+def _iter_json_array(file, chunk_size: int):
+    """Yield items of json array without loading the whole file.
+
+    Args:
+        file: text file object with json array.
+        chunk_size (int): number of characters read at once.
+
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    started = False
+    eof = False
+    while True:
+        separators = ' \t\r\n,' if started else ' \t\r\n'
+        while position < len(buffer) and buffer[position] in separators:
+            position += 1
+        if position == len(buffer):
+            if eof:
+                raise json.JSONDecodeError('Unterminated json array', buffer, position)
+            buffer = file.read(chunk_size)
+            position = 0
+            eof = not buffer
+            continue
+        if not started:
+            if buffer[position] != '[':
+                raise json.JSONDecodeError('Expecting json array', buffer, position)
+            started = True
+            position += 1
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        position = end
+        yield item
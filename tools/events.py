@@ -3,7 +3,128 @@ from enum import Enum
 
 
 class Event(Enum):
-    """Enum events for mouse listener."""
+    """Enum events, the values are used as opcodes in compact recordings."""
     MOVE = 1
     CLICK = 2
     SCROLL = 3
+    KEY_PRESS = 4
+    KEY_RELEASE = 5
+
+
+EVENT_NAMES = {
+    Event.MOVE.value: 'mouse_move',
+    Event.CLICK.value: 'mouse_click',
+    Event.SCROLL.value: 'mouse_scroll',
+    Event.KEY_PRESS.value: 'keyboard_key_press',
+    Event.KEY_RELEASE.value: 'keyboard_key_release',
+}
+
+EVENT_OPCODES = {name: opcode for opcode, name in EVENT_NAMES.items()}
+
+ARG_NAMES = {
+    Event.MOVE.value: ('coordinate_x', 'coordinate_y'),
+    Event.CLICK.value: ('button', 'pressed'),
+    Event.SCROLL.value: ('vector_dx', 'vector_dy'),
+    Event.KEY_PRESS.value: ('key',),
+    Event.KEY_RELEASE.value: ('key',),
+}
+
+REPEAT_ARGS = ('repeat_delay_ms', 'repeat_interval_ms')
+
+STRING_OPCODES = frozenset((
+    Event.CLICK.value,
+    Event.KEY_PRESS.value,
+    Event.KEY_RELEASE.value,
+))
+
+
+def event_time_ns(event) -> int:
+    """Return time of recorded event.
+
+    Args:
+        event: (opcode, time_ns, a, b) row or dict with event name, arguments
+            and time in ns or in seconds in older recordings.
+
+    Returns (int): time since start record in ns.
+
+    """
+    if isinstance(event, tuple):
+        return event[1]
+    for _, options in event.items():
+        if 'time_ns' in options[1]:
+            return options[1]['time_ns']
+        return round(options[1]['time'] * 1e9)
+
+
+def to_row(event: dict) -> tuple:
+    """Convert recorded event to a flat row.
+
+    Args:
+        event (dict): with event name, arguments and time.
+
+    Returns (tuple): (opcode, time_ns, a, b) row.
+
+    """
+    for event_name, options in event.items():
+        opcode = EVENT_OPCODES[event_name]
+        values = [options[0][name] for name in ARG_NAMES[opcode]]
+        if len(values) == 1:
+            values.append(0)
+        a, b = values
+        if opcode == Event.CLICK.value:
+            b = int(b)
+        elif opcode == Event.KEY_RELEASE.value and REPEAT_ARGS[0] in options[0]:
+            delay_ms, interval_ms = (options[0][name] for name in REPEAT_ARGS)
+            b = delay_ms << 16 | interval_ms
+        return opcode, event_time_ns(event), a, b
+
+
+def to_event(row: tuple) -> dict:
+    """Convert flat row to recorded event.
+
+    Args:
+        row (tuple): (opcode, time_ns, a, b) row.
+
+    Returns (dict): with event name, arguments and time.
+
+    """
+    opcode, time_ns, a, b = row
+    if opcode == Event.CLICK.value:
+        b = bool(b)
+    names = ARG_NAMES[opcode]
+    args = dict(zip(names, (a, b)))
+    if opcode == Event.KEY_RELEASE.value and b:
+        args.update(zip(REPEAT_ARGS, (b >> 16, b & 0xffff)))
+
+    return {
+        EVENT_NAMES[opcode]: (
+            args,
+            {'time_ns': time_ns},
+        ),
+    }
+
+
+def iter_rows(events):
+    """Yield events as flat rows.
+
+    Args:
+        events (iterable): with dict events or (opcode, time_ns, a, b) rows.
+
+    Yields (tuple): (opcode, time_ns, a, b) row.
+
+    """
+    for event in events:
+        yield event if isinstance(event, tuple) else to_row(event)
+
+
+def iter_events(events):
+    """Yield rows as recorded events.
+
+    Args:
+        events (iterable): with dict events or (opcode, time_ns, a, b) rows.
+
+    Yields (dict): with event name, arguments and time.
+
+    """
+    for event in events:
+        yield to_event(event) if isinstance(event, tuple) else event
@@ -1,9 +1,12 @@
 """Module to record keyboard events."""
 from enum import Enum
-from datetime import datetime
 from pynput.keyboard import Listener
 
-from tools.mouse_listener import RecordMouseEvents
+from tools.clock import RecordingClock
+from tools.events import Event
+from tools.repeat import pack_repeat
+from tools.ring_buffer import BUFFER_SIZE, BufferConsumer, RingBuffer
+from tools.stop import StopSignal
 
 
 class RecordKeyboardEvents:
@@ -12,82 +15,189 @@ class RecordKeyboardEvents:
     Methods:
          time(): Calculate time from start recording to event.
          exit(): If together pressed "q" and "esc" button stop recording.
+         check_hotkeys(): Call callback of pressed hotkey.
          on_press(key): Is called when keyboard key is pressed.
+         collapse_repeat(name, time_ns): Count auto-repeated press of held key.
          on_release(key): Is called when keyboard key is released.
+         format(raw): Format raw event taken from the buffer.
          record(): Start record keyboard events.
 
     """
-    def __init__(self):
-        """Record class constructor."""
+    def __init__(
+        self,
+        sink=None,
+        clock: RecordingClock = None,
+        stop_signal: StopSignal = None,
+        buffer_size: int = BUFFER_SIZE,
+        hotkeys: dict = None,
+        collapse_repeats: bool = False,
+    ):
+        """Record class constructor.
+
+        Args:
+            sink (callable): called with every recorded event, by default
+                events are appended to the events list.
+            clock (RecordingClock): clock shared with other recorders.
+            stop_signal (StopSignal): signal shared with other recorders to
+                stop recording.
+            buffer_size (int): max number of events waiting for formatting.
+            hotkeys (dict): with callbacks by tuple of key names pressed
+                together, e.g. {('Key.esc', "'d'"): callback}.
+            collapse_repeats (bool): skip auto-repeated presses of held key,
+                their timing is kept in the key release.
+
+        """
         self.events = []
+        self.sink = sink or self.events.append
         self.listener = None
         self.pressed = {}
-        self.start_time = datetime.now()
-
-    def time(self) -> float:
+        self.clock = clock or RecordingClock()
+        self.stop_signal = stop_signal or StopSignal()
+        self.buffer = RingBuffer(buffer_size)
+        self.hotkeys = hotkeys or {}
+        self.collapse_repeats = collapse_repeats
+        self.repeats = {}
+
+    def time(self) -> int:
         """Calculate time from start record to event.
 
-        Returns (float): Calculate time from start recording to event.
+        Returns (int): Calculate time from start recording to event in ns.
 
         """
-        return (datetime.now() - self.start_time).total_seconds()
+        return self.clock.now()
 
     def exit(self):
         """If together pressed "q" and "esc" button stop recording."""
         if "'q'" in self.pressed and 'Key.esc' in self.pressed:
-            self.listener.stop()
+            self.stop_signal.set()
+
+    def check_hotkeys(self):
+        """Call callback of pressed hotkey."""
+        for keys, callback in self.hotkeys.items():
+            if all(key in self.pressed for key in keys):
+                callback()
 
-    def on_press(self, key: Enum) -> dict:
+    def on_press(self, key: Enum, time_ns: int = None) -> dict:
         """Is called when keyboard key is pressed.
 
         Args:
             key (Enum): pressed key.
+            time_ns (int): time of event, now if it is not passed.
 
-        Returns (dict): with event type, key, status and time.
+        Returns (dict): with event type, key, status and time, None for
+            collapsed repeat.
 
         """
-        self.pressed[str(key)] = True
+        name = str(key)
+        time_ns = self.time() if time_ns is None else time_ns
+        is_repeated = name in self.pressed
+        self.pressed[name] = True
         self.exit()
+        if not is_repeated:
+            self.check_hotkeys()
+        if self.collapse_repeats:
+            if is_repeated:
+                self.collapse_repeat(name, time_ns)
+                return None
+            self.repeats[name] = [time_ns, None, None, 0]
 
         return {
             'keyboard_key_press': (
                 {
-                    'key': str(key),
+                    'key': name,
                 },
-                {'time': self.time()},
+                {'time_ns': time_ns},
             ),
         }
 
-    def on_release(self, key: Enum) -> dict:
+    def collapse_repeat(self, name: str, time_ns: int):
+        """Count auto-repeated press of held key instead of recording it.
+
+        Args:
+            name (str): name of the held key.
+            time_ns (int): time of the repeated press.
+
+        """
+        repeat = self.repeats.setdefault(name, [time_ns, None, None, 0])
+        if repeat[1] is None:
+            repeat[1] = time_ns
+        repeat[2] = time_ns
+        repeat[3] += 1
+
+    def on_release(self, key: Enum, time_ns: int = None) -> dict:
         """Is called when keyboard key is released.
 
         Args:
             key (Enum): released key.
+            time_ns (int): time of event, now if it is not passed.
 
         Returns (dict): with event type, key, status and time.
 
         """
-        del self.pressed[str(key)]
+        name = str(key)
+        self.pressed.pop(name, None)
+        args = {'key': name}
+        repeat = self.repeats.pop(name, None)
+        if repeat is not None and repeat[3]:
+            press_ns, first_ns, last_ns, count = repeat
+            interval_ns = (last_ns - first_ns) // (count - 1) if count > 1 else 0
+            packed = pack_repeat(first_ns - press_ns, interval_ns)
+            args.update(repeat_delay_ms=packed >> 16, repeat_interval_ms=packed & 0xffff)
 
         return {
             'keyboard_key_release': (
-                {
-                    'key': str(key),
-                },
-                {'time': self.time()},
+                args,
+                {'time_ns': self.time() if time_ns is None else time_ns},
             ),
         }
 
+    def format(self, raw: tuple) -> dict:
+        """Format raw event taken from the buffer.
+
+        Args:
+            raw (tuple): (opcode, time_ns, key, 0) with pynput key.
+
+        Returns (dict): with event type, key and time.
+
+        """
+        opcode, time_ns, key, _ = raw
+        if opcode == Event.KEY_PRESS.value:
+            return self.on_press(key, time_ns)
+        return self.on_release(key, time_ns)
+
     def record(self) -> list:
         """Start record keyboard events.
 
+        Listener callbacks only put raw tuples into the ring buffer, events
+        are formatted and passed to the sink by the consumer thread. Sink
+        with progress method is told the time before which no more events
+        will come, e.g. RecordingWriter source.
+
         Returns (list): with recorded events.
 
         """
+        def handle(raw):
+            event = self.format(raw)
+            if event is not None:
+                self.sink(event)
+
+        push = self.buffer.push
+        now = self.clock.now
+        consumer = BufferConsumer(
+            self.buffer,
+            handle,
+            progress=getattr(self.sink, 'progress', None),
+            now=now,
+        )
+        press, release = Event.KEY_PRESS.value, Event.KEY_RELEASE.value
+
+        consumer.start()
         with Listener(
-            on_press=lambda key: self.events.append(self.on_press(key)),
-            on_release=lambda key: self.events.append(self.on_release(key)),
+            on_press=lambda key, *_: push((press, now(), key, 0)),
+            on_release=lambda key, *_: push((release, now(), key, 0)),
         ) as self.listener:
+            self.stop_signal.subscribe(self.listener.stop)
             self.listener.join()
+        consumer.stop()
 
         return self.events
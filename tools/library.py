@@ -0,0 +1,353 @@
+"""Module to keep many recordings in one SQLite library.
+
+Metadata of every macro (name, tags, duration and number of events) is kept
+in its own table, events are packed in columnar blocks kept as BLOBs in
+chunks table with input state before the first event of the chunk.
+Listing and searching macros never reads chunks and events of a macro are
+fetched chunk by chunk while it is played.
+"""
+import bisect
+import sqlite3
+import time
+
+from tools import columnar
+from tools.events import iter_rows
+from tools.state import InputState
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS macros (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    duration_ns INTEGER NOT NULL,
+    event_count INTEGER NOT NULL,
+    codec INTEGER NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    macro_id INTEGER NOT NULL REFERENCES macros (id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (tag, macro_id)
+);
+CREATE INDEX IF NOT EXISTS tags_macro ON tags (macro_id);
+CREATE TABLE IF NOT EXISTS chunks (
+    macro_id INTEGER NOT NULL REFERENCES macros (id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    first_event INTEGER NOT NULL,
+    event_count INTEGER NOT NULL,
+    first_ns INTEGER NOT NULL,
+    last_ns INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    state BLOB,
+    PRIMARY KEY (macro_id, number)
+);
+CREATE INDEX IF NOT EXISTS chunks_time ON chunks (macro_id, first_ns);
+'''
+MACRO_COLUMNS = 'macros.id, name, duration_ns, event_count, codec, created'
+
+
+class MacroLibrary:
+    """Class with recordings kept in SQLite database.
+
+    Methods:
+        save(name, events, tags, compression): Save recording in the library.
+        open(name): Return recording which fetches events lazily.
+        info(name): Return metadata of the macro.
+        find(tag, name): Return metadata of matching macros.
+        tag(name, *tags): Add tags to the macro.
+        delete(name): Remove macro from the library.
+        close(): Close the database connection.
+    """
+    def __init__(self, path: str, block_size: int = columnar.BLOCK_SIZE):
+        """MacroLibrary class constructor.
+
+        Args:
+            path (str): SQLite database file, ':memory:' for temporary library.
+            block_size (int): max number of events in one chunk.
+
+        """
+        self.path = path
+        self.block_size = block_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+        columns = [row[1] for row in self.connection.execute('PRAGMA table_info(chunks)')]
+        if 'state' not in columns:
+            self.connection.execute('ALTER TABLE chunks ADD COLUMN state BLOB')
+
+    def __enter__(self):
+        """Implemented to use as context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Implemented to use as context manager."""
+        self.close()
+
+    def save(self, name: str, events, tags=(), compression: str = 'zlib') -> dict:
+        """Save recording in the library, macro with the same name is replaced.
+
+        Events are packed into chunks while they are read, so the whole
+        recording is not kept in memory.
+
+        Args:
+            name (str): unique name of the macro.
+            events (iterable): with dict events or (opcode, time_ns, a, b)
+                rows sorted by time, e.g. open Database.
+            tags (iterable): with tags of the macro.
+            compression (str): None, 'zlib' or 'lzma' compression of chunks.
+
+        Returns (dict): with metadata of saved macro.
+
+        """
+        codec = columnar.CODECS[compression]
+        with self.connection:
+            self.connection.execute('DELETE FROM macros WHERE name = ?', (name,))
+            macro_id = self.connection.execute(
+                'INSERT INTO macros (name, duration_ns, event_count, codec, created) '
+                'VALUES (?, 0, 0, ?, ?)',
+                (name, codec, time.time()),
+            ).lastrowid
+            count, last_ns, number = 0, 0, 0
+            state = InputState()
+            block = []
+            for row in iter_rows(events):
+                block.append(row)
+                if len(block) == self.block_size:
+                    self._insert_chunk(macro_id, number, count, block, codec, state)
+                    count, last_ns, number = count + len(block), row[1], number + 1
+                    block = []
+            if block:
+                self._insert_chunk(macro_id, number, count, block, codec, state)
+                count, last_ns = count + len(block), block[-1][1]
+            self.connection.execute(
+                'UPDATE macros SET duration_ns = ?, event_count = ? WHERE id = ?',
+                (last_ns, count, macro_id),
+            )
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO tags (macro_id, tag) VALUES (?, ?)',
+                [(macro_id, tag) for tag in tags],
+            )
+        return self.info(name)
+
+    def _insert_chunk(
+        self,
+        macro_id: int,
+        number: int,
+        first_event: int,
+        block: list,
+        codec: int,
+        state: InputState,
+    ):
+        """Pack rows into columnar block and insert it as a chunk.
+
+        Input state before the block is saved with the chunk and updated
+        with its rows.
+
+        """
+        data = columnar.encode_payload(block, codec)
+        checkpoint = columnar.pack_state(state)
+        for row in block:
+            state.apply(row)
+        self.connection.execute(
+            'INSERT INTO chunks '
+            '(macro_id, number, first_event, event_count, first_ns, last_ns, data, state) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                macro_id, number, first_event, len(block), block[0][1], block[-1][1],
+                data, checkpoint,
+            ),
+        )
+
+    def open(self, name: str) -> 'LibraryRecording':
+        """Return recording which fetches events lazily.
+
+        Args:
+            name (str): name of the macro.
+
+        Returns (LibraryRecording): recording which can be passed to
+            PlayEvents or TimeIndex.
+
+        """
+        info = self.info(name)
+        return LibraryRecording(self.connection, info['id'], info['event_count'], info['codec'])
+
+    def info(self, name: str) -> dict:
+        """Return metadata of the macro.
+
+        Args:
+            name (str): name of the macro.
+
+        Returns (dict): with id, name, duration_ns, event_count, codec,
+            created and tags.
+
+        """
+        macros = self._select('WHERE name = ?', (name,))
+        if not macros:
+            raise ValueError(f'Macro {name!r} is not in the library.')
+        return macros[0]
+
+    def find(self, tag: str = None, name: str = None) -> list:
+        """Return metadata of matching macros, chunks are not read.
+
+        Args:
+            tag (str): tag which macros have, None for any.
+            name (str): SQL LIKE pattern of the name, None for any.
+
+        Returns (list): with metadata dicts sorted by name.
+
+        """
+        conditions, parameters = [], []
+        if tag is not None:
+            conditions.append('id IN (SELECT macro_id FROM tags WHERE tag = ?)')
+            parameters.append(tag)
+        if name is not None:
+            conditions.append('name LIKE ?')
+            parameters.append(name)
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        return self._select(where, parameters)
+
+    def _select(self, where: str, parameters) -> list:
+        """Return metadata of macros with tags."""
+        rows = self.connection.execute(
+            f'SELECT {MACRO_COLUMNS}, '
+            f'(SELECT group_concat(tag, char(0)) FROM tags WHERE macro_id = macros.id) '
+            f'FROM macros {where} ORDER BY name',
+            parameters,
+        ).fetchall()
+        return [
+            {
+                'id': macro_id,
+                'name': name,
+                'duration_ns': duration_ns,
+                'event_count': event_count,
+                'codec': codec,
+                'created': created,
+                'tags': sorted(tags.split('\0')) if tags else [],
+            }
+            for macro_id, name, duration_ns, event_count, codec, created, tags in rows
+        ]
+
+    def tag(self, name: str, *tags: str):
+        """Add tags to the macro.
+
+        Args:
+            name (str): name of the macro.
+            *tags (str): added tags.
+
+        """
+        macro_id = self.info(name)['id']
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR IGNORE INTO tags (macro_id, tag) VALUES (?, ?)',
+                [(macro_id, tag) for tag in tags],
+            )
+
+    def delete(self, name: str):
+        """Remove macro from the library.
+
+        Args:
+            name (str): name of the macro.
+
+        """
+        with self.connection:
+            self.connection.execute('DELETE FROM macros WHERE name = ?', (name,))
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+
+class LibraryRecording:
+    """Class with macro from the library, chunks are fetched when needed.
+
+    Iterating yields (opcode, time_ns, a, b) rows keeping one chunk in
+    memory. Indexing fetches the chunk with the event, the last one is
+    cached, so it can be searched by TimeIndex.
+
+    Methods:
+        block_index(): Return number and time of the first event of every chunk.
+        block_state(number): Return input state before the chunk.
+    """
+    def __init__(self, connection: sqlite3.Connection, macro_id: int, count: int, codec: int):
+        """LibraryRecording class constructor.
+
+        Args:
+            connection (sqlite3.Connection): connection to the library.
+            macro_id (int): id of the macro.
+            count (int): number of events.
+            codec (int): codec of chunks.
+
+        """
+        self.connection = connection
+        self.macro_id = macro_id
+        self.count = count
+        self.codec = codec
+        self._index = None
+        self._starts = None
+        self._block = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        number = 0
+        while (block := self._fetch(number)) is not None:
+            yield from block
+            number += 1
+
+    def __getitem__(self, index: int) -> tuple:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('Recording index out of range.')
+        if self._starts is None:
+            self._starts = [start for start, _ in self.block_index()]
+        number = bisect.bisect_right(self._starts, index) - 1
+        if self._block is None or self._block[0] != number:
+            self._block = number, self._fetch(number)
+        return self._block[1][index - self._starts[number]]
+
+    def block_index(self) -> list:
+        """Return number and time of the first event of every chunk.
+
+        Only the chunks index is read, chunk data is not fetched.
+
+        Returns (list): with (event number, time_ns) pairs sorted by time.
+
+        """
+        if self._index is None:
+            self._index = self.connection.execute(
+                'SELECT first_event, first_ns FROM chunks WHERE macro_id = ? ORDER BY number',
+                (self.macro_id,),
+            ).fetchall()
+        return self._index
+
+    def block_state(self, number: int) -> InputState:
+        """Return input state before the first event of the chunk.
+
+        Only the state saved with the chunk is fetched, not its events.
+
+        Args:
+            number (int): chunk number.
+
+        Returns (InputState): with held keys and buttons and mouse position,
+            None if the chunk was saved without state.
+
+        """
+        row = self.connection.execute(
+            'SELECT state FROM chunks WHERE macro_id = ? AND number = ?',
+            (self.macro_id, number),
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return columnar.unpack_state(row[0])
+
+    def _fetch(self, number: int) -> columnar.ColumnarBlock:
+        """Return chunk with given number, None if there is no such chunk."""
+        chunk = self.connection.execute(
+            'SELECT event_count, data FROM chunks WHERE macro_id = ? AND number = ?',
+            (self.macro_id, number),
+        ).fetchone()
+        if chunk is None:
+            return None
+        count, data = chunk
+        return columnar.ColumnarBlock.from_payload(memoryview(data), count, self.codec)
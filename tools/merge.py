@@ -0,0 +1,20 @@
+"""Module to merge time ordered streams of events."""
+import heapq
+
+from tools.events import event_time_ns
+
+
+def merge_events(*sources):
+    """Merge time ordered streams of events into one stream.
+
+    Every source is already sorted by time, so streams are merged lazily
+    in O(n log k) for k sources instead of sorting all events again.
+
+    Args:
+        *sources (iterable): with dict events or (opcode, time_ns, a, b) rows
+            sorted by time, e.g. events of every recorder.
+
+    Returns (iterator): with events of all sources sorted by time.
+
+    """
+    return heapq.merge(*sources, key=event_time_ns)
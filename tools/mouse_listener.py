@@ -1,8 +1,12 @@
 """Module to record mouse events."""
-from datetime import datetime
-
 from pynput.mouse import Listener
 
+from tools.clock import RecordingClock
+from tools.events import Event
+from tools.ring_buffer import BUFFER_SIZE, BufferConsumer, RingBuffer
+from tools.stop import StopSignal
+from tools.simplify import PathSimplifier
+
 
 class RecordMouseEvents:
     """Class to record mouse events.
@@ -12,29 +16,54 @@ class RecordMouseEvents:
         on_move(*args): Is called when mouse is moved.
         on_click(*args): Is called when mouse button is clicked.
         on_scroll(args): Is called when mouse scroll is moved.
+        format(raw): Format raw event taken from the buffer.
         record(): Start record mouse events.
 
     """
-    def __init__(self):
-        """Record class constructor."""
+    def __init__(
+        self,
+        sink=None,
+        clock: RecordingClock = None,
+        tolerance: float = 0,
+        stop_signal: StopSignal = None,
+        buffer_size: int = BUFFER_SIZE,
+    ):
+        """Record class constructor.
+
+        Args:
+            sink (callable): called with every recorded event, by default
+                events are appended to the events list.
+            clock (RecordingClock): clock shared with other recorders.
+            tolerance (float): max distance in pixels of removed mouse move
+                from the simplified path, 0 to keep every move.
+            stop_signal (StopSignal): signal shared with other recorders to
+                stop recording.
+            buffer_size (int): max number of events waiting for formatting.
+
+        """
         self.button_is_pressed = False
         self.events = []
+        self.sink = sink or self.events.append
         self.listener = None
-        self.start_time = datetime.now()
+        self.clock = clock or RecordingClock()
+        self.stop_signal = stop_signal or StopSignal()
+        self.tolerance = tolerance
+        self.buffer = RingBuffer(buffer_size)
 
-    def time(self) -> float:
+    def time(self) -> int:
         """Calculate time from start record to event.
 
-        Returns (float): Calculate time from start record to event.
+        Returns (int): Calculate time from start record to event in ns.
 
         """
-        return (datetime.now() - self.start_time).total_seconds()
+        return self.clock.now()
 
-    def on_move(self, *args) -> dict:
+    def on_move(self, *args, time_ns: int = None) -> dict:
         """Is called when mouse is moved.
 
         Args:
             *args (): with mouse coordinates.
+            time_ns (int): time of event, now if it is not passed.
 
         Returns (dict): with event type, coordinates and time.
 
@@ -47,15 +76,16 @@ class RecordMouseEvents:
                     'coordinate_x': x,
                     'coordinate_y': y,
                 },
-                {'time': self.time()},
+                {'time_ns': self.time() if time_ns is None else time_ns},
             ),
         }
 
-    def on_click(self, *args) -> dict:
+    def on_click(self, *args, time_ns: int = None) -> dict:
         """Is called when button mouse is clicked.
 
         Args:
             *args (): with name button and status button.
+            time_ns (int): time of event, now if it is not passed.
 
         Returns (dict): with event type, coordinates, button, status and time.
 
@@ -66,15 +96,16 @@ class RecordMouseEvents:
             'mouse_click': (
                 {'button': str(button),
                  'pressed': pressed},
-                {'time': self.time()},
+                {'time_ns': self.time() if time_ns is None else time_ns},
             ),
         }
 
-    def on_scroll(self, *args: int) -> dict:
+    def on_scroll(self, *args: int, time_ns: int = None) -> dict:
         """Is called when mouse scroll is moved.
 
         Args:
             *args (tuple): with mouse coordinates and scroll vector.
+            time_ns (int): time of event, now if it is not passed.
 
         Returns (dict): with event type, coordinates, scroll vector and time.
 
@@ -87,21 +118,61 @@ class RecordMouseEvents:
                     'vector_dx': dx,
                     'vector_dy': dy
                 },
-                {'time': self.time()},
+                {'time_ns': self.time() if time_ns is None else time_ns},
             ),
         }
 
+    def format(self, raw: tuple) -> dict:
+        """Format raw event taken from the buffer.
+
+        Args:
+            raw (tuple): (opcode, time_ns, a, b) with pynput objects.
+
+        Returns (dict): with event type, arguments and time.
+
+        """
+        opcode, time_ns, a, b = raw
+        if opcode == Event.MOVE.value:
+            return self.on_move(a, b, time_ns=time_ns)
+        if opcode == Event.CLICK.value:
+            return self.on_click(None, None, a, b, time_ns=time_ns)
+        return self.on_scroll(None, None, a, b, time_ns=time_ns)
+
     def record(self) -> list:
         """Start record mouse events.
 
+        Listener callbacks only put raw tuples into the ring buffer, events
+        are formatted and passed to the sink by the consumer thread. Sink
+        with progress method is told the time before which no more events
+        will come, e.g. RecordingWriter source.
+
         Returns (list): with recorded mouse events.
 
         """
+        sink = self.sink
+        if self.tolerance:
+            sink = PathSimplifier(self.sink, self.tolerance)
+        push = self.buffer.push
+        now = self.clock.now
+        consumer = BufferConsumer(
+            self.buffer,
+            lambda raw: sink(self.format(raw)),
+            progress=getattr(sink, 'progress', None),
+            now=now,
+        )
+        move, click, scroll = Event.MOVE.value, Event.CLICK.value, Event.SCROLL.value
+
+        consumer.start()
         with Listener(
-                on_move=lambda *args: self.events.append(self.on_move(*args)),
-                on_click=lambda *args: self.events.append(self.on_click(*args)),
-                on_scroll=lambda *args: self.events.append(self.on_scroll(*args)),
+                on_move=lambda x, y, *_: push((move, now(), x, y)),
+                on_click=lambda x, y, button, pressed, *_: push((click, now(), button, pressed)),
+                on_scroll=lambda x, y, dx, dy, *_: push((scroll, now(), dx, dy)),
         ) as self.listener:
+            self.stop_signal.subscribe(self.listener.stop)
             self.listener.join()
+        consumer.stop()
+
+        if self.tolerance:
+            sink.flush()
 
         return self.events
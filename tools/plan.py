@@ -0,0 +1,86 @@
+"""Module to compile recorded events into playback plan."""
+import ast
+from functools import lru_cache
+
+from pynput.keyboard import Key, KeyCode
+from pynput.mouse import Button
+
+from tools.events import EVENT_NAMES, Event, iter_rows
+
+
+@lru_cache(maxsize=None)
+def resolve_key(name: str):
+    """Return pynput key for the key name saved by the keyboard listener.
+
+    Args:
+        name (str): saved key name, e.g. "Key.esc", "'q'", "<65>" or "['~']".
+
+    Returns: Key or KeyCode object.
+
+    """
+    if name.startswith('Key.'):
+        return getattr(Key, name[len('Key.'):])
+    if name.startswith('<') and name.endswith('>'):
+        return KeyCode.from_vk(int(name[1:-1]))
+    if name.startswith('[') and name.endswith(']'):
+        return KeyCode.from_dead(ast.literal_eval(name[1:-1]))
+    if len(name) > 1 and name[0] == name[-1] and name[0] in '\'"':
+        return KeyCode.from_char(ast.literal_eval(name))
+    return KeyCode.from_char(name)
+
+
+@lru_cache(maxsize=None)
+def resolve_button(name: str) -> Button:
+    """Return pynput mouse button for the button name.
+
+    Args:
+        name (str): saved button name, e.g. "Button.left".
+
+    Returns (Button): mouse button.
+
+    """
+    return getattr(Button, name.rsplit('.', 1)[-1])
+
+
+def resolve_args(row: tuple) -> tuple:
+    """Return handler arguments with resolved buttons and keys.
+
+    Args:
+        row (tuple): (opcode, time_ns, a, b) row.
+
+    Returns (tuple): with positional arguments for the event handler.
+
+    """
+    opcode, _, a, b = row
+    if opcode == Event.CLICK.value:
+        return resolve_button(a), bool(b)
+    if opcode in (Event.KEY_PRESS.value, Event.KEY_RELEASE.value):
+        return (resolve_key(a),)
+    return a, b
+
+
+def iter_plan(events, options: dict):
+    """Yield playback plan steps for the events.
+
+    Args:
+        events (iterable): with dict events or (opcode, time_ns, a, b) rows.
+        options (dict): with handlers by event name.
+
+    Yields (tuple): (time_ns, handler, args) step.
+
+    """
+    for row in iter_rows(events):
+        yield row[1], options[EVENT_NAMES[row[0]]], resolve_args(row)
+
+
+def compile_plan(events, options: dict) -> list:
+    """Compile events into flat playback plan.
+
+    Args:
+        events (iterable): with dict events or (opcode, time_ns, a, b) rows.
+        options (dict): with handlers by event name.
+
+    Returns (list): with (time_ns, handler, args) steps.
+
+    """
+    return list(iter_plan(events, options))
@@ -0,0 +1,174 @@
+"""Module to keep compiled playback plans on disk.
+
+Plan is cached under the hash of recording content, plan format version
+and options which change the plan, so an edited recording never uses an
+old plan. Handlers are kept by event names and buttons and keys are
+pickled already resolved, so loading a cached plan skips parsing the
+recording and resolving names. Plan which can not be unpickled, e.g.
+pickled with other pynput version or backend, is a cache miss.
+"""
+import hashlib
+import os
+import pickle
+
+PLAN_VERSION = 1
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'clicker')
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+HASH_CHUNK = 1024 * 1024
+
+
+def file_hash(filename: str) -> str:
+    """Return SHA-256 hash of the file content.
+
+    Args:
+        filename (str): hashed file.
+
+    Returns (str): hex digest.
+
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        while chunk := file.read(HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dump_plan(plan, options: dict) -> list:
+    """Return plan steps with event names instead of handlers.
+
+    Args:
+        plan (iterable): with (time_ns, handler, args) steps.
+        options (dict): with handlers by event name.
+
+    Returns (list): with (time_ns, event name, args) steps.
+
+    """
+    names = {handler: name for name, handler in options.items()}
+    return [(time_ns, names[handler], args) for time_ns, handler, args in plan]
+
+
+def load_plan(steps: list, options: dict) -> list:
+    """Return plan with handlers of event names.
+
+    Args:
+        steps (list): with (time_ns, event name, args) steps.
+        options (dict): with handlers by event name.
+
+    Returns (list): with (time_ns, handler, args) steps.
+
+    """
+    return [(time_ns, options[name], args) for time_ns, name, args in steps]
+
+
+class PlanCache:
+    """Class with compiled plans kept in the cache directory.
+
+    The least recently used plans are removed when the cache is bigger than
+    max_bytes. Plan of a recording replaces its plans compiled before the
+    recording was changed, plans compiled with other options are kept.
+
+    Methods:
+        key(filename, **options): Return cache key of the recording.
+        load(key): Return cached plan steps.
+        store(key, steps): Save plan steps in the cache.
+        evict(): Remove the least recently used plans over the size limit.
+    """
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        """PlanCache class constructor.
+
+        Args:
+            directory (str): directory with cached plans, created if missing.
+            max_bytes (int): max size of all cached plans.
+
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, filename: str, **options) -> str:
+        """Return cache key of the recording.
+
+        Args:
+            filename (str): recording file name.
+            **options: playback options which change the plan, e.g.
+                move_rate_hz.
+
+        Returns (str): key made of recording path hash, content hash and
+            options hash.
+
+        """
+        source = hashlib.sha256(os.path.abspath(filename).encode('utf-8')).hexdigest()[:16]
+        content = hashlib.sha256(file_hash(filename).encode('ascii'))
+        content.update(repr(PLAN_VERSION).encode('ascii'))
+        settings = hashlib.sha256(repr(sorted(options.items())).encode('utf-8'))
+        return f'{source}-{content.hexdigest()[:32]}-{settings.hexdigest()[:16]}'
+
+    def _path(self, key: str) -> str:
+        """Return file name of the cached plan."""
+        return os.path.join(self.directory, f'{key}.plan')
+
+    def load(self, key: str) -> list:
+        """Return cached plan steps.
+
+        Args:
+            key (str): cache key of the recording.
+
+        Returns (list): with (time_ns, event name, args) steps, None if the
+            plan is not cached.
+
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                version, steps = pickle.load(file)
+        except (
+            OSError,
+            EOFError,
+            pickle.UnpicklingError,
+            ValueError,
+            AttributeError,
+            ImportError,
+            TypeError,
+        ):
+            return None
+        if version != PLAN_VERSION:
+            return None
+        os.utime(path)
+        return steps
+
+    def store(self, key: str, steps: list):
+        """Save plan steps in the cache.
+
+        Plans of older content of the same recording are removed, plans of
+        the same content compiled with other options are kept.
+
+        Args:
+            key (str): cache key of the recording.
+            steps (list): with (time_ns, event name, args) steps.
+
+        """
+        source, content = key.split('-')[:2]
+        current = (f'{key}.plan', f'{source}-{content}-')
+        for name in os.listdir(self.directory):
+            if name.startswith(f'{source}-') and not name.startswith(current):
+                os.remove(os.path.join(self.directory, name))
+        path = self._path(key)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            pickle.dump((PLAN_VERSION, steps), file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used plans over the size limit."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.plan'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
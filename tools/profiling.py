@@ -0,0 +1,182 @@
+"""Module with profiling hooks around playback event handlers.
+
+Hooks wrap handlers of the PlayEvents dispatch table once, before the plan
+is built. Without hooks handlers are not wrapped at all, so normal playback
+has no profiling cost.
+"""
+import abc
+import cProfile
+import functools
+import logging
+import pstats
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TimingHook(abc.ABC):
+    """Base class of hooks which measure every handler call.
+
+    Subclasses must implement record(), which receives latency of every call.
+
+    Methods:
+        wrap(name, handler): Return handler which measures its calls.
+        record(name, elapsed_ns): Take latency of one handler call.
+    """
+    def wrap(self, name: str, handler):
+        """Return handler which measures its calls.
+
+        Args:
+            name (str): event name of the handler.
+            handler (callable): event handler.
+
+        Returns (callable): handler passing latency of every call to record().
+
+        """
+        record = self.record
+        now = time.perf_counter_ns
+
+        @functools.wraps(handler)
+        def timed(*args):
+            start_ns = now()
+            try:
+                return handler(*args)
+            finally:
+                record(name, now() - start_ns)
+
+        return timed
+
+    @abc.abstractmethod
+    def record(self, name: str, elapsed_ns: int):
+        """Take latency of one handler call.
+
+        Args:
+            name (str): event name of the handler.
+            elapsed_ns (int): time of the call in ns.
+
+        """
+
+
+class StatsHook(TimingHook):
+    """Class to count calls and latency of every handler.
+
+    Methods:
+        record(name, elapsed_ns): Add latency of one handler call.
+        summary(): Return stats with mean latency.
+    """
+    def __init__(self):
+        """StatsHook class constructor."""
+        self.stats = {}
+
+    def record(self, name: str, elapsed_ns: int):
+        """Add latency of one handler call.
+
+        Args:
+            name (str): event name of the handler.
+            elapsed_ns (int): time of the call in ns.
+
+        """
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = {'calls': 0, 'total_ns': 0, 'max_ns': 0}
+        stats['calls'] += 1
+        stats['total_ns'] += elapsed_ns
+        if elapsed_ns > stats['max_ns']:
+            stats['max_ns'] = elapsed_ns
+
+    def summary(self) -> dict:
+        """Return stats with mean latency.
+
+        Returns (dict): with calls, total_ns, max_ns and mean_ns by event name.
+
+        """
+        return {
+            name: {**stats, 'mean_ns': stats['total_ns'] / stats['calls']}
+            for name, stats in self.stats.items()
+        }
+
+
+class LogHook(TimingHook):
+    """Class to log handler calls slower than the threshold.
+
+    Methods:
+        record(name, elapsed_ns): Log latency of one handler call.
+    """
+    def __init__(self, threshold_ns: int = 0, log: logging.Logger = logger):
+        """LogHook class constructor.
+
+        Args:
+            threshold_ns (int): calls taking longer are logged, 0 to log all.
+            log (logging.Logger): logger used for messages.
+
+        """
+        self.threshold_ns = threshold_ns
+        self.log = log
+
+    def record(self, name: str, elapsed_ns: int):
+        """Log latency of one handler call.
+
+        Args:
+            name (str): event name of the handler.
+            elapsed_ns (int): time of the call in ns.
+
+        """
+        if elapsed_ns >= self.threshold_ns:
+            self.log.debug('%s took %d ns', name, elapsed_ns)
+
+
+class ProfileHook:
+    """Class to run handlers under cProfile, so backend calls are visible.
+
+    Methods:
+        wrap(name, handler): Return handler which runs under the profiler.
+        stats(): Return collected profile.
+    """
+    def __init__(self, profile: cProfile.Profile = None):
+        """ProfileHook class constructor.
+
+        Args:
+            profile (cProfile.Profile): profiler session, new one by default.
+
+        """
+        self.profile = profile or cProfile.Profile()
+
+    def wrap(self, name: str, handler):
+        """Return handler which runs under the profiler.
+
+        Args:
+            name (str): event name of the handler.
+            handler (callable): event handler.
+
+        Returns (callable): handler profiled on every call.
+
+        """
+        return functools.partial(self.profile.runcall, handler)
+
+    def stats(self) -> pstats.Stats:
+        """Return collected profile.
+
+        Returns (pstats.Stats): e.g. to print it with print_stats().
+
+        """
+        return pstats.Stats(self.profile)
+
+
+def wrap_handlers(options: dict, hooks) -> dict:
+    """Return dispatch table with handlers wrapped by hooks.
+
+    Args:
+        options (dict): with handlers by event name.
+        hooks (iterable): with objects having wrap(name, handler) method,
+            the first hook wraps the outermost.
+
+    Returns (dict): with wrapped handlers by event name.
+
+    """
+    hooks = list(hooks)
+    wrapped = {}
+    for name, handler in options.items():
+        for hook in reversed(hooks):
+            handler = hook.wrap(name, handler)
+        wrapped[name] = handler
+    return wrapped
@@ -0,0 +1,99 @@
+"""Module to collapse and regenerate keyboard auto-repeat.
+
+Repeated presses of held key are not recorded in collapsed mode, release of
+the key keeps the delay before the first repeat and interval between
+repeats, packed into "b" column of the release row:
+    delay in ms (15 bits) << 16 | interval in ms (16 bits).
+Hold duration is the time between press and release.
+"""
+import heapq
+
+from tools.events import Event
+
+MAX_DELAY_MS = 0x7fff
+MAX_INTERVAL_MS = 0xffff
+
+
+def pack_repeat(delay_ns: int, interval_ns: int) -> int:
+    """Pack auto-repeat timing into one integer.
+
+    Args:
+        delay_ns (int): time from press to the first repeat.
+        interval_ns (int): time between repeats, 0 for a single repeat.
+
+    Returns (int): packed timing, never 0.
+
+    """
+    delay_ms = min(max(round(delay_ns / 1e6), 1), MAX_DELAY_MS)
+    interval_ms = min(max(round(interval_ns / 1e6), 0), MAX_INTERVAL_MS)
+    return delay_ms << 16 | interval_ms
+
+
+def unpack_repeat(packed: int) -> tuple:
+    """Unpack auto-repeat timing.
+
+    Args:
+        packed (int): timing packed by pack_repeat, 0 for no repeats.
+
+    Returns (tuple): with delay and interval in ns.
+
+    """
+    return (packed >> 16) * 1_000_000, (packed & 0xffff) * 1_000_000
+
+
+def repeat_times(press_ns: int, release_ns: int, packed: int) -> list:
+    """Return times of auto-repeat presses between press and release.
+
+    Args:
+        press_ns (int): time of the key press.
+        release_ns (int): time of the key release.
+        packed (int): timing packed by pack_repeat.
+
+    Returns (list): with times of repeated presses.
+
+    """
+    delay_ns, interval_ns = unpack_repeat(packed)
+    time_ns = press_ns + delay_ns
+    if not interval_ns:
+        return [time_ns] if time_ns < release_ns else []
+    return list(range(time_ns, release_ns, interval_ns))
+
+
+def expand_repeats(rows):
+    """Yield rows with regenerated auto-repeat presses.
+
+    Events after a key press are held back until the key is released,
+    because the release tells if repeats are needed. Then repeats are
+    merged into held events by time.
+
+    Args:
+        rows (iterable): with (opcode, time_ns, a, b) rows sorted by time.
+
+    Yields (tuple): (opcode, time_ns, a, b) row.
+
+    """
+    press, release = Event.KEY_PRESS.value, Event.KEY_RELEASE.value
+    held = {}
+    waiting = []
+    order = 0
+    for row in rows:
+        opcode, time_ns, key, b = row
+        if opcode == press and key not in held:
+            held[key] = time_ns
+        elif opcode == release and key in held:
+            press_ns = held.pop(key)
+            if b:
+                for repeat_ns in repeat_times(press_ns, time_ns, b):
+                    heapq.heappush(waiting, (repeat_ns, order, (press, repeat_ns, key, 0)))
+                    order += 1
+            row = opcode, time_ns, key, 0
+        if not held and not waiting:
+            yield row
+            continue
+        heapq.heappush(waiting, (time_ns, order, row))
+        order += 1
+        if not held:
+            while waiting:
+                yield heapq.heappop(waiting)[2]
+    while waiting:
+        yield heapq.heappop(waiting)[2]
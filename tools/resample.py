@@ -0,0 +1,128 @@
+"""Module to resample mouse moves to a fixed rate while playing."""
+from tools.events import Event
+
+MAX_GAP_NS = 50_000_000
+INTERPOLATIONS = ('linear', 'spline')
+
+
+def _linear(p0, p1, p2, p3, u: float) -> float:
+    """Interpolate between p1 and p2 on the straight line."""
+    return p1 + (p2 - p1) * u
+
+
+def _spline(p0, p1, p2, p3, u: float) -> float:
+    """Interpolate between p1 and p2 on the Catmull-Rom spline."""
+    return 0.5 * (
+        2 * p1
+        + (p2 - p0) * u
+        + (2 * p0 - 5 * p1 + 4 * p2 - p3) * u * u
+        + (3 * p1 - p0 - 3 * p2 + p3) * u * u * u
+    )
+
+
+class MoveResampler:
+    """Class to resample runs of mouse moves to a fixed rate.
+
+    The first and the last move of every run are kept with their time,
+    moves between them are placed every 1 / rate_hz seconds on the line or
+    spline through recorded moves. Run ends with other event or pause
+    longer than max_gap_ns, the mouse does not move during pauses.
+
+    Methods:
+        resample(rows): Yield rows with resampled mouse moves.
+    """
+    def __init__(
+        self,
+        rate_hz: float,
+        interpolation: str = 'linear',
+        max_gap_ns: int = MAX_GAP_NS,
+    ):
+        """MoveResampler class constructor.
+
+        Args:
+            rate_hz (float): number of mouse moves per second.
+            interpolation (str): 'linear' or 'spline'.
+            max_gap_ns (int): pause between moves which ends the run.
+
+        """
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f'Interpolation must be one of {INTERPOLATIONS}.')
+        self.step_ns = 1e9 / rate_hz
+        self.interpolate = _spline if interpolation == 'spline' else _linear
+        self.max_gap_ns = max_gap_ns
+        self.samples = []
+        self.next_ns = 0
+        self.position = None
+
+    def resample(self, rows):
+        """Yield rows with resampled mouse moves.
+
+        Args:
+            rows (iterable): with (opcode, time_ns, a, b) rows.
+
+        Yields (tuple): (opcode, time_ns, a, b) row.
+
+        """
+        for row in rows:
+            if row[0] != Event.MOVE.value:
+                yield from self._finish()
+                yield row
+                continue
+            if self.samples and row[1] - self.samples[-1][1] > self.max_gap_ns:
+                yield from self._finish()
+            yield from self._add(row)
+        yield from self._finish()
+
+    def _move(self, time_ns: float, x: float, y: float):
+        """Yield mouse move row if the position changes."""
+        position = round(x), round(y)
+        if position != self.position:
+            self.position = position
+            yield (Event.MOVE.value, round(time_ns)) + position
+
+    def _add(self, row: tuple):
+        """Take recorded move and yield moves before the previous one."""
+        if not self.samples:
+            self.next_ns = row[1] + self.step_ns
+            yield from self._move(*row[1:])
+        elif len(self.samples) >= 2:
+            yield from self._interpolate(
+                self.samples[0], self.samples[-2], self.samples[-1], row,
+            )
+        self.samples = self.samples[-2:] + [row]
+
+    def _interpolate(self, p0: tuple, p1: tuple, p2: tuple, p3: tuple):
+        """Yield moves between p1 and p2 placed every step."""
+        duration = p2[1] - p1[1]
+        while duration > 0 and self.next_ns < p2[1]:
+            u = (self.next_ns - p1[1]) / duration
+            yield from self._move(
+                self.next_ns,
+                self.interpolate(p0[2], p1[2], p2[2], p3[2], u),
+                self.interpolate(p0[3], p1[3], p2[3], p3[3], u),
+            )
+            self.next_ns += self.step_ns
+
+    def _finish(self):
+        """Yield the rest of the run with its last move."""
+        if len(self.samples) >= 2:
+            yield from self._interpolate(
+                self.samples[0], self.samples[-2], self.samples[-1], self.samples[-1],
+            )
+            yield from self._move(*self.samples[-1][1:])
+        self.samples = []
+        self.position = None
+
+
+def resample_moves(rows, rate_hz: float, interpolation: str = 'linear'):
+    """Yield rows with mouse moves resampled to the fixed rate.
+
+    Args:
+        rows (iterable): with (opcode, time_ns, a, b) rows.
+        rate_hz (float): number of mouse moves per second.
+        interpolation (str): 'linear' or 'spline'.
+
+    Returns (iterator): with (opcode, time_ns, a, b) rows.
+
+    """
+    return MoveResampler(rate_hz, interpolation).resample(rows)
@@ -0,0 +1,143 @@
+"""Module with the buffer between listener callbacks and event formatting."""
+import threading
+
+BUFFER_SIZE = 65536
+DRAIN_INTERVAL = 0.005
+
+
+class RingBuffer:
+    """Class with preallocated ring buffer for one producer and one consumer.
+
+    The listener thread only puts a raw (opcode, time_ns, a, b) tuple into
+    the next slot, the consumer thread takes all waiting items at once.
+    When the buffer is full new items are dropped, so the listener thread
+    never waits.
+
+    Methods:
+        push(item): Put item into the buffer.
+        pop_all(): Take all waiting items.
+    """
+    def __init__(self, capacity: int = BUFFER_SIZE):
+        """RingBuffer class constructor.
+
+        Args:
+            capacity (int): max number of waiting items, rounded up to the
+                power of 2.
+
+        """
+        self.capacity = 1 << max(capacity - 1, 0).bit_length()
+        self.mask = self.capacity - 1
+        self.items = [None] * self.capacity
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self.tail - self.head
+
+    def push(self, item) -> bool:
+        """Put item into the buffer.
+
+        Args:
+            item: raw event tuple.
+
+        Returns (bool): False if the buffer is full and item is dropped.
+
+        """
+        tail = self.tail
+        if tail - self.head >= self.capacity:
+            self.dropped += 1
+            return False
+        self.items[tail & self.mask] = item
+        self.tail = tail + 1
+        return True
+
+    def pop_all(self) -> list:
+        """Take all waiting items.
+
+        Returns (list): with items in order of push.
+
+        """
+        head, tail = self.head, self.tail
+        start, end = head & self.mask, tail & self.mask
+        if tail - head == 0:
+            items = []
+        elif start < end:
+            items = self.items[start:end]
+        else:
+            items = self.items[start:] + self.items[:end]
+        self.head = tail
+        return items
+
+
+class BufferConsumer:
+    """Class with thread which takes items from the buffer and handles them.
+
+    With progress set, after every drain it is called with the time of the
+    previous check of the buffer: items stamped before it were pushed
+    already, so no later item is older. Time of the previous check is used,
+    because the listener thread takes the time before it pushes the item.
+
+    Methods:
+        start(): Start the consumer thread.
+        stop(): Stop the thread after handling all waiting items.
+        drain(): Handle all waiting items.
+    """
+    def __init__(
+        self,
+        buffer: RingBuffer,
+        handle,
+        interval: float = DRAIN_INTERVAL,
+        progress=None,
+        now=None,
+    ):
+        """BufferConsumer class constructor.
+
+        Args:
+            buffer (RingBuffer): buffer filled by the listener thread.
+            handle (callable): called with every item.
+            interval (float): seconds between checks of the buffer.
+            progress (callable): called with time in ns before which no more
+                items will come, None to skip it.
+            now (callable): clock used to stamp items, needed with progress.
+
+        """
+        self.buffer = buffer
+        self.handle = handle
+        self.interval = interval
+        self.progress = progress
+        self.now = now
+        self.checked_ns = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Start the consumer thread."""
+        self.stopped.clear()
+        self.checked_ns = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the thread after handling all waiting items."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.drain()
+
+    def drain(self):
+        """Handle all waiting items."""
+        handle = self.handle
+        checked_ns = self.now() if self.progress is not None else None
+        for item in self.buffer.pop_all():
+            handle(item)
+        if self.progress is not None:
+            if self.checked_ns is not None:
+                self.progress(self.checked_ns)
+            self.checked_ns = checked_ns
+
+    def _run(self):
+        """Handle waiting items until the consumer is stopped."""
+        while not self.stopped.wait(self.interval):
+            self.drain()
@@ -0,0 +1,84 @@
+"""Module to keep only the last recorded events."""
+import heapq
+import itertools
+import threading
+
+from tools.database import Database
+from tools.events import event_time_ns, iter_rows
+
+
+class RollingCapture:
+    """Class to keep events from the last seconds or the last events only.
+
+    It is used as the sink of recorders, older events are removed when new
+    ones come, so memory does not grow with recording time. Recorders pass
+    events from separate threads, so they can come out of time order,
+    events are kept in a heap to always remove the oldest by time.
+
+    Methods:
+        snapshot(): Return kept events with time counted from the first one.
+        dump(filename, storage): Save kept events to the file.
+    """
+    def __init__(self, max_age_ns: int = None, max_events: int = None):
+        """RollingCapture class constructor.
+
+        Args:
+            max_age_ns (int): keep events not older than the newest one by
+                this time in ns.
+            max_events (int): max number of kept events.
+
+        """
+        if max_age_ns is None and max_events is None:
+            raise ValueError('Pass max_age_ns or max_events.')
+        self.max_age_ns = max_age_ns
+        self.max_events = max_events
+        self.events = []
+        self.newest_ns = None
+        self.order = itertools.count()
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        """Keep event and remove too old ones.
+
+        Args:
+            event: dict event or (opcode, time_ns, a, b) row.
+
+        """
+        time_ns = event_time_ns(event)
+        with self.lock:
+            heapq.heappush(self.events, (time_ns, next(self.order), event))
+            if self.max_events is not None and len(self.events) > self.max_events:
+                heapq.heappop(self.events)
+            if self.max_age_ns is not None:
+                if self.newest_ns is None or time_ns > self.newest_ns:
+                    self.newest_ns = time_ns
+                oldest_ns = self.newest_ns - self.max_age_ns
+                while self.events[0][0] < oldest_ns:
+                    heapq.heappop(self.events)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def snapshot(self) -> list:
+        """Return kept events with time counted from the first one.
+
+        Returns (list): with (opcode, time_ns, a, b) rows sorted by time.
+
+        """
+        with self.lock:
+            rows = list(iter_rows(event for _, _, event in sorted(self.events)))
+        if not rows:
+            return rows
+        start_ns = rows[0][1]
+        return [(opcode, time_ns - start_ns, a, b) for opcode, time_ns, a, b in rows]
+
+    def dump(self, filename: str, storage: str = 'columnar'):
+        """Save kept events to the file.
+
+        Args:
+            filename (str): file name to save events.
+            storage (str): format of the file, 'json' or 'columnar'.
+
+        """
+        with Database(filename, 'w', storage) as database:
+            database.save(self.snapshot())
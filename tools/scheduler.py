@@ -0,0 +1,93 @@
+"""Module to schedule playback of events at absolute deadlines."""
+import time
+
+SPIN_NS = 500_000
+MIN_SPEED = 0.25
+MAX_SPEED = 100
+
+
+class DeadlineScheduler:
+    """Class to wait for events at deadlines counted from playback start.
+
+    Every deadline is counted from the start of playback, so sleep overshoot
+    does not accumulate. Late events are not delayed at all. Gaps between
+    recorded events can be capped and the whole timeline played faster or
+    slower, the recording itself is not changed.
+
+    Methods:
+        start(): Remember playback start time.
+        deadline(time_ns): Calculate deadline for event recorded at time_ns.
+        wait(time_ns): Wait for event recorded at time_ns.
+        wait_until(deadline_ns): Wait until the passed deadline.
+    """
+    def __init__(
+        self,
+        spin_ns: int = SPIN_NS,
+        speed: float = 1.0,
+        max_gap_ns: int = None,
+    ):
+        """DeadlineScheduler class constructor.
+
+        Args:
+            spin_ns (int): the last part of waiting in ns done by busy loop
+                instead of sleep, 0 to only sleep.
+            speed (float): playback speed factor from 0.25 to 100.
+            max_gap_ns (int): max recorded gap between events in ns, longer
+                idle time is cut to it, None to keep all gaps.
+
+        """
+        if not MIN_SPEED <= speed <= MAX_SPEED:
+            raise ValueError(f'Speed must be between {MIN_SPEED} and {MAX_SPEED}.')
+        self.spin_ns = spin_ns
+        self.speed = speed
+        self.max_gap_ns = max_gap_ns
+        self.start_ns = None
+        self.previous_ns = 0
+        self.offset_ns = 0
+
+    def start(self):
+        """Remember playback start time."""
+        self.start_ns = time.perf_counter_ns()
+        self.previous_ns = 0
+        self.offset_ns = 0
+
+    def deadline(self, time_ns: int) -> int:
+        """Calculate deadline for event recorded at time_ns.
+
+        Events have to be passed in recorded order, gap to the previous event
+        is capped to max_gap_ns and divided by speed.
+
+        Args:
+            time_ns (int): time since start record in ns.
+
+        Returns (int): perf_counter_ns value at which event should be played.
+
+        """
+        gap = time_ns - self.previous_ns
+        self.previous_ns = time_ns
+        if self.max_gap_ns is not None and gap > self.max_gap_ns:
+            gap = self.max_gap_ns
+        self.offset_ns += gap / self.speed
+        return self.start_ns + round(self.offset_ns)
+
+    def wait(self, time_ns: int):
+        """Wait for event recorded at time_ns.
+
+        Args:
+            time_ns (int): time since start record in ns.
+
+        """
+        self.wait_until(self.deadline(time_ns))
+
+    def wait_until(self, deadline_ns: int):
+        """Wait until the passed deadline, return at once if it is passed.
+
+        Args:
+            deadline_ns (int): perf_counter_ns value to wait for.
+
+        """
+        remaining = deadline_ns - time.perf_counter_ns()
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1e9)
+        while time.perf_counter_ns() < deadline_ns:
+            pass
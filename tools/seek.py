@@ -0,0 +1,135 @@
+"""Module to start playback in the middle of recording.
+
+Recording is searched by a sparse time index: time of every n-th event or
+of the first event of every columnar block. Binary search in the index
+finds the stretch of events, then binary search in that stretch finds the
+event, so only one columnar block is decoded.
+
+Keys, buttons and mouse position at the seek point are restored from the
+input state saved with columnar blocks and library chunks, so only events
+of the block with the seek point are read and none of them is played.
+Other recordings, e.g. json files or columnar files of older versions,
+have no saved state: checkpoints at index entries are counted when they
+are needed for the first time, reading all events before the seek point.
+"""
+import bisect
+
+from tools.events import event_time_ns, iter_rows
+from tools.state import InputState
+
+INDEX_STEP = 4096
+
+
+class TimeIndex:
+    """Class with sparse time index of recording.
+
+    Methods:
+        seek(time_ns): Find number of the first event not earlier than time_ns.
+        state_at(index): Return input state before the event with given number.
+        slice(start_ns, end_ns): Yield events to play the part of recording.
+    """
+    def __init__(self, recording, step: int = INDEX_STEP):
+        """TimeIndex class constructor.
+
+        Args:
+            recording: sequence with dict events or (opcode, time_ns, a, b)
+                rows sorted by time, e.g. list or ColumnarRecording.
+            step (int): number of events between index entries, columnar
+                recording is indexed by its blocks.
+
+        """
+        self.recording = recording
+        if hasattr(recording, 'block_index'):
+            entries = recording.block_index()
+        else:
+            entries = [
+                (number, event_time_ns(recording[number]))
+                for number in range(0, len(recording), step)
+            ]
+        self.numbers = [number for number, _ in entries]
+        self.times = [time_ns for _, time_ns in entries]
+        self.checkpoints = [InputState()]
+
+    def seek(self, time_ns: int) -> int:
+        """Find number of the first event not earlier than time_ns.
+
+        Args:
+            time_ns (int): time since start record in ns.
+
+        Returns (int): event number, length of recording if all events are
+            earlier.
+
+        """
+        entry = max(bisect.bisect_left(self.times, time_ns) - 1, 0)
+        if not self.numbers:
+            return 0
+        low = self.numbers[entry]
+        high = self.numbers[entry + 1] if entry + 1 < len(self.numbers) else len(self.recording)
+        return bisect.bisect_left(self.recording, time_ns, low, high, key=event_time_ns)
+
+    def state_at(self, index: int) -> InputState:
+        """Return input state before the event with given number.
+
+        State saved with the block is used if recording has it, otherwise
+        checkpoints at index entries are counted once, when they are needed
+        for the first time.
+
+        Args:
+            index (int): event number.
+
+        Returns (InputState): with held keys, buttons and mouse position.
+
+        """
+        entry = max(bisect.bisect_right(self.numbers, index) - 1, 0)
+        if self.numbers and hasattr(self.recording, 'block_state'):
+            state = self.recording.block_state(entry)
+            if state is not None:
+                return self._advance(state, self.numbers[entry], index)
+        while len(self.checkpoints) <= entry:
+            done = len(self.checkpoints) - 1
+            self.checkpoints.append(self._advance(
+                self.checkpoints[done], self.numbers[done], self.numbers[done + 1],
+            ))
+        start = self.numbers[entry] if self.numbers else 0
+        return self._advance(self.checkpoints[entry], start, index)
+
+    def _advance(self, state: InputState, start: int, end: int) -> InputState:
+        """Return copy of state updated with events from start to end."""
+        state = state.copy()
+        recording = self.recording
+        for row in iter_rows(recording[number] for number in range(start, end)):
+            state.apply(row)
+        return state
+
+    def slice(self, start_ns: int = None, end_ns: int = None, restore: bool = True):
+        """Yield events to play the part of recording from start_ns to end_ns.
+
+        Time of yielded events is counted from start_ns, so playback starts
+        at once.
+
+        Args:
+            start_ns (int): time of the first played event, None to play
+                from the beginning.
+            end_ns (int): time after the last played event, None to play to
+                the end.
+            restore (bool): press keys and buttons held and move mouse to
+                the position at start_ns, release keys and buttons still held
+                at end_ns.
+
+        Yields (tuple): (opcode, time_ns, a, b) row.
+
+        """
+        first = 0 if start_ns is None else self.seek(start_ns)
+        last = len(self.recording) if end_ns is None else self.seek(end_ns)
+        base_ns = start_ns or 0
+        state = self.state_at(first) if restore else InputState()
+        if restore:
+            yield from state.restore_rows(0)
+        last_ns = base_ns
+        recording = self.recording
+        for row in iter_rows(recording[number] for number in range(first, last)):
+            opcode, last_ns, a, b = row
+            state.apply(row)
+            yield opcode, last_ns - base_ns, a, b
+        if restore:
+            yield from state.release_rows((last_ns if end_ns is None else end_ns) - base_ns)
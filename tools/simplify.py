@@ -0,0 +1,251 @@
+"""Module to remove redundant mouse move events from recorded path.
+
+Consecutive mouse moves are simplified with the Ramer-Douglas-Peucker
+algorithm: points closer than tolerance (in pixels) to the simplified path
+are removed, the first and the last point of every run are kept, so the
+shape of the path and the time of its ends do not change.
+"""
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tools.database import Database
+from tools.events import Event, event_time_ns
+
+MAX_GAP_NS = 100_000_000
+MAX_POINTS = 1024
+COMPACT_MAX_POINTS = 65536
+
+
+def move_point(event):
+    """Return coordinates of mouse move event.
+
+    Args:
+        event: dict event or (opcode, time_ns, a, b) row.
+
+    Returns (tuple | None): with x and y or None for other events.
+
+    """
+    if isinstance(event, tuple):
+        return event[2:] if event[0] == Event.MOVE.value else None
+    options = event.get('mouse_move')
+    if options is None:
+        return None
+    return options[0]['coordinate_x'], options[0]['coordinate_y']
+
+
+def simplify_path(points: list, tolerance: float) -> list:
+    """Find points to keep in simplified path.
+
+    Args:
+        points (list): with (x, y) points.
+        tolerance (float): max distance of removed point from the path.
+
+    Returns (list): with indexes of kept points.
+
+    """
+    if len(points) < 3:
+        return list(range(len(points)))
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    segments = [(0, len(points) - 1)]
+    while segments:
+        first, last = segments.pop()
+        x1, y1 = points[first]
+        dx = points[last][0] - x1
+        dy = points[last][1] - y1
+        norm = math.hypot(dx, dy)
+        index, max_distance = None, tolerance
+        for i in range(first + 1, last):
+            x, y = points[i]
+            if norm:
+                distance = abs(dy * (x - x1) - dx * (y - y1)) / norm
+            else:
+                distance = math.hypot(x - x1, y - y1)
+            if distance > max_distance:
+                index, max_distance = i, distance
+        if index is not None:
+            keep[index] = True
+            segments.append((first, index))
+            segments.append((index, last))
+    return [i for i, kept in enumerate(keep) if kept]
+
+
+def simplify_path_numpy(points, tolerance: float) -> list:
+    """Find points to keep in simplified path, distances counted by NumPy.
+
+    Args:
+        points: sequence or array with (x, y) points.
+        tolerance (float): max distance of removed point from the path.
+
+    Returns (list): with indexes of kept points.
+
+    """
+    points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 2)
+    if len(points) < 3:
+        return list(range(len(points)))
+    keep = numpy.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    segments = [(0, len(points) - 1)]
+    while segments:
+        first, last = segments.pop()
+        if last - first < 2:
+            continue
+        start = points[first]
+        direction = points[last] - start
+        offsets = points[first + 1:last] - start
+        norm = numpy.hypot(*direction)
+        if norm:
+            distances = numpy.abs(
+                direction[1] * offsets[:, 0] - direction[0] * offsets[:, 1]
+            ) / norm
+        else:
+            distances = numpy.hypot(offsets[:, 0], offsets[:, 1])
+        index = int(numpy.argmax(distances))
+        if distances[index] > tolerance:
+            index += first + 1
+            keep[index] = True
+            segments.append((first, index))
+            segments.append((index, last))
+    return numpy.flatnonzero(keep).tolist()
+
+
+class PathSimplifier:
+    """Class to simplify mouse path while recording.
+
+    Mouse moves are kept until the run of moves ends, then only points
+    needed to draw the path are passed to the sink. Run ends with other
+    event, pause longer than max_gap_ns or after max_points moves.
+
+    Methods:
+        progress(time_ns): Pass time before which no more events will come.
+        flush(): Pass simplified moves waiting in buffer to the sink.
+    """
+    def __init__(
+        self,
+        sink,
+        tolerance: float,
+        max_gap_ns: int = MAX_GAP_NS,
+        max_points: int = MAX_POINTS,
+        simplify=simplify_path,
+    ):
+        """PathSimplifier class constructor.
+
+        Args:
+            sink (callable): called with every kept event.
+            tolerance (float): max distance in pixels of removed point from
+                the path.
+            max_gap_ns (int): pause between moves which ends the run.
+            max_points (int): max number of moves in the run.
+            simplify (callable): function returning indexes of kept points.
+
+        """
+        self.sink = sink
+        self.tolerance = tolerance
+        self.max_gap_ns = max_gap_ns
+        self.max_points = max_points
+        self.simplify = simplify
+        self.moves = []
+        self.points = []
+        self.last_time_ns = None
+
+    def __call__(self, event):
+        """Take recorded event.
+
+        Args:
+            event: dict event or (opcode, time_ns, a, b) row.
+
+        """
+        point = move_point(event)
+        if point is None:
+            self.flush()
+            self.sink(event)
+            return
+        time_ns = event_time_ns(event)
+        if self.moves and time_ns - self.last_time_ns > self.max_gap_ns:
+            self.flush()
+        self.moves.append(event)
+        self.points.append(point)
+        self.last_time_ns = time_ns
+        if len(self.moves) >= self.max_points:
+            last_move = self.moves[-1]
+            self.flush(keep_last=False)
+            self.moves.append(last_move)
+            self.points.append(point)
+
+    def progress(self, time_ns: int):
+        """Pass time before which no more events will come to the sink.
+
+        Held moves are passed later, so the time is not later than the
+        first of them. Nothing is done if the sink does not take progress.
+
+        Args:
+            time_ns (int): time before which no more events will come.
+
+        """
+        progress = getattr(self.sink, 'progress', None)
+        if progress is None:
+            return
+        if self.moves:
+            time_ns = min(time_ns, event_time_ns(self.moves[0]))
+        progress(time_ns)
+
+    def flush(self, keep_last: bool = True):
+        """Pass simplified moves waiting in buffer to the sink.
+
+        Args:
+            keep_last (bool): pass the last move, it is skipped when it
+                starts the next run.
+
+        """
+        indexes = self.simplify(self.points, self.tolerance)
+        if not keep_last:
+            indexes = indexes[:-1]
+        for index in indexes:
+            self.sink(self.moves[index])
+        self.moves = []
+        self.points = []
+
+
+def compact_events(events, tolerance: float) -> list:
+    """Remove redundant mouse moves from recorded events.
+
+    NumPy is used to count distances when it is installed.
+
+    Args:
+        events (iterable): with dict events or (opcode, time_ns, a, b) rows.
+        tolerance (float): max distance in pixels of removed point from the path.
+
+    Returns (list): with kept events.
+
+    """
+    result = []
+    simplifier = PathSimplifier(
+        result.append,
+        tolerance,
+        max_points=COMPACT_MAX_POINTS,
+        simplify=simplify_path_numpy if numpy is not None else simplify_path,
+    )
+    for event in events:
+        simplifier(event)
+    simplifier.flush()
+    return result
+
+
+def compact_file(source: str, target: str, tolerance: float, storage: str = 'columnar'):
+    """Save recording without redundant mouse moves to the new file.
+
+    Args:
+        source (str): recording file name.
+        target (str): file name of compacted recording.
+        tolerance (float): max distance in pixels of removed point from the path.
+        storage (str): format of compacted recording, 'json' or 'columnar'.
+
+    """
+    with Database(source) as database:
+        events = compact_events(database, tolerance)
+    with Database(target, 'w', storage) as database:
+        database.save(events)
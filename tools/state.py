@@ -0,0 +1,80 @@
+"""Module with input state: held keys and buttons and mouse position.
+
+State before the first event of every columnar block is saved with the
+block, so playback can start in the middle of recording without reading
+events before the block.
+"""
+from tools.events import Event
+
+
+class InputState:
+    """Class with held keys and buttons and mouse position.
+
+    Methods:
+        apply(row): Update state with recorded event.
+        copy(): Return copy of the state.
+        restore_rows(time_ns): Return events which bring back the state.
+        release_rows(time_ns): Return events which release held keys and buttons.
+    """
+    def __init__(self):
+        """InputState class constructor."""
+        self.position = None
+        self.keys = {}
+        self.buttons = {}
+
+    def apply(self, row: tuple):
+        """Update state with recorded event.
+
+        Args:
+            row (tuple): (opcode, time_ns, a, b) row.
+
+        """
+        opcode, _, a, b = row
+        if opcode == Event.MOVE.value:
+            self.position = a, b
+        elif opcode == Event.KEY_PRESS.value:
+            self.keys[a] = None
+        elif opcode == Event.KEY_RELEASE.value:
+            self.keys.pop(a, None)
+        elif opcode == Event.CLICK.value:
+            if b:
+                self.buttons[a] = None
+            else:
+                self.buttons.pop(a, None)
+
+    def copy(self) -> 'InputState':
+        """Return copy of the state."""
+        state = InputState()
+        state.position = self.position
+        state.keys = dict(self.keys)
+        state.buttons = dict(self.buttons)
+        return state
+
+    def restore_rows(self, time_ns: int) -> list:
+        """Return events which bring back the state.
+
+        Args:
+            time_ns (int): time of returned events.
+
+        Returns (list): with mouse move, button and key press rows.
+
+        """
+        rows = []
+        if self.position is not None:
+            rows.append((Event.MOVE.value, time_ns, *self.position))
+        rows += [(Event.CLICK.value, time_ns, button, 1) for button in self.buttons]
+        rows += [(Event.KEY_PRESS.value, time_ns, key, 0) for key in self.keys]
+        return rows
+
+    def release_rows(self, time_ns: int) -> list:
+        """Return events which release held keys and buttons.
+
+        Args:
+            time_ns (int): time of returned events.
+
+        Returns (list): with key release and button release rows.
+
+        """
+        rows = [(Event.KEY_RELEASE.value, time_ns, key, 0) for key in reversed(self.keys)]
+        rows += [(Event.CLICK.value, time_ns, button, 0) for button in reversed(self.buttons)]
+        return rows
@@ -0,0 +1,58 @@
+"""Module with the signal to stop recording."""
+import threading
+
+
+class StopSignal:
+    """Class to notify all recorders when recording should stop.
+
+    Callbacks are called at once by the thread which sets the signal, so
+    no thread has to poll for it.
+
+    Methods:
+        subscribe(callback): Call callback when the signal is set.
+        set(): Set the signal and call subscribed callbacks.
+        is_set(): Check the signal is set.
+        clear(): Clear the signal and remove subscribed callbacks.
+    """
+    def __init__(self):
+        """StopSignal class constructor."""
+        self._lock = threading.Lock()
+        self._is_set = False
+        self._callbacks = []
+
+    def subscribe(self, callback):
+        """Call callback when the signal is set, at once if it is already set.
+
+        Args:
+            callback (callable): called without arguments.
+
+        """
+        with self._lock:
+            if not self._is_set:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def set(self):
+        """Set the signal and call subscribed callbacks."""
+        with self._lock:
+            if self._is_set:
+                return
+            self._is_set = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def is_set(self) -> bool:
+        """Check the signal is set.
+
+        Returns (bool): True if the signal is set.
+
+        """
+        return self._is_set
+
+    def clear(self):
+        """Clear the signal and remove subscribed callbacks."""
+        with self._lock:
+            self._is_set = False
+            self._callbacks = []
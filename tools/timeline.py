@@ -0,0 +1,116 @@
+"""Module to compose one timeline from several recordings."""
+import contextlib
+import heapq
+from operator import itemgetter
+
+from tools.database import Database
+from tools.events import iter_rows
+
+
+class Track:
+    """Class with recording placed on the timeline.
+
+    Methods:
+        rows(): Yield events of the recording with timeline time.
+    """
+    def __init__(self, events, offset_ns: int = 0, speed: float = 1.0):
+        """Track class constructor.
+
+        Args:
+            events (iterable): with dict events or (opcode, time_ns, a, b)
+                rows sorted by time, e.g. open Database.
+            offset_ns (int): time on the timeline at which recording starts.
+            speed (float): speed factor of the recording, 2 plays it twice
+                as fast.
+
+        """
+        if speed <= 0:
+            raise ValueError(f'Speed must be positive, got {speed}.')
+        self.events = events
+        self.offset_ns = offset_ns
+        self.speed = speed
+
+    def rows(self):
+        """Yield events of the recording with timeline time.
+
+        Yields (tuple): (opcode, time_ns, a, b) row.
+
+        """
+        offset_ns, speed = self.offset_ns, self.speed
+        if speed == 1:
+            for opcode, time_ns, a, b in iter_rows(self.events):
+                yield opcode, time_ns + offset_ns, a, b
+        else:
+            for opcode, time_ns, a, b in iter_rows(self.events):
+                yield opcode, offset_ns + round(time_ns / speed), a, b
+
+
+class Timeline:
+    """Class to merge recordings placed at offsets into one event stream.
+
+    Tracks are merged lazily with a heap, one event of every track is kept
+    at a time, so the combined recording is never built nor sorted. The
+    timeline is iterable, so it can be passed to PlayEvents directly.
+    Events at the same time keep the order in which tracks were added.
+
+    Methods:
+        add(events, offset_ns, speed): Place recording on the timeline.
+        open(filename, offset_ns, speed): Place recording file on the timeline.
+        close(): Close files opened by the timeline.
+    """
+    def __init__(self, tracks: list = None):
+        """Timeline class constructor.
+
+        Args:
+            tracks (list): with Track objects.
+
+        """
+        self.tracks = list(tracks or [])
+        self.files = contextlib.ExitStack()
+
+    def __enter__(self):
+        """Implemented to use as context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Implemented to use as context manager."""
+        self.close()
+
+    def __iter__(self):
+        """Yield events of all tracks sorted by timeline time."""
+        return heapq.merge(*(track.rows() for track in self.tracks), key=itemgetter(1))
+
+    def add(self, events, offset_ns: int = 0, speed: float = 1.0) -> 'Timeline':
+        """Place recording on the timeline.
+
+        Args:
+            events (iterable): with dict events or rows sorted by time.
+            offset_ns (int): time on the timeline at which recording starts.
+            speed (float): speed factor of the recording.
+
+        Returns (Timeline): self, so calls can be chained.
+
+        """
+        self.tracks.append(Track(events, offset_ns, speed))
+        return self
+
+    def open(self, filename: str, offset_ns: int = 0, speed: float = 1.0) -> 'Timeline':
+        """Place recording file on the timeline.
+
+        File is open until the timeline is closed and its events are read
+        while the timeline is iterated.
+
+        Args:
+            filename (str): json or columnar recording file.
+            offset_ns (int): time on the timeline at which recording starts.
+            speed (float): speed factor of the recording.
+
+        Returns (Timeline): self, so calls can be chained.
+
+        """
+        database = self.files.enter_context(Database(filename, 'r'))
+        return self.add(database, offset_ns, speed)
+
+    def close(self):
+        """Close files opened by the timeline."""
+        self.files.close()
@@ -0,0 +1,201 @@
+"""Module to measure how accurately playback keeps recorded timing."""
+from array import array
+
+TIMING_CAPACITY = 65536
+HISTOGRAM_BOUNDS_NS = (
+    10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000,
+)
+
+
+def percentile(values: list, fraction: float) -> int:
+    """Return nearest-rank percentile of sorted values.
+
+    Args:
+        values (list): sorted values.
+        fraction (float): percentile from 0 to 1.
+
+    Returns (int): value of the percentile, 0 for no values.
+
+    """
+    if not values:
+        return 0
+    index = max(round(fraction * len(values)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+class TimingRecorder:
+    """Class to keep intended and actual dispatch time of played events.
+
+    Times are written into preallocated arrays, so recording one event only
+    stores two integers. The arrays grow when more events are played than
+    expected.
+
+    Methods:
+        start(): Forget times of the previous playback.
+        record(deadline_ns, actual_ns): Keep times of dispatched event.
+        lateness(): Return lateness of every dispatched event.
+        report(): Return statistics of dispatch lateness.
+    """
+    def __init__(self, capacity: int = TIMING_CAPACITY):
+        """TimingRecorder class constructor.
+
+        Args:
+            capacity (int): number of events for which memory is allocated.
+
+        """
+        capacity = max(capacity, 1)
+        self.intended = array('q', bytes(8 * capacity))
+        self.actual = array('q', bytes(8 * capacity))
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def start(self):
+        """Forget times of the previous playback."""
+        self.count = 0
+
+    def record(self, deadline_ns: int, actual_ns: int):
+        """Keep times of dispatched event.
+
+        Args:
+            deadline_ns (int): perf_counter_ns at which event should be played.
+            actual_ns (int): perf_counter_ns at which event was played.
+
+        """
+        count = self.count
+        if count == len(self.intended):
+            self.intended.extend(self.intended)
+            self.actual.extend(self.actual)
+        self.intended[count] = deadline_ns
+        self.actual[count] = actual_ns
+        self.count = count + 1
+
+    def lateness(self) -> list:
+        """Return lateness of every dispatched event.
+
+        Returns (list): with actual minus intended time in ns, in play order.
+
+        """
+        intended, actual = self.intended, self.actual
+        return [actual[i] - intended[i] for i in range(self.count)]
+
+    def report(self, bounds_ns: tuple = HISTOGRAM_BOUNDS_NS) -> 'TimingReport':
+        """Return statistics of dispatch lateness.
+
+        Args:
+            bounds_ns (tuple): upper bounds of histogram buckets in ns.
+
+        Returns (TimingReport): with percentiles, drift and histogram.
+
+        """
+        return TimingReport(self.lateness(), bounds_ns)
+
+
+class TimingReport:
+    """Class with statistics of dispatch lateness of played events.
+
+    Methods:
+        violations(max_p99_ns, max_lateness_ns, max_drift_ns): Return
+            exceeded thresholds.
+        check(max_p99_ns, max_lateness_ns, max_drift_ns): Raise error when
+            any threshold is exceeded.
+        format(): Return report as text.
+    """
+    def __init__(self, lateness: list, bounds_ns: tuple = HISTOGRAM_BOUNDS_NS):
+        """TimingReport class constructor.
+
+        Args:
+            lateness (list): lateness of every played event in ns, in play order.
+            bounds_ns (tuple): upper bounds of histogram buckets in ns.
+
+        """
+        ordered = sorted(lateness)
+        self.count = len(lateness)
+        self.p50_ns = percentile(ordered, 0.5)
+        self.p99_ns = percentile(ordered, 0.99)
+        self.max_ns = ordered[-1] if ordered else 0
+        self.mean_ns = sum(ordered) / len(ordered) if ordered else 0
+        self.drift_ns = lateness[-1] - lateness[0] if lateness else 0
+        self.histogram = self._histogram(ordered, bounds_ns)
+
+    @staticmethod
+    def _histogram(ordered: list, bounds_ns: tuple) -> list:
+        """Count lateness in buckets, the last one has no upper bound."""
+        histogram = []
+        index = 0
+        for bound in (*bounds_ns, None):
+            start = index
+            while index < len(ordered) and (bound is None or ordered[index] <= bound):
+                index += 1
+            histogram.append((bound, index - start))
+        return histogram
+
+    def as_dict(self) -> dict:
+        """Return report as dict, e.g. to save it as json."""
+        return {
+            'count': self.count,
+            'p50_ns': self.p50_ns,
+            'p99_ns': self.p99_ns,
+            'max_ns': self.max_ns,
+            'mean_ns': self.mean_ns,
+            'drift_ns': self.drift_ns,
+            'histogram': self.histogram,
+        }
+
+    def violations(
+        self,
+        max_p99_ns: int = None,
+        max_lateness_ns: int = None,
+        max_drift_ns: int = None,
+    ) -> list:
+        """Return exceeded thresholds.
+
+        Args:
+            max_p99_ns (int): max 99th percentile of lateness.
+            max_lateness_ns (int): max lateness of any event.
+            max_drift_ns (int): max absolute change of lateness from the
+                first to the last event.
+
+        Returns (list): with messages about exceeded thresholds.
+
+        """
+        messages = []
+        if max_p99_ns is not None and self.p99_ns > max_p99_ns:
+            messages.append(f'p99 lateness {self.p99_ns} ns exceeds {max_p99_ns} ns.')
+        if max_lateness_ns is not None and self.max_ns > max_lateness_ns:
+            messages.append(f'Max lateness {self.max_ns} ns exceeds {max_lateness_ns} ns.')
+        if max_drift_ns is not None and abs(self.drift_ns) > max_drift_ns:
+            messages.append(f'Drift {self.drift_ns} ns exceeds {max_drift_ns} ns.')
+        return messages
+
+    def check(
+        self,
+        max_p99_ns: int = None,
+        max_lateness_ns: int = None,
+        max_drift_ns: int = None,
+    ):
+        """Raise error when any threshold is exceeded.
+
+        Args:
+            max_p99_ns (int): max 99th percentile of lateness.
+            max_lateness_ns (int): max lateness of any event.
+            max_drift_ns (int): max absolute drift of lateness.
+
+        """
+        messages = self.violations(max_p99_ns, max_lateness_ns, max_drift_ns)
+        if messages:
+            raise ValueError(' '.join(messages))
+
+    def format(self) -> str:
+        """Return report as text."""
+        lines = [
+            f'events: {self.count}',
+            f'lateness p50: {self.p50_ns / 1000:.1f} us, '
+            f'p99: {self.p99_ns / 1000:.1f} us, max: {self.max_ns / 1000:.1f} us',
+            f'drift: {self.drift_ns / 1000:.1f} us',
+        ]
+        for bound, count in self.histogram:
+            label = f'<= {bound / 1000:g} us' if bound is not None else 'more'
+            lines.append(f'  {label:>12}: {count}')
+        return '\n'.join(lines)
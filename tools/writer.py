@@ -0,0 +1,198 @@
+"""Module to write recorded events to columnar file while recording."""
+import heapq
+import itertools
+import queue
+import threading
+import time
+
+from tools import columnar
+from tools.events import to_row
+from tools.state import InputState
+
+_STOP = object()
+
+
+class RecordingWriter:
+    """Class to write events to columnar file while recording.
+
+    Listener callbacks put events into a bounded queue, background thread
+    takes them in batches and appends every batch to the file as a block.
+    The file is valid after each flush, so crash loses only the last batch.
+
+    Recorders pass events from separate threads with some lag, e.g. mouse
+    moves are held while the path is simplified, so every recorder writes
+    through its own source(). Events are kept until every source reported
+    progress past them, then they are written in time order, recorded
+    times are never changed. Without sources events passed to write() are
+    not held back, they have to come in time order.
+
+    Methods:
+        source(): Return sink of one recorder.
+        write(event): Put event into the queue.
+        close(): Flush remaining events and close the file.
+    """
+    def __init__(
+        self,
+        filename: str,
+        queue_size: int = 4 * columnar.BLOCK_SIZE,
+        batch_size: int = columnar.BLOCK_SIZE,
+        flush_interval: float = 1.0,
+        compression: str = None,
+    ):
+        """RecordingWriter class constructor.
+
+        Args:
+            filename (str): file name to save recorded events.
+            queue_size (int): max number of events waiting for write.
+            batch_size (int): max number of events in one block.
+            flush_interval (float): max seconds between flushes.
+            compression (str): None, 'zlib' or 'lzma' compression of blocks.
+
+        """
+        self.filename = filename
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = []
+        self.order = itertools.count()
+        self.sources = []
+        self.state = InputState()
+        self.header = columnar.file_header(compression)
+        self.codec = columnar.CODECS[compression]
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.file = None
+        self.thread = None
+        self.written = 0
+
+    def __enter__(self):
+        """Implemented to use as context manager."""
+        self.file = open(self.filename, 'wb')
+        self.file.write(self.header)
+        self.file.flush()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Implemented to use as context manager."""
+        self.close()
+
+    def source(self) -> 'WriterSource':
+        """Return sink of one recorder, events are held until all sources pass them.
+
+        Returns (WriterSource): sink with progress method.
+
+        """
+        self.sources.append(None)
+        return WriterSource(self, len(self.sources) - 1)
+
+    def write(self, event):
+        """Put event into the queue, wait if the queue is full.
+
+        Args:
+            event: dict event or (opcode, time_ns, a, b) row.
+
+        """
+        self.queue.put((None, event))
+
+    def close(self):
+        """Flush remaining events and close the file."""
+        if self.thread is not None:
+            self.queue.put(_STOP)
+            self.thread.join()
+            self.thread = None
+            self.file.close()
+
+    def _add(self, row: tuple):
+        """Keep row until it can be written in time order."""
+        heapq.heappush(self.pending, (row[1], next(self.order), row))
+
+    def _flush(self, final: bool = False):
+        """Append events which can not be preceded by later ones to the file.
+
+        Args:
+            final (bool): write all kept events.
+
+        """
+        if final or not self.sources:
+            limit = None
+        elif None in self.sources:
+            return
+        else:
+            limit = min(self.sources)
+        block = []
+        while self.pending and (limit is None or self.pending[0][0] <= limit):
+            block.append(heapq.heappop(self.pending)[2])
+            if len(block) == self.batch_size:
+                self._write(block)
+                block = []
+        self._write(block)
+
+    def _write(self, block: list):
+        """Append block of sorted events to the file.
+
+        Args:
+            block (list): with (opcode, time_ns, a, b) rows.
+
+        """
+        if not block:
+            return
+        self.file.write(columnar.encode_block(block, self.codec, self.state))
+        self.file.flush()
+        self.written += len(block)
+
+    def _run(self):
+        """Take events from the queue and flush them in batches."""
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                event = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                event = None
+            if event is _STOP:
+                self._flush(final=True)
+                return
+            if event is not None:
+                number, event = event
+                if isinstance(event, int):
+                    self.sources[number] = event
+                else:
+                    self._add(event if isinstance(event, tuple) else to_row(event))
+            if len(self.pending) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush()
+                deadline = time.monotonic() + self.flush_interval
+
+
+class WriterSource:
+    """Class to pass events of one recorder to RecordingWriter.
+
+    Methods:
+        progress(time_ns): Tell the writer no more events older than time_ns will come.
+    """
+    def __init__(self, writer: RecordingWriter, number: int):
+        """WriterSource class constructor.
+
+        Args:
+            writer (RecordingWriter): writer of the recording.
+            number (int): number of the source in the writer.
+
+        """
+        self.queue = writer.queue
+        self.number = number
+
+    def __call__(self, event):
+        """Put event into the writer queue.
+
+        Args:
+            event: dict event or (opcode, time_ns, a, b) row.
+
+        """
+        self.queue.put((self.number, event))
+
+    def progress(self, time_ns: int):
+        """Tell the writer no more events older than time_ns will come.
+
+        Args:
+            time_ns (int): time since start record in ns.
+
+        """
+        self.queue.put((self.number, time_ns))